@@ -35,6 +35,12 @@ def create_app(config_object=None):
     # (Important: Models must be loaded after db.init_app but before routes)
     from app import models
 
+    # Build per-model JSON serializers once so responses skip mapper reflection
+    from app.utils.response import compile_serializers
+    compile_serializers(
+        models.Product, models.Category, models.Order, models.OrderItem, models.Cart, models.User
+    )
+
     # 4. REGISTER BLUEPRINTS (ROUTES)
     # -------------------------------
     try:
@@ -50,7 +56,12 @@ def create_app(config_object=None):
     except Exception:
         pass
 
-    # 6. HEALTH CHECK ROUTE
+    # 6. REGISTER CLI COMMANDS
+    # ------------------------
+    from .commands import register_commands
+    register_commands(app)
+
+    # 7. HEALTH CHECK ROUTE
     # ---------------------
     @app.route('/')
     def health_check():
@@ -60,6 +71,6 @@ def create_app(config_object=None):
             "service": "Ecommerce API"
         }, 200
 
-    # 7. FINAL RETURN
+    # 8. FINAL RETURN
     # ---------------
     return app
\ No newline at end of file
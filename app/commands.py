@@ -0,0 +1,237 @@
+"""
+Flask CLI commands (registered in app.create_app).
+
+    flask import-products FILE [--format csv|ndjson] [--batch-size N]
+    flask sweep-reservations [--loop] [--interval SECONDS] [--batch-size N]
+    flask shard-stock PRODUCT_ID SHARDS
+    flask worker [--queue NAME ...] [--concurrency N] [--burst]
+    flask purge-idempotency-keys [--batch-size N]
+    flask backfill-sales-rollups
+    flask archive-orders [--older-than-days N] [--batch-size N] [--time-budget SECONDS]
+    flask process-webhooks [--loop] [--interval SECONDS] [--batch-size N]
+    flask reconcile-payments [--batch-size N] [--concurrency N] [--min-age SECONDS] [--time-budget SECONDS]
+    flask set-admin EMAIL [--revoke]
+"""
+
+import json
+import os
+import time
+
+import click
+from flask.cli import with_appcontext
+
+
+def register_commands(app) -> None:
+    app.cli.add_command(import_products_command)
+    app.cli.add_command(sweep_reservations_command)
+    app.cli.add_command(shard_stock_command)
+    app.cli.add_command(worker_command)
+    app.cli.add_command(purge_idempotency_keys_command)
+    app.cli.add_command(backfill_sales_rollups_command)
+    app.cli.add_command(archive_orders_command)
+    app.cli.add_command(process_webhooks_command)
+    app.cli.add_command(reconcile_payments_command)
+    app.cli.add_command(set_admin_command)
+
+
+@click.command("import-products")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default=None,
+              help="Input format (default: from file extension).")
+@click.option("--batch-size", type=int, default=None, help="Rows per INSERT/UPDATE batch.")
+@with_appcontext
+def import_products_command(path, fmt, batch_size):
+    """Stream-import products from a CSV or NDJSON file."""
+    from app.services.product_import_services import DEFAULT_BATCH_SIZE, import_products, iter_rows
+
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = "ndjson" if ext in (".ndjson", ".jsonl") else "csv"
+
+    with open(path, "rb") as stream:
+        stats = import_products(iter_rows(stream, fmt), batch_size=batch_size or DEFAULT_BATCH_SIZE)
+
+    for error in stats["errors"]:
+        click.echo(f"row {error['row']}: {json.dumps(error['errors'])}", err=True)
+    click.echo(
+        f"processed={stats['processed']} inserted={stats['inserted']} updated={stats['updated']} "
+        f"failed={stats['failed']} elapsed={stats['elapsed_seconds']}s rate={stats['rows_per_second']} rows/s"
+    )
+
+
+@click.command("sweep-reservations")
+@click.option("--loop", is_flag=True, help="Keep sweeping every --interval seconds (background worker).")
+@click.option("--interval", type=float, default=None, help="Seconds between sweeps (default: INVENTORY_SWEEP_INTERVAL).")
+@click.option("--batch-size", type=int, default=None, help="Reservations expired per batch.")
+@with_appcontext
+def sweep_reservations_command(loop, interval, batch_size):
+    """Expire overdue stock holds and return their quantity to stock."""
+    from flask import current_app
+
+    from app.services.inventory_services import sweep_expired_reservations
+    from app.services.product_services import product_cache
+
+    interval = interval or current_app.config.get("INVENTORY_SWEEP_INTERVAL", 30)
+    batch_size = batch_size or current_app.config.get("INVENTORY_SWEEP_BATCH", 500)
+    while True:
+        # Drain full batches back to back, then sleep
+        while True:
+            stats = sweep_expired_reservations(batch_size=batch_size)
+            if stats["expired"]:
+                product_cache.bump()
+                click.echo(f"expired={stats['expired']} units_returned={stats['units_returned']}")
+            if stats["expired"] < batch_size:
+                break
+        if not loop:
+            break
+        time.sleep(interval)
+
+
+@click.command("shard-stock")
+@click.argument("product_id", type=int)
+@click.argument("shards", type=int)
+@with_appcontext
+def shard_stock_command(product_id, shards):
+    """Spread a hot product's stock over SHARDS counter rows (0 = unshard)."""
+    from app.extensions import db
+    from app.services.inventory_services import reshard_product_stock
+    from app.services.product_services import product_cache
+
+    if not reshard_product_stock(product_id, shards):
+        raise click.ClickException(f"Product {product_id} not found")
+    db.session.commit()
+    product_cache.bump()
+    click.echo(f"product {product_id}: {shards} shard(s)")
+
+
+@click.command("worker")
+@click.option("--queue", "queues", multiple=True, default=("default",), help="Queue(s) to consume (repeatable).")
+@click.option("--concurrency", type=int, default=None, help="Jobs run in parallel (default: JOB_CONCURRENCY).")
+@click.option("--burst", is_flag=True, help="Exit once the queue is empty.")
+@with_appcontext
+def worker_command(queues, concurrency, burst):
+    """Run background jobs from the jobs table."""
+    import signal
+
+    from flask import current_app
+
+    from app.services.job_services import Worker
+
+    worker = Worker(current_app._get_current_object(), queues=queues, concurrency=concurrency)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: worker.stop())
+    click.echo(f"worker {worker.worker_id}: queues={','.join(worker.queues)} concurrency={worker.concurrency}")
+    worker.run(burst=burst)
+
+
+@click.command("purge-idempotency-keys")
+@click.option("--batch-size", type=int, default=1000, help="Rows deleted per transaction.")
+@with_appcontext
+def purge_idempotency_keys_command(batch_size):
+    """Delete expired Idempotency-Key records (run periodically, e.g. from cron)."""
+    from app.services.idempotency_services import purge_expired_keys
+
+    click.echo(f"deleted={purge_expired_keys(batch_size=batch_size)}")
+
+
+@click.command("backfill-sales-rollups")
+@with_appcontext
+def backfill_sales_rollups_command():
+    """Rebuild the hourly/daily sales rollup tables from orders."""
+    from app.extensions import db
+    from app.services.sales_rollup_services import rebuild_sales_rollups
+
+    started = time.perf_counter()
+    stats = rebuild_sales_rollups()
+    db.session.commit()
+    click.echo(
+        f"orders={stats['orders']} hourly_rows={stats['sales_hourly']} daily_rows={stats['sales_daily']} "
+        f"elapsed={time.perf_counter() - started:.2f}s"
+    )
+
+
+@click.command("archive-orders")
+@click.option("--older-than-days", type=int, default=None,
+              help="Archive completed/cancelled orders last updated this long ago (default: ARCHIVE_ORDERS_AFTER_DAYS).")
+@click.option("--batch-size", type=int, default=None, help="Orders moved per transaction.")
+@click.option("--time-budget", type=float, default=None, help="Stop starting new batches after this many seconds.")
+@with_appcontext
+def archive_orders_command(older_than_days, batch_size, time_budget):
+    """Move cold orders, their items and payments to the archive tables."""
+    from app.services.archive_services import archive_orders
+
+    stats = archive_orders(older_than_days=older_than_days, batch_size=batch_size, time_budget=time_budget)
+    click.echo(
+        f"batches={stats['batches']} orders={stats['orders']} order_items={stats['order_items']} "
+        f"payments={stats['payments']} elapsed={stats['elapsed_seconds']}s rate={stats['rows_per_second']} rows/s"
+    )
+
+
+@click.command("process-webhooks")
+@click.option("--loop", is_flag=True, help="Keep polling every --interval seconds (background worker).")
+@click.option("--interval", type=float, default=None, help="Seconds between polls (default: WEBHOOK_POLL_INTERVAL).")
+@click.option("--batch-size", type=int, default=None, help="Events applied per transaction.")
+@with_appcontext
+def process_webhooks_command(loop, interval, batch_size):
+    """Apply received payment webhook events in batches."""
+    from flask import current_app
+
+    from app.services.webhook_services import process_webhook_events
+
+    interval = interval or current_app.config.get("WEBHOOK_POLL_INTERVAL", 1.0)
+    batch_size = batch_size or current_app.config.get("WEBHOOK_BATCH_SIZE", 200)
+    while True:
+        # Drain full batches back to back, then sleep
+        while True:
+            stats = process_webhook_events(batch_size=batch_size)
+            if stats["events"]:
+                click.echo(
+                    f"events={stats['events']} processed={stats['processed']} ignored={stats['ignored']} "
+                    f"failed={stats['failed']} payments_updated={stats['payments_updated']} "
+                    f"orders_updated={stats['orders_updated']}"
+                )
+            if stats["events"] < batch_size:
+                break
+        if not loop:
+            break
+        time.sleep(interval)
+
+
+@click.command("reconcile-payments")
+@click.option("--batch-size", type=int, default=None, help="Payments per keyset chunk (default: RECONCILE_BATCH_SIZE).")
+@click.option("--concurrency", type=int, default=None, help="Parallel gateway lookups (default: RECONCILE_CONCURRENCY).")
+@click.option("--min-age", "min_age", type=int, default=None,
+              help="Only payments whose order is at least this many seconds old (default: RECONCILE_MIN_AGE_SECONDS).")
+@click.option("--time-budget", type=float, default=None, help="Stop starting new chunks after this many seconds.")
+@with_appcontext
+def reconcile_payments_command(batch_size, concurrency, min_age, time_budget):
+    """Check pending payments against the gateway and apply their real status."""
+    from app.services.reconciliation_services import reconcile_payments
+
+    stats = reconcile_payments(
+        batch_size=batch_size, concurrency=concurrency, min_age_seconds=min_age, time_budget=time_budget
+    )
+    updated = " ".join(f"{status}={count}" for status, count in sorted(stats["updated"].items())) or "none"
+    click.echo(
+        f"batches={stats['batches']} checked={stats['checked']} unchanged={stats['unchanged']} "
+        f"errors={stats['errors']} updated: {updated} orders_updated={stats['orders_updated']} "
+        f"elapsed={stats['elapsed_seconds']}s rate={stats['payments_per_second']} payments/s"
+    )
+    if stats["stopped"]:
+        click.echo(f"stopped early: {stats['stopped']}", err=True)
+
+
+@click.command("set-admin")
+@click.argument("email")
+@click.option("--revoke", is_flag=True, help="Remove the admin role instead of granting it.")
+@with_appcontext
+def set_admin_command(email, revoke):
+    """Grant (or revoke) the admin role; the user's next token carries it."""
+    from app.models.user import User
+    from app.services.auth_services import set_user_admin
+
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        raise click.ClickException(f"no user with email {email}")
+    set_user_admin(user.id, not revoke)
+    click.echo(f"user {user.id} ({email}) is_admin={not revoke}")
@@ -1,5 +1,8 @@
 
 from app.extensions import db
+from app.database.search_index import create_search_index
 
 def init_db():
     db.create_all()
+    # Full-text index objects are not part of the ORM metadata
+    create_search_index(db.engine)
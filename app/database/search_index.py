@@ -0,0 +1,88 @@
+"""
+Full-text index on products(name, description), per database dialect.
+
+- SQLite:   FTS5 external-content table `products_fts` kept in sync by triggers.
+- Postgres: GIN expression index over to_tsvector(SEARCH_CONFIG, name || description).
+- MySQL:    FULLTEXT index over (name, description).
+
+Postgres and MySQL indexes are maintained by the database itself; the SQLite
+triggers do the same for FTS5. Either way product create/update/delete (and any
+bulk write that bypasses the ORM) keeps the index in sync.
+
+The Alembic migration creates the same objects; create_search_index() exists
+for databases bootstrapped with db.create_all() (see app.database.db_utils).
+"""
+
+from sqlalchemy import inspect, text
+
+# Text search configuration used by both the Postgres index and its queries.
+# The query expression must match the index expression for the index to be used.
+SEARCH_CONFIG = "english"
+
+SQLITE_FTS_TABLE = "products_fts"
+# Postgres GIN / MySQL FULLTEXT index on products
+SEARCH_INDEX_NAME = "ix_products_search"
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE}
+    USING fts5(name, description, content='products', content_rowid='id')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    # Index rows that existed before the FTS table was created
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+POSTGRES_DDL = [
+    f"""
+    CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_NAME} ON products
+    USING GIN (to_tsvector('{SEARCH_CONFIG}', coalesce(name, '') || ' ' || coalesce(description, '')))
+    """,
+]
+
+MYSQL_DDL = [
+    f"CREATE FULLTEXT INDEX {SEARCH_INDEX_NAME} ON products (name, description)",
+]
+
+
+def has_sqlite_fts(bind) -> bool:
+    """True when the FTS5 shadow table exists on this SQLite database."""
+    return SQLITE_FTS_TABLE in inspect(bind).get_table_names()
+
+
+def create_search_index(bind) -> None:
+    """Create the dialect's full-text index objects on an existing products table."""
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_DDL
+    elif dialect == "postgresql":
+        statements = POSTGRES_DDL
+    elif dialect == "mysql":
+        if SEARCH_INDEX_NAME in {ix["name"] for ix in inspect(bind).get_indexes("products")}:
+            return
+        statements = MYSQL_DDL
+    else:
+        return
+
+    with bind.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
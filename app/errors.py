@@ -99,3 +99,21 @@ class ServiceError(AppError):
     default_message = "Service error"
     default_status = 400
     default_code = "service_error"
+
+
+# Flask wiring ----------------------------------------------------------------
+
+
+def register_error_handlers(app) -> None:
+    """Render any AppError raised from a view/service with the standard error envelope."""
+    from app.utils.response import error_response
+
+    @app.errorhandler(AppError)
+    def handle_app_error(err: AppError):
+        return error_response(err.message, err.status_code, code=err.code, details=err.details)
+
+    @app.errorhandler(429)
+    def handle_rate_limited(err):
+        # Flask-Limiter adds the Retry-After / X-RateLimit-* headers afterwards
+        return error_response("Too many requests, retry later", 429, code="rate_limited",
+                              details={"limit": str(err.description)})
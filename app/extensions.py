@@ -20,7 +20,9 @@ from flask_bcrypt import Bcrypt
 from flask_marshmallow import Marshmallow
 from flask_cors import CORS
 from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+
+# Importing registers the shared "sqlite://" storage scheme with `limits`
+from app.utils.rate_limit import rate_limit_key
 
 # Core DB + migration
 db: SQLAlchemy = SQLAlchemy()
@@ -37,8 +39,10 @@ ma: Marshmallow = Marshmallow()
 cors: CORS = CORS()
 
 # Rate limiting (very useful to protect public endpoints)
-# The Limiter will be configured in init_extensions using app.config values.
-limiter: Limiter = Limiter(key_func=get_remote_address, headers_enabled=True)
+# The Limiter will be configured in init_extensions using app.config values
+# (RATELIMIT_STORAGE_URI / RATELIMIT_STRATEGY, shared by all workers).
+# Callers are keyed by JWT identity, falling back to the client address.
+limiter: Limiter = Limiter(key_func=rate_limit_key, headers_enabled=True)
 
 
 def init_extensions(app) -> None:
@@ -53,6 +57,7 @@ def init_extensions(app) -> None:
 
     Expected config keys (all optional):
       - RATELIMIT_DEFAULT (e.g. "200 per day;50 per hour")
+      - RATELIMIT_STORAGE_URI / RATELIMIT_STRATEGY (see app.utils.rate_limit)
       - CORS_ORIGINS     (list or string, passed to flask_cors.CORS)
       - CORS_SUPPORTS_CREDENTIALS (bool)
 
@@ -6,8 +6,14 @@ from flask_sqlalchemy import SQLAlchemy
 
 from app.models.user import User
 from app.models.product import Product
+from app.models.product_facet import ProductFacetCount
 from app.models.category import Category
 from app.models.cart import Cart
-from app.models.order import Order
+from app.models.order import Order, OrderItem
 from app.models.payment import Payment
-
+from app.models.inventory import InventoryReservation, StockShard
+from app.models.job import Job
+from app.models.idempotency import IdempotencyKey
+from app.models.sales_rollup import SalesDaily, SalesHourly
+from app.models.archive import ArchivedOrder, ArchivedOrderItem, ArchivedPayment
+from app.models.webhook_event import WebhookEvent
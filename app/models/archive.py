@@ -0,0 +1,113 @@
+"""
+Archive tables for cold orders.
+
+Completed/cancelled orders older than ARCHIVE_ORDERS_AFTER_DAYS are moved here
+with their items and payments by `flask archive-orders` (see
+app.services.archive_services), keeping the hot orders / order_items /
+payments tables and their indexes small. Rows keep their original ids, so
+order ids stay unique across hot and archive tables and reads can fall
+through to the archive (order history, order detail, exports, sales backfill).
+
+Archive rows have no foreign keys to the hot tables; relationships are
+view-only joins.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List
+from datetime import datetime
+import enum
+
+from sqlalchemy import Numeric
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.extensions import db
+from app.models.order import OrderStatus
+
+
+class ArchivedOrder(db.Model):
+    __tablename__ = "orders_archive"
+    __table_args__ = (
+        db.Index("ix_orders_archive_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    total_amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
+    status: Mapped[OrderStatus] = mapped_column(
+        db.Enum(OrderStatus, name="order_status", native_enum=False), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+
+    order_items: Mapped[List["ArchivedOrderItem"]] = relationship(
+        "ArchivedOrderItem",
+        primaryjoin="ArchivedOrder.id == foreign(ArchivedOrderItem.order_id)",
+        viewonly=True,
+        lazy="select",
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return f"<ArchivedOrder id={self.id} user_id={self.user_id} status={self.status}>"
+
+    def to_dict(self, include_items: bool = False) -> Dict[str, Any]:
+        """Same shape as Order.to_dict, plus archived=True."""
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "user_id": self.user_id,
+            "total_amount": float(self.total_amount) if self.total_amount is not None else None,
+            "status": self.status.value if isinstance(self.status, enum.Enum) else str(self.status),
+            "created_at": self.created_at.isoformat() if isinstance(self.created_at, datetime) else None,
+            "updated_at": self.updated_at.isoformat() if isinstance(self.updated_at, datetime) else None,
+            "archived": True,
+        }
+        if include_items:
+            data["order_items"] = [item.to_dict(include_product=True) for item in self.order_items]
+        return data
+
+
+class ArchivedOrderItem(db.Model):
+    __tablename__ = "order_items_archive"
+    __table_args__ = (
+        db.Index("ix_order_items_archive_order_id", "order_id"),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=False)
+    order_id: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    product_id: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    quantity: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    price: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    category_id: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+
+    product: Mapped["Product"] = relationship(
+        "Product",
+        primaryjoin="foreign(ArchivedOrderItem.product_id) == Product.id",
+        viewonly=True,
+    )
+
+    def to_dict(self, include_product: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "order_id": self.order_id,
+            "product_id": self.product_id,
+            "quantity": self.quantity,
+            "price": float(self.price) if self.price is not None else 0.0,
+        }
+        if include_product and self.product:
+            data["product"] = self.product.to_dict()
+        return data
+
+
+class ArchivedPayment(db.Model):
+    __tablename__ = "payments_archive"
+    __table_args__ = (
+        db.Index("ix_payments_archive_order_id", "order_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_id = db.Column(db.Integer, nullable=False)
+    amount = db.Column(db.Float, nullable=False)
+    mode = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(50), nullable=False)
+    gateway_order_id = db.Column(db.String(64), nullable=True)
+    gateway_payment_id = db.Column(db.String(64), nullable=True)
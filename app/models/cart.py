@@ -22,8 +22,6 @@ class Cart(db.Model):
     __tablename__ = "cart"  # keeping your original table name; consider 'cart_items' if you prefer
     __table_args__ = (
         UniqueConstraint("user_id", "product_id", name="uq_cart_user_product"),
-        db.Index("ix_cart_user_id", "user_id"),
-        db.Index("ix_cart_product_id", "product_id"),
     )
 
     id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
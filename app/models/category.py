@@ -19,9 +19,6 @@ from app.extensions import db
 
 class Category(db.Model):
     __tablename__ = "categories"
-    __table_args__ = (
-        db.Index("ix_categories_name", "name"),
-    )
 
     id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
     name: Mapped[str] = mapped_column(db.String(120), unique=True, nullable=False, index=True)
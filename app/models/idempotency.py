@@ -0,0 +1,50 @@
+"""
+Idempotency key model.
+
+One row per (scope, key) sent in an `Idempotency-Key` header. The first
+request inserts the row as in-progress; when it succeeds its response is
+stored so retries with the same key replay it instead of running the
+endpoint again. Rows expire after IDEMPOTENCY_TTL_SECONDS.
+"""
+
+from __future__ import annotations
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class IdempotencyStatus:
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+
+class IdempotencyKey(db.Model):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        db.UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        # Purge job scans by expiry
+        db.Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    scope: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    key: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    # sha256 of method + path + body, to reject a key reused for a different request
+    request_hash: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    status: Mapped[str] = mapped_column(
+        db.String(16), nullable=False, default=IdempotencyStatus.IN_PROGRESS, server_default=IdempotencyStatus.IN_PROGRESS
+    )
+    response_status: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    response_content_type: Mapped[str | None] = mapped_column(db.String(100), nullable=True)
+    response_body: Mapped[str | None] = mapped_column(db.Text, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return f"<IdempotencyKey scope={self.scope} key={self.key} status={self.status}>"
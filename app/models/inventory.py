@@ -0,0 +1,93 @@
+"""
+Inventory reservation models.
+
+- StockShard: a hot product's available stock split across N counter rows.
+  Buyers decrement a random shard, so concurrent checkouts of one SKU contend
+  on N row locks instead of the single products.stock row. Products without
+  shard rows keep using products.stock directly.
+- InventoryReservation: a time-limited hold on stock (taken from a shard, or
+  from products.stock when shard_no is NULL). Holds are committed into an
+  order at checkout, released by the user, or expired by the sweeper, which
+  returns the quantity to where it came from.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class ReservationStatus:
+    HELD = "held"
+    COMMITTED = "committed"
+    RELEASED = "released"
+    EXPIRED = "expired"
+
+
+class StockShard(db.Model):
+    __tablename__ = "stock_shards"
+
+    product_id: Mapped[int] = mapped_column(
+        db.Integer, db.ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard_no: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    available: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return f"<StockShard product_id={self.product_id} shard={self.shard_no} available={self.available}>"
+
+
+class InventoryReservation(db.Model):
+    __tablename__ = "inventory_reservations"
+    __table_args__ = (
+        # Sweeper scans held rows by expiry; checkout/cart look up a user's holds per product
+        db.Index("ix_inventory_reservations_status_expires_at", "status", "expires_at"),
+        db.Index("ix_inventory_reservations_user_product_status", "user_id", "product_id", "status"),
+        db.Index("ix_inventory_reservations_order_id", "order_id"),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    product_id: Mapped[int] = mapped_column(
+        db.Integer, db.ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[int | None] = mapped_column(
+        db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=True
+    )
+    order_id: Mapped[int | None] = mapped_column(
+        db.Integer, db.ForeignKey("orders.id", ondelete="SET NULL"), nullable=True
+    )
+    # NULL -> taken from products.stock; otherwise the stock_shards row it came from
+    shard_no: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    quantity: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    status: Mapped[str] = mapped_column(
+        db.String(16), nullable=False, default=ReservationStatus.HELD, server_default=ReservationStatus.HELD
+    )
+    expires_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return (
+            f"<InventoryReservation id={self.id} product_id={self.product_id} qty={self.quantity} "
+            f"status={self.status}>"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "product_id": self.product_id,
+            "user_id": self.user_id,
+            "order_id": self.order_id,
+            "quantity": self.quantity,
+            "status": self.status,
+            "expires_at": self.expires_at.isoformat() if isinstance(self.expires_at, datetime) else None,
+        }
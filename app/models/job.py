@@ -0,0 +1,69 @@
+"""
+Background job model (database-backed queue).
+
+A job is a named handler plus a JSON payload. Jobs are enqueued in the same
+transaction as the write that causes them, so a job exists if and only if
+that write committed. Workers (`flask worker`) claim due jobs, run them on a
+thread pool and either mark them done or reschedule them with backoff.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claim query: WHERE status = 'queued' AND queue = ? AND run_at <= now ORDER BY run_at
+        db.Index("ix_jobs_status_queue_run_at", "status", "queue", "run_at"),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    queue: Mapped[str] = mapped_column(db.String(64), nullable=False, default="default", server_default="default")
+    name: Mapped[str] = mapped_column(db.String(100), nullable=False)
+    payload: Mapped[Dict[str, Any]] = mapped_column(db.JSON, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(
+        db.String(16), nullable=False, default=JobStatus.QUEUED, server_default=JobStatus.QUEUED
+    )
+    attempts: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
+    max_attempts: Mapped[int] = mapped_column(db.Integer, nullable=False, default=5, server_default="5")
+    run_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(db.String(100), nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(db.Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return f"<Job id={self.id} name={self.name} status={self.status} attempts={self.attempts}>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "queue": self.queue,
+            "name": self.name,
+            "payload": self.payload,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_at": self.run_at.isoformat() if isinstance(self.run_at, datetime) else None,
+            "last_error": self.last_error,
+        }
@@ -30,12 +30,13 @@ class OrderStatus(str, enum.Enum):
 class Order(db.Model):
     __tablename__ = "orders"
     __table_args__ = (
-        db.Index("ix_orders_user_id", "user_id"),
+        # Order history: WHERE user_id = ? ORDER BY created_at DESC, id DESC (keyset pages)
+        db.Index("ix_orders_user_id_created_at_id", "user_id", "created_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
 
-    user_id: Mapped[int | None] = mapped_column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    user_id: Mapped[int | None] = mapped_column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
     # Use Numeric for currency: precision 12, scale 2 (support up to ~999,999,999.99)
     total_amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
@@ -70,10 +71,19 @@ class Order(db.Model):
 
     # Business helpers
     def update_status(self, new_status: OrderStatus) -> None:
-        """Safely update order status (use enum values)."""
+        """
+        Safely update order status (use enum values).
+
+        Entering or leaving a sold status (paid/shipped/completed) also updates
+        the sales rollups in the same transaction.
+        """
         if isinstance(new_status, str):
             new_status = OrderStatus(new_status)
+        old_status = OrderStatus(self.status) if self.status is not None else None
         self.status = new_status
+        if old_status != new_status:
+            from app.services.sales_rollup_services import record_order_transition
+            record_order_transition(self, old_status, new_status)
 
     # Serialization
     def to_dict(self, include_items: bool = False, include_user: bool = False) -> Dict[str, Any]:
@@ -135,6 +145,10 @@ class OrderItem(db.Model):
     # Store price at moment of purchase (so it doesn't change if product price changes later)
     price: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
 
+    # Product category at moment of purchase; sales rollups attribute (and
+    # reverse) category revenue against it, not the product's current category
+    category_id: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+
     # Relationships
     order: Mapped["Order"] = relationship("Order", back_populates="order_items")
     product: Mapped["Product"] = relationship("Product")
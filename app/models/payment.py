@@ -2,10 +2,17 @@ from app.extensions import db
 
 class Payment(db.Model):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Reconciliation scan: WHERE status IN (...) AND id > ? ORDER BY id
+        db.Index("ix_payments_status_id", "status", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False)
     amount = db.Column(db.Float, nullable=False)                # <— ADD THIS
     mode = db.Column(db.String(50), nullable=False, default="razorpay")  
     status = db.Column(db.String(50), nullable=False, default="pending")
+    # Razorpay ids, used to match webhook events to this payment
+    gateway_order_id = db.Column(db.String(64), nullable=True, index=True)
+    gateway_payment_id = db.Column(db.String(64), nullable=True, index=True)
 
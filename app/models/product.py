@@ -5,7 +5,7 @@ Improvements:
 - Uses SQLAlchemy 2.0 typed ORM (Mapped and mapped_column).
 - Uses Numeric() for price to avoid floating-point precision issues.
 - Adds created_at / updated_at timestamps.
-- Adds indexes for name and category_id.
+- Adds indexes for name and composite (category_id, id) / (category_id, price).
 - Adds relationship to Category with back_populates.
 - Provides a clean to_dict() serializer.
 """
@@ -22,8 +22,11 @@ from app.extensions import db
 class Product(db.Model):
     __tablename__ = "products"
     __table_args__ = (
-        db.Index("ix_products_name", "name"),
-        db.Index("ix_products_category_id", "category_id"),
+        # Composite indexes replace the single-column category index:
+        # (category_id, id) serves keyset pages within a category,
+        # (category_id, price) serves category + price filters and facet grouping.
+        db.Index("ix_products_category_id_id", "category_id", "id"),
+        db.Index("ix_products_category_id_price", "category_id", "price"),
     )
 
     # -------------------------
@@ -0,0 +1,26 @@
+"""
+ProductFacetCount model.
+
+- Precomputed facet counts for the *unfiltered* catalog (one row per facet value),
+  e.g. ("category_id", "3") -> 120, ("price", "100-500") -> 42.
+- Maintained incrementally in the same transaction as product writes
+  (see app.services.product_facet_services), so listing pages can return
+  facet counts without aggregating the products table.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class ProductFacetCount(db.Model):
+    __tablename__ = "product_facet_counts"
+
+    facet: Mapped[str] = mapped_column(db.String(32), primary_key=True)
+    value: Mapped[str] = mapped_column(db.String(64), primary_key=True)
+    count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return f"<ProductFacetCount {self.facet}={self.value!r} count={self.count}>"
@@ -0,0 +1,54 @@
+"""
+Sales rollup models (admin analytics).
+
+- SalesHourly / SalesDaily: pre-aggregated sales per time bucket (UTC) and
+  dimension, so reports never scan orders:
+    dimension "total"    -> dimension_id 0
+    dimension "product"  -> product id
+    dimension "category" -> category id (0 = uncategorized)
+- Buckets are keyed by the order's created_at, so a refund reverses exactly
+  the buckets its payment added.
+- Maintained incrementally in the same transaction as order status changes
+  (see app.services.sales_rollup_services); `flask backfill-sales-rollups`
+  rebuilds them from orders.
+"""
+
+from __future__ import annotations
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class SalesRollupMixin:
+    bucket_start: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), primary_key=True)
+    dimension: Mapped[str] = mapped_column(db.String(16), primary_key=True)
+    dimension_id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+
+    revenue: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    order_count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
+    units: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return (
+            f"<{self.__class__.__name__} {self.bucket_start} {self.dimension}={self.dimension_id} "
+            f"revenue={self.revenue} orders={self.order_count} units={self.units}>"
+        )
+
+
+class SalesHourly(SalesRollupMixin, db.Model):
+    __tablename__ = "sales_hourly"
+    __table_args__ = (
+        # Top-N per dimension over a time range
+        db.Index("ix_sales_hourly_dimension_bucket", "dimension", "bucket_start"),
+    )
+
+
+class SalesDaily(SalesRollupMixin, db.Model):
+    __tablename__ = "sales_daily"
+    __table_args__ = (
+        db.Index("ix_sales_daily_dimension_bucket", "dimension", "bucket_start"),
+    )
@@ -2,30 +2,36 @@
 User model (SQLAlchemy 2.0 style).
 
 Uses explicit Mapped[...] annotations to satisfy SQLAlchemy's annotated declarative rules.
-Provides secure password handling via Flask-Bcrypt.
+Provides secure password handling via bcrypt (see app.utils.passwords).
 """
 
 from __future__ import annotations
 from typing import Any, Dict, Optional, List
 
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import false, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.extensions import db, bcrypt
+from app.extensions import db
+from app.utils.passwords import check_password, hash_password
 
 
 class User(db.Model):
     __tablename__ = "users"
     __table_args__ = (
-        db.Index("ix_users_email", "email"),
         db.Index("ix_users_username", "username"),
     )
 
+    # Never emitted by app.utils.response (compiled or reflective serialization)
+    __serialize_exclude__ = ("password_hash",)
+
     id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
     username: Mapped[str] = mapped_column(db.String(120), unique=False, nullable=False)
     email: Mapped[str] = mapped_column(db.String(255), unique=True, nullable=False, index=True)
     password_hash: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    # Also carried as the signed "is_admin" access token claim; change it via
+    # auth_services.set_user_admin so cached identities are invalidated
+    is_admin: Mapped[bool] = mapped_column(db.Boolean, nullable=False, default=False, server_default=false())
 
     created_at: Mapped[datetime] = mapped_column(
         db.DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -60,8 +66,8 @@ class User(db.Model):
     def password(self, raw_password: str) -> None:
         if not raw_password:
             raise ValueError("Password must not be empty.")
-        # bcrypt.generate_password_hash returns bytes; decode to str for storage
-        self.password_hash = bcrypt.generate_password_hash(raw_password).decode("utf-8")
+        # Hashed on the password pool with the configured cost
+        self.password_hash = hash_password(raw_password)
 
     def set_password(self, raw_password: str) -> None:
         self.password = raw_password
@@ -69,7 +75,7 @@ class User(db.Model):
     def check_password(self, raw_password: str) -> bool:
         if not self.password_hash:
             return False
-        return bcrypt.check_password_hash(self.password_hash, raw_password)
+        return check_password(self.password_hash, raw_password)
 
     # Serialization
     def to_dict(self, include_relationships: bool = False, exclude: Optional[set] = None) -> Dict[str, Any]:
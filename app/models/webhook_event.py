@@ -0,0 +1,53 @@
+"""
+Inbound webhook event log.
+
+Every signed webhook delivery is appended here verbatim (the exact body that
+was signed) before we answer 200, and is applied later in batches by
+`flask process-webhooks` (see app.services.webhook_services). The unique
+(provider, event_id) constraint drops the gateway's redeliveries. Rows are
+never edited apart from their processing state (status / attempts /
+last_error / processed_at).
+"""
+
+from __future__ import annotations
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class WebhookEventStatus:
+    RECEIVED = "received"
+    PROCESSED = "processed"
+    IGNORED = "ignored"
+    FAILED = "failed"
+
+
+class WebhookEvent(db.Model):
+    __tablename__ = "webhook_events"
+    __table_args__ = (
+        db.UniqueConstraint("provider", "event_id", name="uq_webhook_events_provider_event_id"),
+        # Processor scan: WHERE status = 'received' ORDER BY id
+        db.Index("ix_webhook_events_status_id", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    provider: Mapped[str] = mapped_column(db.String(32), nullable=False, default="razorpay", server_default="razorpay")
+    event_id: Mapped[str] = mapped_column(db.String(100), nullable=False)
+    event_type: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    body: Mapped[str] = mapped_column(db.Text, nullable=False)
+    status: Mapped[str] = mapped_column(
+        db.String(16), nullable=False, default=WebhookEventStatus.RECEIVED, server_default=WebhookEventStatus.RECEIVED
+    )
+    attempts: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[str | None] = mapped_column(db.Text, nullable=True)
+
+    received_at: Mapped[datetime] = mapped_column(
+        db.DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(db.DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - trivial
+        return f"<WebhookEvent id={self.id} {self.provider}:{self.event_id} type={self.event_type} status={self.status}>"
@@ -12,4 +12,5 @@ def register_blueprints(app):
                     app.register_blueprint(bp, url_prefix=prefix)
                     break
         except Exception:
+            app.logger.exception("blueprint module %s failed to load; its routes are not registered", mod)
             continue
@@ -1,13 +1,102 @@
-from flask import Blueprint
+import os
+
+from flask import Blueprint, Response, request, stream_with_context
 from app.services.admin_services import get_all_users, get_all_orders
-from app.utils.response import success_response
+from app.services.auth_services import set_user_admin
+from app.services.export_services import FORMATS as EXPORT_FORMATS, export_chunks, gzip_chunks
+from app.services.product_import_services import DEFAULT_BATCH_SIZE, FORMATS, import_products, iter_rows
+from app.services.sales_rollup_services import get_sales_series, get_top, parse_stats_args
+from app.utils.decorators import admin_required
+from app.utils.gateway_health import gateway_breaker, gateway_latency
+from app.utils.response import success_response, error_response
 
 admin_bp = Blueprint("admin", __name__)
 
 @admin_bp.route("/users", methods=["GET"])
+@admin_required
 def users():
     return success_response(get_all_users())
 
+# PUT /api/v1/admin/users/<id>/role  {"is_admin": true|false}
+# Takes effect at once for admin_required checks; the user's new tokens carry the new claim.
+@admin_bp.route("/users/<int:user_id>/role", methods=["PUT"])
+@admin_required
+def user_role(user_id):
+    data = request.get_json() or {}
+    if not isinstance(data.get("is_admin"), bool):
+        return error_response("is_admin must be true or false", 400)
+    user = set_user_admin(user_id, data["is_admin"])
+    if not user:
+        return error_response("User not found", 404)
+    return success_response({"id": user.id, "email": user.email, "is_admin": user.is_admin})
+
 @admin_bp.route("/orders", methods=["GET"])
+@admin_required
 def orders():
     return success_response(get_all_orders())
+
+# POST /api/v1/admin/products/import?format=csv|ndjson
+# Body: the raw file, or multipart form field "file"
+@admin_bp.route("/products/import", methods=["POST"])
+@admin_required
+def import_products_route():
+    upload = request.files.get("file")
+    fmt = (request.args.get("format") or "").lower()
+    if not fmt:
+        name = (upload.filename if upload else "") or ""
+        content_type = request.mimetype or ""
+        fmt = "ndjson" if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type else "csv"
+    if fmt not in FORMATS:
+        return error_response("format must be csv or ndjson", 400)
+
+    batch_size = request.args.get("batch_size", type=int) or DEFAULT_BATCH_SIZE
+    stream = upload.stream if upload else request.stream
+    stats = import_products(iter_rows(stream, fmt), batch_size=batch_size)
+    return success_response(stats)
+
+# GET /api/v1/admin/export/<products|orders|users>?format=ndjson|csv[&gzip=1]
+# Streams rows from a server-side cursor; gzip when requested or accepted.
+@admin_bp.route("/export/<entity>", methods=["GET"])
+@admin_required
+def export(entity):
+    fmt = (request.args.get("format") or "ndjson").lower()
+    chunks = export_chunks(entity, fmt)
+
+    headers = {"Content-Disposition": f"attachment; filename={entity}.{fmt}"}
+    wants_gzip = request.args.get("gzip", "").lower() in ("1", "true", "yes")
+    if wants_gzip or "gzip" in request.accept_encodings:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt], headers=headers)
+
+# GET /api/v1/admin/stats/sales?granularity=hour|day&from=&to=
+# Revenue / orders / units per bucket, read from the sales rollup tables only.
+@admin_bp.route("/stats/sales", methods=["GET"])
+@admin_required
+def sales_stats():
+    granularity, start, end = parse_stats_args(request.args)
+    series, summary = get_sales_series(granularity, start, end)
+    meta = {"granularity": granularity, "from": start.isoformat(), "to": end.isoformat(), "summary": summary}
+    return success_response(series, meta=meta)
+
+# GET /api/v1/admin/stats/<products|categories>?granularity=&from=&to=&limit=
+# Top sellers by revenue over the range, read from the sales rollup tables only.
+@admin_bp.route("/stats/<any(products, categories):dimension>", methods=["GET"])
+@admin_required
+def top_stats(dimension):
+    granularity, start, end = parse_stats_args(request.args)
+    limit = request.args.get("limit", type=int) or 20
+    top = get_top("product" if dimension == "products" else "category", granularity, start, end, limit)
+    meta = {"granularity": granularity, "from": start.isoformat(), "to": end.isoformat()}
+    return success_response(top, meta=meta)
+
+# GET /api/v1/admin/stats/gateway
+# Razorpay circuit breaker state plus call counts, errors, retries and latency
+# percentiles, for THIS worker process.
+@admin_bp.route("/stats/gateway", methods=["GET"])
+@admin_required
+def gateway_stats():
+    data = {"breaker": gateway_breaker.snapshot(), "calls": gateway_latency.snapshot()}
+    return success_response(data, meta={"pid": os.getpid()})
@@ -1,6 +1,8 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.extensions import limiter
 from app.services.auth_services import create_user, authenticate_user, get_user_by_id
+from app.utils.rate_limit import address_key, configured_limit
 from app.utils.response import success_response, error_response
 
 auth_bp = Blueprint("auth", __name__)
@@ -25,7 +27,9 @@ def register():
 
 # LOGIN USER
 
+# Limited per client address (RATELIMIT_LOGIN), before any bcrypt work
 @auth_bp.route("/login", methods=["POST"])
+@limiter.limit(configured_limit("RATELIMIT_LOGIN"), key_func=address_key)
 def login():
     data = request.get_json() or {}
     email = data.get("email")
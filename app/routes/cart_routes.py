@@ -1,6 +1,6 @@
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.cart_services import add_to_cart, remove_from_cart, get_user_cart
+from app.services.cart_services import add_to_cart, apply_cart_batch, remove_from_cart, get_user_cart
 from app.utils.response import success_response, error_response
 
 # ❗️ IMPORTANT: No prefix here
@@ -11,8 +11,8 @@ cart_bp = Blueprint("cart", __name__)
 def view_cart():
     user_id = get_jwt_identity()
     #user_id = request.args.get("user_id")
-    cart_items = get_user_cart(user_id)
-    return success_response(cart_items)
+    cart_items, meta = get_user_cart(user_id)
+    return success_response(cart_items, meta=meta)
 
 @cart_bp.route("/add", methods=["POST"])
 @jwt_required()
@@ -31,3 +31,11 @@ def remove_item():
     if success:
         return success_response({"message": "Item removed"})
     return error_response("Failed to remove item", 400)
+
+@cart_bp.route("/batch", methods=["POST"])
+@jwt_required()
+def batch_update():
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    cart_items, meta = apply_cart_batch(user_id, data.get("operations"))
+    return success_response(cart_items, meta=meta)
@@ -1,19 +1,24 @@
 from flask import Blueprint, request
 from app.services.category_services import (
+    category_cache,
     get_categories,
     create_category,
     update_category,
     delete_category
 )
+from app.models.category import Category
+from app.utils.decorators import conditional_get
+from app.utils.fieldsets import parse_fields
 from app.utils.response import success_response, error_response
 
 # Blueprint with no trailing slash issues
 category_bp = Blueprint("category", __name__)
 
-# GET /api/v1/categories
+# GET /api/v1/categories[?fields=]
 @category_bp.route("", methods=["GET"])
+@conditional_get(category_cache.version)
 def list_categories():
-    categories = get_categories()
+    categories = get_categories(parse_fields(request.args, Category))
     return success_response(categories)
 
 # POST /api/v1/categories
@@ -1,10 +1,37 @@
 from flask import Blueprint, request
-from app.services.order_services import create_order, get_orders_by_user
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from app.extensions import limiter
+from app.services.auth_services import get_user_by_id
+from app.services.order_services import create_order, get_order_detail, get_orders_by_user
+from app.models.order import Order
+from app.utils.fieldsets import parse_fields
+from app.utils.pagination import parse_page_args
+from app.utils.rate_limit import configured_limit
+from app.utils.decorators import idempotent
 from app.utils.response import success_response, error_response
 
 order_bp = Blueprint("order", __name__)
 
+
+def _may_read(user_id):
+    """
+    Callers read their own orders; admins read anyone's. The admin role is
+    checked as admin_required does: signed claim, then the cached identity,
+    so a revoked role applies before the token expires.
+    """
+    identity = get_jwt_identity()
+    if str(user_id) == identity:
+        return True
+    if not get_jwt().get("is_admin"):
+        return False
+    user = get_user_by_id(identity)
+    return bool(user and user["is_admin"])
+
+
+# Checkout: limited per user, or per address without a token (RATELIMIT_CHECKOUT)
 @order_bp.route("/", methods=["POST"])
+@limiter.limit(configured_limit("RATELIMIT_CHECKOUT"))
+@idempotent("order.create")
 def place_order():
     data = request.get_json() or {}
     order = create_order(data)
@@ -12,7 +39,22 @@ def place_order():
         return success_response(order, 201)
     return error_response("Failed to create order", 400)
 
+# Order history, newest first (?limit=&cursor=&fields=)
 @order_bp.route("/user/<int:user_id>", methods=["GET"])
+@jwt_required()
 def list_orders(user_id):
-    orders = get_orders_by_user(user_id)
-    return success_response(orders)
+    if not _may_read(user_id):
+        return error_response("Not allowed to read these orders", 403)
+    limit, after = parse_page_args(request.args)
+    orders, meta = get_orders_by_user(user_id, limit, after, parse_fields(request.args, Order))
+    return success_response(orders, meta=meta)
+
+# Order detail with items and products
+@order_bp.route("/<int:order_id>", methods=["GET"])
+@jwt_required()
+def get_order(order_id):
+    order = get_order_detail(order_id)
+    # Someone else's order reads as missing, so ids cannot be probed
+    if order and _may_read(order["user_id"]):
+        return success_response(order)
+    return error_response("Order not found", 404)
@@ -1,10 +1,13 @@
 from flask import Blueprint, request
 from app.services.payment_services import create_payment, verify_payment
+from app.services.webhook_services import record_webhook
+from app.utils.decorators import idempotent
 from app.utils.response import success_response, error_response
 
 payment_bp = Blueprint("payment", __name__)
 
 @payment_bp.route("/", methods=["POST"])
+@idempotent("payment.create")
 def make_payment():
     data = request.get_json() or {}
     payment = create_payment(data)
@@ -19,3 +22,15 @@ def verify():
     if success:
         return success_response({"message": "Payment verified"})
     return error_response("Payment verification failed", 400)
+
+# POST /api/v1/payment/webhook
+# Razorpay webhook: signature-checked, stored, answered 200 at once; applied
+# later in batches by `flask process-webhooks`. Redeliveries are dropped.
+@payment_bp.route("/webhook", methods=["POST"])
+def webhook():
+    event_id, duplicate = record_webhook(
+        request.get_data(),
+        request.headers.get("X-Razorpay-Signature"),
+        request.headers.get("X-Razorpay-Event-Id"),
+    )
+    return success_response({"received": True, "event": event_id, "duplicate": duplicate})
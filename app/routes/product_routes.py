@@ -1,22 +1,44 @@
 from flask import Blueprint, request
 from app.services.product_services import (
+    catalog_fingerprint,
     get_products,
+    search_products,
     get_product_by_id,
     create_product,
     update_product,
     delete_product
 )
+from app.services.product_facet_services import parse_product_filters
+from app.models.product import Product
+from app.utils.decorators import conditional_get
+from app.utils.fieldsets import parse_fields
+from app.utils.pagination import parse_page_args
 from app.utils.response import success_response, error_response
 
 product_bp = Blueprint("product", __name__)
 
 # ---------------------------
-# GET ALL PRODUCTS
+# LIST PRODUCTS (?limit=&cursor=&fields=&category_id=&min_price=&max_price=&in_stock=)
 # ---------------------------
 @product_bp.route("/", methods=["GET"])
+@conditional_get(catalog_fingerprint)
 def list_products():
-    products = get_products()
-    return success_response(products)
+    limit, after = parse_page_args(request.args)
+    filters = parse_product_filters(request.args)
+    fields = parse_fields(request.args, Product)
+    products, meta = get_products(limit, after, filters, fields)
+    return success_response(products, meta=meta)
+
+# ---------------------------
+# SEARCH PRODUCTS (?q=&limit=&cursor=&fields=)
+# ---------------------------
+@product_bp.route("/search", methods=["GET"])
+@conditional_get(catalog_fingerprint)
+def search():
+    limit, after = parse_page_args(request.args)
+    fields = parse_fields(request.args, Product)
+    results, meta = search_products(request.args.get("q"), limit, after, fields)
+    return success_response(results, meta=meta)
 
 # ---------------------------
 # CREATE PRODUCT
@@ -30,11 +52,12 @@ def add_product():
     return error_response("Failed to create product", 400)
 
 # ---------------------------
-# GET PRODUCT BY ID
+# GET PRODUCT BY ID (?fields=)
 # ---------------------------
 @product_bp.route("/<int:product_id>", methods=["GET"])
+@conditional_get(catalog_fingerprint)
 def get_product(product_id):
-    product = get_product_by_id(product_id)
+    product = get_product_by_id(product_id, parse_fields(request.args, Product))
     if product:
         return success_response(product)
     return error_response("Product not found", 404)
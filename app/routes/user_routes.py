@@ -8,5 +8,6 @@ user_bp = Blueprint("user", __name__)
 def get_user(user_id):
     user = get_user_by_id(user_id)
     if user:
-        return success_response(user)
+        # Public profile: the role stays private
+        return success_response({"id": user["id"], "email": user["email"]})
     return error_response("User not found", 404)
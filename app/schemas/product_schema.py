@@ -3,6 +3,9 @@ from marshmallow import Schema, fields
 class ProductSchema(Schema):
     id = fields.Int(dump_only=True)
     name = fields.Str(required=True)
+    description = fields.Str(allow_none=True)
     price = fields.Float(required=True)
     stock = fields.Int(required=True)
-    category_id = fields.Int()
+    category_id = fields.Int(allow_none=True)
+    # Import-only: category resolved by name (see product_import_services)
+    category = fields.Str(load_only=True)
@@ -1,15 +1,16 @@
 from app.models.user import User
 from app.models.order import Order
+from app.models.archive import ArchivedOrder
 
 def get_all_users():
     users = User.query.all()
     return [{
         "id": u.id,
         "email": u.email,
-        "is_admin": getattr(u, "is_admin", False)
+        "is_admin": u.is_admin
     } for u in users]
 
 
 def get_all_orders():
-    orders = Order.query.all()
+    orders = Order.query.all() + ArchivedOrder.query.all()
     return [{"id": o.id, "user_id": o.user_id, "total_amount": o.total_amount, "status": o.status} for o in orders]
@@ -0,0 +1,94 @@
+"""
+Cold-order archival.
+
+archive_orders() moves completed/cancelled orders whose last update is older
+than ARCHIVE_ORDERS_AFTER_DAYS into orders_archive / order_items_archive /
+payments_archive (app.models.archive), in batches of ARCHIVE_BATCH_SIZE
+orders. Each batch is one short transaction:
+
+    INSERT INTO <archive> SELECT ... WHERE order_id IN (:batch)   (x3)
+    DELETE FROM payments / order_items / reservations / orders WHERE ... IN (:batch)
+
+so a crash loses nothing (the batch either moved or did not) and locks are
+held only for one batch. Ids are preserved, which lets reads fall through to
+the archive by the same order id.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, insert, literal, select
+
+from app.extensions import db
+from app.models.archive import ArchivedOrder, ArchivedOrderItem, ArchivedPayment
+from app.models.inventory import InventoryReservation
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.payment import Payment
+
+ARCHIVABLE_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELLED)
+DEFAULT_AGE_DAYS = 180
+DEFAULT_BATCH_SIZE = 500
+
+
+def _copy(source, target, where, extra=None):
+    """INSERT INTO target (cols) SELECT cols FROM source WHERE ...; target shares source's column names."""
+    names = [c.name for c in source.__table__.columns]
+    columns = [source.__table__.c[name] for name in names]
+    if extra:
+        names += list(extra)
+        columns += [literal(value, type_=target.__table__.c[name].type) for name, value in extra.items()]
+    stmt = insert(target.__table__).from_select(names, select(*columns).where(where))
+    return db.session.execute(stmt).rowcount
+
+
+def archive_orders(older_than_days=None, batch_size=None, time_budget=None):
+    """
+    Move cold orders (with items and payments) to the archive tables.
+
+    Stops when no eligible orders remain or after `time_budget` seconds.
+    Returns stats including rows moved per second.
+    """
+    older_than_days = older_than_days if older_than_days is not None else current_app.config.get(
+        "ARCHIVE_ORDERS_AFTER_DAYS", DEFAULT_AGE_DAYS
+    )
+    batch_size = batch_size or current_app.config.get("ARCHIVE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+    stats = {"batches": 0, "orders": 0, "order_items": 0, "payments": 0}
+    started = time.perf_counter()
+    last_id = 0
+    while time_budget is None or time.perf_counter() - started < time_budget:
+        ids = db.session.execute(
+            select(Order.id)
+            .where(Order.id > last_id, Order.status.in_(ARCHIVABLE_STATUSES), Order.updated_at < cutoff)
+            .order_by(Order.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        try:
+            archived_at = datetime.now(timezone.utc)
+            stats["orders"] += _copy(Order, ArchivedOrder, Order.id.in_(ids), {"archived_at": archived_at})
+            stats["order_items"] += _copy(OrderItem, ArchivedOrderItem, OrderItem.order_id.in_(ids))
+            stats["payments"] += _copy(Payment, ArchivedPayment, Payment.order_id.in_(ids))
+
+            db.session.execute(delete(Payment.__table__).where(Payment.order_id.in_(ids)))
+            db.session.execute(delete(OrderItem.__table__).where(OrderItem.order_id.in_(ids)))
+            db.session.execute(
+                delete(InventoryReservation.__table__).where(InventoryReservation.order_id.in_(ids))
+            )
+            db.session.execute(delete(Order.__table__).where(Order.id.in_(ids)))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        stats["batches"] += 1
+
+    elapsed = time.perf_counter() - started
+    rows = stats["orders"] + stats["order_items"] + stats["payments"]
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["rows_per_second"] = round(rows / elapsed, 1) if elapsed > 0 else 0.0
+    return stats
@@ -1,14 +1,28 @@
+from flask import current_app
+
 from app.errors import ServiceError
-from app.extensions import db, bcrypt
+from app.extensions import db
 from app.models.user import User
+from app.utils.cache import VersionedCache
 from app.utils.jwt_utils import generate_access_token
+from app.utils.passwords import check_and_rehash, hash_password
+
+# Per-worker LRU/TTL cache of user identities (id, email, is_admin) for
+# admin_required, /auth/me and /user/<id>; set_user_admin bumps its version.
+# Bumps reach other hosts only through a shared CACHE_VERSION_STORE; with the
+# default per-host files a revoked role lasts up to CACHE_TTL_SECONDS there.
+identity_cache = VersionedCache("identities")
+
+
+class _NoSuchUser(Exception):
+    """Raised by the identity loader so unknown ids are not cached."""
 
 
 def create_user(username, email, password):
     if User.query.filter(User.email == email).first():
         raise ValueError("User with this email already exists")
 
-    password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+    password_hash = hash_password(password)
     user = User(username=username, email=email, password_hash=password_hash)
 
     db.session.add(user)
@@ -24,16 +38,32 @@ def create_user(username, email, password):
 def authenticate_user(email, password):
     user = User.query.filter_by(email=email).first()
 
-    if user and bcrypt.check_password_hash(user.password_hash, password):
+    if not user:
+        return None, None
+
+    ok, new_hash = check_and_rehash(user.password_hash, password)
+    if ok:
+        if new_hash:
+            _store_rehash(user, new_hash)
 
         # JWT FIX → identity must be a STRING
-        token = generate_access_token(str(user.id))
+        token = generate_access_token(str(user.id), is_admin=user.is_admin)
 
         return user, token
 
     return None, None
 
 
+def _store_rehash(user, new_hash):
+    """Upgrade a hash made with outdated bcrypt parameters; never fails the login."""
+    user.password_hash = new_hash
+    try:
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning("password rehash for user %s not stored: %s", user.id, e)
+
+
 def get_user_by_id(user_id):
 
     # JWT stores identity as string, convert back to int
@@ -42,12 +72,36 @@ def get_user_by_id(user_id):
     except:
         return None
 
-    user = User.query.get(user_id)
+    try:
+        identity = identity_cache.get_or_load(user_id, lambda: _load_identity(user_id))
+    except _NoSuchUser:
+        return None
+    return identity
+
+
+def _load_identity(user_id):
+    user = db.session.get(User, user_id)
+    if not user:
+        raise _NoSuchUser(user_id)
+    return {
+        "id": user.id,
+        "email": user.email,
+        "is_admin": user.is_admin
+    }
+
+
+def set_user_admin(user_id, is_admin):
+    """Grant or revoke the admin role (commits) and invalidate cached identities in every worker."""
+    user = db.session.get(User, user_id)
+    if not user:
+        return None
 
-    if user:
-        return {
-            "id": user.id,
-            "email": user.email
-        }
+    user.is_admin = bool(is_admin)
+    try:
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        raise ServiceError(f"Database commit failed: {e}")
 
-    return None
+    identity_cache.bump()
+    return user
@@ -1,19 +1,49 @@
-from app.errors import ServiceError
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+
+from app.errors import ConflictError, ServiceError, ValidationError
 from app.extensions import db
 from app.models.cart import Cart
 from app.models.product import Product
+from app.services import inventory_services
+from app.utils.response import row_serializer
 
 def get_user_cart(user_id):
-    items = Cart.query.filter_by(user_id=user_id).all()
-    return [
-        {
-            "product_id": item.product_id,
-            "quantity": item.quantity,
-            "name": item.product.name,
-            "price": item.product.price,
-        }
-        for item in items
-    ]
+    """
+    Return (items, meta) for a user's cart in ONE query.
+
+    Cart lines are joined to only the product columns the response needs;
+    line totals and the cart subtotal / item count are computed in SQL
+    (window sums over the same result), so no product is lazy-loaded.
+    Lines whose product was deleted (product_id NULL) are skipped.
+    """
+    line_total = (Product.price * Cart.quantity).label("line_total")
+    stmt = (
+        select(
+            Cart.product_id,
+            Cart.quantity,
+            Product.name,
+            Product.price,
+            line_total,
+            func.sum(line_total).over().label("subtotal"),
+            func.sum(Cart.quantity).over().label("item_count"),
+        )
+        .join(Product, Cart.product_id == Product.id)
+        .where(Cart.user_id == int(user_id))
+        .order_by(Cart.id)
+    )
+    rows = db.session.execute(stmt).all()
+
+    serialize = row_serializer(list(stmt.selected_columns)[:5])
+    items = [serialize(row) for row in rows]
+    subtotal = rows[0].subtotal if rows else Decimal("0.00")
+    meta = {
+        "subtotal": str(subtotal),
+        "item_count": int(rows[0].item_count) if rows else 0,
+        "line_count": len(rows),
+    }
+    return items, meta
 
 
 def add_to_cart(data):
@@ -21,29 +51,79 @@ def add_to_cart(data):
     product_id = data.get("product_id")
     quantity = data.get("quantity", 1)
 
-    existing_item = Cart.query.filter_by(user_id=user_id, product_id=product_id).first()
-    if existing_item:
-        existing_item.quantity += quantity
-        try:
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            raise ServiceError(f"Database commit failed: {e}")
-        return {
-            "product_id": existing_item.product_id,
-            "quantity": existing_item.quantity,
-        }
-
-    cart_item = Cart(user_id=user_id, product_id=product_id, quantity=quantity)
-    db.session.add(cart_item)
-
     try:
+        new_quantity = _upsert_cart_line(user_id, product_id, quantity, mode="add")
+        _hold_for_line(user_id, product_id, quantity, mode="add")
         db.session.commit()
+    except ConflictError:
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         raise ServiceError(f"Database commit failed: {e}")
 
-    return {"product_id": cart_item.product_id, "quantity": cart_item.quantity}
+    return {"product_id": product_id, "quantity": new_quantity}
+
+
+def _upsert_cart_line(user_id, product_id, quantity, mode="add"):
+    """
+    Insert a cart line or change an existing one in a single statement.
+
+    mode="add": quantity = quantity + :n   mode="set": quantity = :n
+    Uses INSERT ... ON CONFLICT (Postgres/SQLite) or ON DUPLICATE KEY UPDATE
+    (MySQL) against uq_cart_user_product, so concurrent adds neither lose
+    updates nor trip the unique constraint. Returns the resulting quantity.
+    Runs in the caller's transaction.
+    """
+    table = Cart.__table__
+    values = {"user_id": user_id, "product_id": product_id, "quantity": quantity}
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(**values)
+        new_quantity = stmt.excluded.quantity if mode == "set" else table.c.quantity + stmt.excluded.quantity
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.product_id],
+            set_={"quantity": new_quantity, "updated_at": func.now()},
+        ).returning(table.c.quantity)
+        return db.session.execute(stmt).scalar_one()
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(**values)
+        new_quantity = stmt.inserted.quantity if mode == "set" else table.c.quantity + stmt.inserted.quantity
+        db.session.execute(stmt.on_duplicate_key_update(quantity=new_quantity, updated_at=func.now()))
+        # No RETURNING on MySQL; read back inside the same transaction
+        return db.session.execute(
+            select(table.c.quantity).where(table.c.user_id == user_id, table.c.product_id == product_id)
+        ).scalar_one()
+
+    # Other backends: read-modify-write under a row lock
+    item = Cart.query.filter_by(user_id=user_id, product_id=product_id).with_for_update().first()
+    if item:
+        item.quantity = quantity if mode == "set" else item.quantity + quantity
+    else:
+        item = Cart(user_id=user_id, product_id=product_id, quantity=quantity)
+        db.session.add(item)
+    db.session.flush()
+    return item.quantity
+
+
+def _hold_for_line(user_id, product_id, quantity, mode="add"):
+    """
+    With INVENTORY_HOLD_ON_CART, keep the user's stock holds in step with a
+    cart line change (raises ConflictError when stock is short). No-op otherwise.
+    """
+    if not inventory_services.holds_enabled():
+        return
+    if mode != "add":
+        inventory_services.release_holds(user_id, product_id)
+    if mode != "remove":
+        inventory_services.hold(user_id, product_id, quantity)
 
 
 def remove_from_cart(data):
@@ -54,6 +134,7 @@ def remove_from_cart(data):
     if item:
         db.session.delete(item)
         try:
+            _hold_for_line(user_id, product_id, 0, mode="remove")
             db.session.commit()
         except Exception as e:
             db.session.rollback()
@@ -61,3 +142,81 @@ def remove_from_cart(data):
         return True
 
     return False
+
+
+# -----------------------------
+# BATCH MUTATIONS
+# -----------------------------
+MAX_BATCH_OPERATIONS = 100
+BATCH_OPS = ("add", "remove", "set")
+
+
+def apply_cart_batch(user_id, operations):
+    """
+    Apply many add/remove/set operations to one user's cart in ONE transaction.
+
+    operations: [{"op": "add"|"set", "product_id": int, "quantity": int}, {"op": "remove", "product_id": int}]
+    Everything commits together or not at all. Returns the resulting cart as
+    (items, meta), like get_user_cart().
+    """
+    user_id = int(user_id)
+    ops = _validate_batch(operations)
+
+    wanted = {op["product_id"] for op in ops if op["op"] != "remove"}
+    if wanted:
+        found = {pid for (pid,) in db.session.query(Product.id).filter(Product.id.in_(wanted))}
+        missing = sorted(wanted - found)
+        if missing:
+            raise ValidationError("Unknown products in batch", details={"product_ids": missing})
+
+    table = Cart.__table__
+    try:
+        for op in ops:
+            if op["op"] == "remove" or (op["op"] == "set" and op["quantity"] == 0):
+                db.session.execute(
+                    delete(table).where(table.c.user_id == user_id, table.c.product_id == op["product_id"])
+                )
+                _hold_for_line(user_id, op["product_id"], 0, mode="remove")
+            else:
+                _upsert_cart_line(user_id, op["product_id"], op["quantity"], mode=op["op"])
+                _hold_for_line(user_id, op["product_id"], op["quantity"], mode=op["op"])
+        db.session.commit()
+    except ConflictError:
+        db.session.rollback()
+        raise
+    except Exception as e:
+        db.session.rollback()
+        raise ServiceError(f"Database commit failed: {e}")
+
+    return get_user_cart(user_id)
+
+
+def _validate_batch(operations):
+    if not isinstance(operations, list) or not operations:
+        raise ValidationError("operations must be a non-empty list")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValidationError(f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+
+    ops, errors = [], {}
+    for index, raw in enumerate(operations):
+        if not isinstance(raw, dict) or raw.get("op") not in BATCH_OPS:
+            errors[index] = f"op must be one of {', '.join(BATCH_OPS)}"
+            continue
+        op = {"op": raw["op"]}
+        product_id = raw.get("product_id")
+        if not isinstance(product_id, int) or isinstance(product_id, bool):
+            errors[index] = "product_id must be an integer"
+            continue
+        op["product_id"] = product_id
+        if op["op"] != "remove":
+            quantity = raw.get("quantity", 1 if op["op"] == "add" else None)
+            minimum = 1 if op["op"] == "add" else 0
+            if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < minimum:
+                errors[index] = f"quantity must be an integer >= {minimum}"
+                continue
+            op["quantity"] = quantity
+        ops.append(op)
+
+    if errors:
+        raise ValidationError("Invalid cart operations", details={"operations": errors})
+    return ops
@@ -1,8 +1,22 @@
 from app.errors import ServiceError
 from app.extensions import db
 from app.models.category import Category
+from app.services.product_facet_services import rebuild_facet_counts
+from app.services.product_services import product_cache
+from app.utils.cache import VersionedCache
+from app.utils.fieldsets import load_only_fields
+from app.utils.response import format_model
 
-def get_categories():
+# Read-through cache for the category list; every category write bumps its version
+category_cache = VersionedCache("categories")
+
+def get_categories(fields=None):
+    return category_cache.get_or_load(("list", fields), lambda: _load_categories(fields))
+
+def _load_categories(fields):
+    if fields:
+        categories = Category.query.options(*load_only_fields(Category, fields)).all()
+        return format_model(categories, many=True, fields=fields)
     categories = Category.query.all()
     return [{"id": c.id, "name": c.name} for c in categories]
 
@@ -14,6 +28,7 @@ def create_category(name):
     except Exception as e:
         db.session.rollback()
         raise ServiceError(f"Database commit failed: {e}")
+    category_cache.bump()
     return {"id": category.id, "name": category.name}
 
 
@@ -30,6 +45,7 @@ def update_category(category_id, name):
     except Exception as e:
         db.session.rollback()
         raise ServiceError(f"Database commit failed: {e}")
+    category_cache.bump()
     return {"id": category.id, "name": category.name}
 
 def delete_category(category_id):
@@ -38,7 +54,13 @@ def delete_category(category_id):
         return False
     try:
         db.session.delete(category)
+        db.session.flush()
+        # The cascade removed this category's products; recount facets in the same transaction
+        rebuild_facet_counts()
         db.session.commit()
+        category_cache.bump()
+        # Deleting a category cascades to its products
+        product_cache.bump()
         return True
     except Exception as e:
         db.session.rollback()
@@ -0,0 +1,135 @@
+"""
+Streaming exports (NDJSON / CSV) for admin tooling.
+
+Design:
+- Rows are read with a server-side cursor (stream_results + yield_per), as
+  plain column tuples (no ORM hydration), and written out chunk by chunk by a
+  generator; worker memory stays flat regardless of table size.
+- Optional gzip compresses the same generator incrementally.
+- Orders include archived rows (orders_archive) via UNION ALL.
+
+Usage (in a view):
+    chunks = export_chunks("products", "ndjson")
+    return Response(stream_with_context(gzip_chunks(chunks)), ...)
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from sqlalchemy import select, union_all
+
+from app.errors import ValidationError
+from app.extensions import db
+from app.models.archive import ArchivedOrder
+from app.models.order import Order
+from app.models.product import Product
+from app.models.user import User
+from app.utils.response import row_serializer
+
+# Rows fetched from the DB cursor per round trip
+STREAM_BATCH_SIZE = 1000
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# entity -> exported columns (never include secrets such as password_hash)
+EXPORTS = {
+    "products": [
+        Product.id, Product.name, Product.description, Product.price, Product.stock,
+        Product.category_id, Product.created_at, Product.updated_at,
+    ],
+    "orders": [
+        Order.id, Order.user_id, Order.total_amount, Order.status, Order.created_at, Order.updated_at,
+    ],
+    "users": [
+        User.id, User.username, User.email, User.created_at, User.updated_at,
+    ],
+}
+
+
+# entity -> archive table columns (same names/order) streamed together with the hot table
+ARCHIVED = {
+    "orders": [
+        ArchivedOrder.id, ArchivedOrder.user_id, ArchivedOrder.total_amount, ArchivedOrder.status,
+        ArchivedOrder.created_at, ArchivedOrder.updated_at,
+    ],
+}
+
+
+def _columns(entity):
+    columns = EXPORTS.get(entity)
+    if columns is None:
+        raise ValidationError(f"Unknown export: {entity}", details={"exports": sorted(EXPORTS)})
+    return [c.property.columns[0] if hasattr(c, "property") else c for c in columns]
+
+
+def stream_rows(entity):
+    """Yield serialized dict rows for an entity, ordered by id, via a server-side cursor."""
+    columns = _columns(entity)
+    serialize = row_serializer(columns)
+    stmt = select(*columns)
+    if entity in ARCHIVED:
+        # Archived rows keep their ids; one UNION ALL keeps the export ordered by id
+        rows = union_all(stmt, select(*ARCHIVED[entity])).subquery()
+        stmt = select(*rows.c)
+    stmt = stmt.order_by(stmt.selected_columns[0]).execution_options(
+        stream_results=True, yield_per=STREAM_BATCH_SIZE
+    )
+    result = db.session.execute(stmt)
+    try:
+        for row in result:
+            yield serialize(row)
+    finally:
+        result.close()
+
+
+def export_chunks(entity, fmt):
+    """Yield encoded output chunks (bytes), one per STREAM_BATCH_SIZE rows."""
+    if fmt not in FORMATS:
+        raise ValidationError(f"Unsupported export format: {fmt}", details={"formats": sorted(FORMATS)})
+    # Validate eagerly so a bad entity fails before the response starts
+    columns = _columns(entity)
+    if fmt == "csv":
+        return _csv_chunks(entity, [c.key for c in columns])
+    return _ndjson_chunks(entity)
+
+
+def _ndjson_chunks(entity):
+    buffer = []
+    for row in stream_rows(entity):
+        buffer.append(json.dumps(row, separators=(",", ":")))
+        if len(buffer) >= STREAM_BATCH_SIZE:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer = []
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+
+def _csv_chunks(entity, header):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(header)
+    pending = 0
+    for row in stream_rows(entity):
+        writer.writerow([row[name] for name in header])
+        pending += 1
+        if pending >= STREAM_BATCH_SIZE:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+            pending = 0
+    yield out.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip-compress a chunk generator incrementally (constant memory)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,218 @@
+"""
+Idempotency keys for retried POSTs (see app.utils.decorators.idempotent).
+
+Flow for a request carrying `Idempotency-Key: <key>`:
+1. begin(): INSERT (scope, key) as in-progress and commit. The unique
+   constraint makes exactly one concurrent request the owner. Scopes are
+   per caller (caller_scope()), so two users never share a key.
+2. Everyone else finds the existing row:
+   - completed        -> replay the stored response
+   - in progress      -> poll until the owner finishes (IDEMPOTENCY_WAIT_SECONDS),
+                         then replay; 409 if it is still running
+   - expired          -> delete it and try to become the owner. The owner
+                         renews its in-progress claim while the view runs
+                         (holding()), so only a crashed owner's claim expires,
+                         IDEMPOTENCY_LOCK_SECONDS after its last renewal
+   - different body   -> 409: a key must not be reused for another request
+3. The owner stores a successful (2xx) response with complete(); on any
+   error it release()s the key so the client's retry runs again.
+
+Expired rows are removed by purge_expired_keys() in bounded chunks.
+
+Config keys (all optional):
+  - IDEMPOTENCY_TTL_SECONDS   (how long a completed response is replayed, default 24h)
+  - IDEMPOTENCY_LOCK_SECONDS  (lifetime of an in-progress claim, default 60)
+  - IDEMPOTENCY_WAIT_SECONDS  (how long a duplicate waits for the owner, default 10)
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.errors import ConflictError, ValidationError
+from app.extensions import db
+from app.models.idempotency import IdempotencyKey, IdempotencyStatus
+
+MAX_KEY_LENGTH = 255
+MAX_SCOPE_LENGTH = 64
+PURGE_BATCH_SIZE = 1000
+
+_keys = IdempotencyKey.__table__
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def request_fingerprint(method, path, body):
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), body or b""):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def caller_scope(scope, caller):
+    """Scope a key to one caller ("user:<id>" or "ip:<addr>"), within the scope column's length."""
+    scoped = f"{scope}|{caller}"
+    if len(scoped) > MAX_SCOPE_LENGTH:
+        scoped = f"{scope}|{hashlib.sha256(caller.encode()).hexdigest()[:24]}"
+    return scoped[:MAX_SCOPE_LENGTH]
+
+
+def begin(scope, key, request_hash):
+    """
+    Claim (scope, key) for this request.
+
+    Returns None when this request now owns the key and must run the endpoint,
+    or the stored (status, content_type, body) to replay.
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+    lock_seconds = current_app.config.get("IDEMPOTENCY_LOCK_SECONDS", 60)
+    deadline = time.monotonic() + current_app.config.get("IDEMPOTENCY_WAIT_SECONDS", 10)
+    delay = 0.05
+    attempt = 0
+    while True:
+        attempt += 1
+        if attempt > 1 and time.monotonic() >= deadline:
+            raise ConflictError(
+                "A request with this Idempotency-Key is still in progress", code="idempotency_in_progress"
+            )
+        try:
+            db.session.execute(
+                insert(_keys).values(
+                    scope=scope,
+                    key=key,
+                    request_hash=request_hash,
+                    status=IdempotencyStatus.IN_PROGRESS,
+                    expires_at=_now() + timedelta(seconds=lock_seconds),
+                )
+            )
+            db.session.commit()
+            return None
+        except IntegrityError:
+            db.session.rollback()
+
+        row = db.session.execute(
+            select(
+                _keys.c.id, _keys.c.request_hash, _keys.c.status, _keys.c.expires_at,
+                _keys.c.response_status, _keys.c.response_content_type, _keys.c.response_body,
+            ).where(_keys.c.scope == scope, _keys.c.key == key)
+        ).first()
+        db.session.commit()
+        if row is None:
+            continue  # owner released it in the meantime; try again
+
+        if _is_expired(row.expires_at):
+            db.session.execute(delete(_keys).where(_keys.c.id == row.id, _keys.c.expires_at == row.expires_at))
+            db.session.commit()
+            continue
+        if row.request_hash != request_hash:
+            raise ConflictError(
+                "Idempotency-Key was already used for a different request", code="idempotency_key_reused"
+            )
+        if row.status == IdempotencyStatus.COMPLETED:
+            return row.response_status, row.response_content_type, row.response_body
+
+        if time.monotonic() >= deadline:
+            raise ConflictError(
+                "A request with this Idempotency-Key is still in progress", code="idempotency_in_progress"
+            )
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+@contextmanager
+def holding(scope, key):
+    """
+    Renew the owner's in-progress claim every IDEMPOTENCY_LOCK_SECONDS / 3
+    while the view runs, so a slow owner is never taken over by a duplicate.
+    Renewals use their own connection from a helper thread.
+    """
+    if db.engine.dialect.name == "sqlite":
+        # One shared connection (tests / single-process dev): nothing to race with
+        yield
+        return
+
+    lock_seconds = current_app.config.get("IDEMPOTENCY_LOCK_SECONDS", 60)
+    app = current_app._get_current_object()
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(lock_seconds / 3):
+            try:
+                with app.app_context(), db.engine.begin() as conn:
+                    conn.execute(
+                        update(_keys)
+                        .where(_keys.c.scope == scope, _keys.c.key == key,
+                               _keys.c.status == IdempotencyStatus.IN_PROGRESS)
+                        .values(expires_at=_now() + timedelta(seconds=lock_seconds))
+                    )
+            except Exception as exc:
+                app.logger.warning("idempotency claim renewal for %s failed: %s", scope, exc)
+
+    renewer = threading.Thread(target=renew, name="idempotency-renew", daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+
+
+def _is_expired(expires_at):
+    if expires_at.tzinfo is None:
+        # SQLite returns naive datetimes (stored as UTC)
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= _now()
+
+
+def complete(scope, key, status_code, content_type, body):
+    """Store the owner's response so duplicates can replay it for the TTL."""
+    ttl = current_app.config.get("IDEMPOTENCY_TTL_SECONDS", 86400)
+    db.session.execute(
+        update(_keys)
+        .where(_keys.c.scope == scope, _keys.c.key == key)
+        .values(
+            status=IdempotencyStatus.COMPLETED,
+            response_status=status_code,
+            response_content_type=content_type,
+            response_body=body,
+            expires_at=_now() + timedelta(seconds=ttl),
+        )
+    )
+    db.session.commit()
+
+
+def release(scope, key):
+    """Drop an in-progress key after a failed attempt so a retry runs the endpoint again."""
+    db.session.rollback()
+    db.session.execute(
+        delete(_keys).where(
+            _keys.c.scope == scope, _keys.c.key == key, _keys.c.status == IdempotencyStatus.IN_PROGRESS
+        )
+    )
+    db.session.commit()
+
+
+def purge_expired_keys(batch_size=PURGE_BATCH_SIZE):
+    """Delete expired keys in chunks of batch_size (one short transaction each); returns rows deleted."""
+    total = 0
+    while True:
+        ids = db.session.execute(
+            select(_keys.c.id).where(_keys.c.expires_at <= _now()).order_by(_keys.c.expires_at).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            db.session.commit()
+            return total
+        db.session.execute(delete(_keys).where(_keys.c.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
@@ -0,0 +1,395 @@
+"""
+Inventory reservation engine.
+
+Stock lives either in products.stock (normal products) or, for hot SKUs, in
+N stock_shards counter rows (see app.models.inventory). Every decrement is a
+guarded UPDATE (... WHERE available >= :qty), so stock never goes negative
+and no read-modify-write race exists.
+
+- hold()/release_holds(): time-limited holds taken at add-to-cart
+  (config INVENTORY_HOLD_ON_CART) so stock is set aside while a buyer shops.
+- allocate_for_order(): at checkout, converts the buyer's live holds into the
+  order and takes any remainder from shards / products.stock.
+- sweep_expired_reservations(): background sweeper returning expired holds.
+- reshard_product_stock(): spread (or collapse) a product's stock over shards.
+
+All functions run in the caller's transaction unless noted; the caller commits.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import case, delete, func, insert, select, update
+
+from app.errors import ConflictError, ValidationError
+from app.extensions import db
+from app.models.inventory import InventoryReservation, ReservationStatus, StockShard
+from app.models.product import Product
+
+DEFAULT_HOLD_SECONDS = 900
+DEFAULT_SWEEP_BATCH = 500
+MAX_SHARDS = 256
+
+_products = Product.__table__
+_shards = StockShard.__table__
+_reservations = InventoryReservation.__table__
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def holds_enabled():
+    return bool(current_app.config.get("INVENTORY_HOLD_ON_CART", False))
+
+
+def sharded_product_ids(product_ids):
+    """Subset of product_ids whose stock is kept in shard rows."""
+    if not product_ids:
+        return set()
+    rows = db.session.execute(
+        select(_shards.c.product_id).where(_shards.c.product_id.in_(list(product_ids))).distinct()
+    )
+    return {pid for (pid,) in rows}
+
+
+# -----------------------------
+# STOCK DECREMENT / RETURN
+# -----------------------------
+def _take_from_shards(product_id, quantity):
+    """
+    Decrement `quantity` from a product's shards.
+
+    Fast path: try shards in random order with a guarded single-row UPDATE, so
+    concurrent buyers spread over different row locks. Slow path (no single
+    shard has enough): lock all shards in shard order and drain across them.
+    Returns [(shard_no, taken), ...] or None when total stock is insufficient.
+    """
+    shard_nos = [
+        n for (n,) in db.session.execute(
+            select(_shards.c.shard_no).where(_shards.c.product_id == product_id, _shards.c.available > 0)
+        )
+    ]
+    random.shuffle(shard_nos)
+    for shard_no in shard_nos:
+        result = db.session.execute(
+            update(_shards)
+            .where(
+                _shards.c.product_id == product_id,
+                _shards.c.shard_no == shard_no,
+                _shards.c.available >= quantity,
+            )
+            .values(available=_shards.c.available - quantity)
+        )
+        if result.rowcount:
+            return [(shard_no, quantity)]
+
+    rows = db.session.execute(
+        select(_shards.c.shard_no, _shards.c.available)
+        .where(_shards.c.product_id == product_id)
+        .order_by(_shards.c.shard_no)
+        .with_for_update()
+    ).all()
+    if sum(available for _, available in rows) < quantity:
+        return None
+
+    taken, remaining = [], quantity
+    for shard_no, available in rows:
+        take = min(available, remaining)
+        if take <= 0:
+            continue
+        db.session.execute(
+            update(_shards)
+            .where(_shards.c.product_id == product_id, _shards.c.shard_no == shard_no)
+            .values(available=_shards.c.available - take)
+        )
+        taken.append((shard_no, take))
+        remaining -= take
+        if not remaining:
+            break
+    return taken
+
+
+def _take_from_products(needs):
+    """
+    Decrement products.stock for {product_id: qty} in ONE guarded UPDATE.
+
+    Returns the sorted list of products that were short (empty on success).
+    On a short result nothing should be kept: the caller must roll back.
+    """
+    quantity = case(needs, value=_products.c.id)
+    result = db.session.execute(
+        update(_products)
+        .where(_products.c.id.in_(list(needs)), _products.c.stock >= quantity)
+        .values(stock=_products.c.stock - quantity)
+    )
+    if result.rowcount == len(needs):
+        return []
+    stock = db.session.execute(select(_products.c.id, _products.c.stock).where(_products.c.id.in_(list(needs))))
+    available = dict(stock.all())
+    return sorted(pid for pid, qty in needs.items() if available.get(pid, 0) < qty)
+
+
+def _return_stock(parts):
+    """Give back stock: parts is {(product_id, shard_no or None): qty}."""
+    for (product_id, shard_no), qty in parts.items():
+        if qty <= 0:
+            continue
+        if shard_no is None:
+            db.session.execute(
+                update(_products).where(_products.c.id == product_id).values(stock=_products.c.stock + qty)
+            )
+        else:
+            db.session.execute(
+                update(_shards)
+                .where(_shards.c.product_id == product_id, _shards.c.shard_no == shard_no)
+                .values(available=_shards.c.available + qty)
+            )
+
+
+def out_of_stock_product_ids(product_ids):
+    """Subset of product_ids with no available stock left (shard sum for sharded products)."""
+    if not product_ids:
+        return set()
+    shard_total = (
+        select(func.sum(_shards.c.available)).where(_shards.c.product_id == _products.c.id).scalar_subquery()
+    )
+    rows = db.session.execute(
+        select(_products.c.id).where(
+            _products.c.id.in_(list(product_ids)), func.coalesce(shard_total, _products.c.stock) <= 0
+        )
+    )
+    return {pid for (pid,) in rows}
+
+
+# -----------------------------
+# HOLDS
+# -----------------------------
+def hold(user_id, product_id, quantity, ttl_seconds=None):
+    """
+    Set aside `quantity` units for a user until the hold expires.
+
+    Raises ConflictError when stock is insufficient.
+    """
+    if quantity <= 0:
+        return
+    if product_id in sharded_product_ids([product_id]):
+        taken = _take_from_shards(product_id, quantity)
+    else:
+        taken = None if _take_from_products({product_id: quantity}) else [(None, quantity)]
+    if taken is None:
+        raise ConflictError("Insufficient stock", details={"product_ids": [product_id]})
+
+    ttl = ttl_seconds or current_app.config.get("INVENTORY_HOLD_SECONDS", DEFAULT_HOLD_SECONDS)
+    expires_at = _now() + timedelta(seconds=ttl)
+    db.session.execute(
+        insert(_reservations),
+        [
+            {
+                "product_id": product_id,
+                "user_id": user_id,
+                "shard_no": shard_no,
+                "quantity": qty,
+                "status": ReservationStatus.HELD,
+                "expires_at": expires_at,
+            }
+            for shard_no, qty in taken
+        ],
+    )
+
+
+def release_holds(user_id, product_id=None):
+    """Release a user's live holds (optionally for one product); returns units released."""
+    stmt = select(
+        _reservations.c.id, _reservations.c.product_id, _reservations.c.shard_no, _reservations.c.quantity
+    ).where(_reservations.c.user_id == user_id, _reservations.c.status == ReservationStatus.HELD)
+    if product_id is not None:
+        stmt = stmt.where(_reservations.c.product_id == product_id)
+    return _transition_and_return(db.session.execute(stmt).all(), ReservationStatus.RELEASED)
+
+
+def _transition_and_return(rows, new_status):
+    """
+    Move held reservations to new_status and give their stock back.
+
+    Each row transitions with its own guarded UPDATE (status = 'held'), so a
+    reservation committed or released concurrently is never returned twice.
+    """
+    parts, released = {}, 0
+    for row in rows:
+        result = db.session.execute(
+            update(_reservations)
+            .where(_reservations.c.id == row.id, _reservations.c.status == ReservationStatus.HELD)
+            .values(status=new_status)
+        )
+        if result.rowcount:
+            key = (row.product_id, row.shard_no)
+            parts[key] = parts.get(key, 0) + row.quantity
+            released += row.quantity
+    _return_stock(parts)
+    return released
+
+
+# -----------------------------
+# CHECKOUT
+# -----------------------------
+def allocate_for_order(order_id, user_id, lines):
+    """
+    Allocate stock for an order's lines ((product_id, quantity) pairs).
+
+    Live holds of this user are committed to the order first; only the
+    remainder is taken from shards / products.stock. Returns the sorted list
+    of short product ids; if non-empty the caller must roll back.
+    """
+    needs = {line.product_id: line.quantity for line in lines}
+    product_ids = list(needs)
+
+    db.session.execute(
+        update(_reservations)
+        .where(
+            _reservations.c.user_id == user_id,
+            _reservations.c.product_id.in_(product_ids),
+            _reservations.c.status == ReservationStatus.HELD,
+            _reservations.c.expires_at > _now(),
+        )
+        .values(status=ReservationStatus.COMMITTED, order_id=order_id)
+    )
+    held = dict(
+        db.session.execute(
+            select(_reservations.c.product_id, func.sum(_reservations.c.quantity))
+            .where(_reservations.c.order_id == order_id, _reservations.c.status == ReservationStatus.COMMITTED)
+            .group_by(_reservations.c.product_id)
+        ).all()
+    )
+
+    shorts, direct = [], {}
+    sharded = sharded_product_ids(product_ids)
+    for product_id, quantity in needs.items():
+        missing = quantity - int(held.get(product_id) or 0)
+        if missing < 0:
+            _return_surplus(order_id, product_id, -missing)
+        elif missing > 0:
+            if product_id in sharded:
+                if _take_from_shards(product_id, missing) is None:
+                    shorts.append(product_id)
+            else:
+                direct[product_id] = missing
+
+    if direct:
+        shorts.extend(_take_from_products(direct))
+    return sorted(shorts)
+
+
+def _return_surplus(order_id, product_id, surplus):
+    """Held more than the cart line needs: shrink committed holds and return the difference."""
+    rows = db.session.execute(
+        select(_reservations.c.id, _reservations.c.shard_no, _reservations.c.quantity)
+        .where(_reservations.c.order_id == order_id, _reservations.c.product_id == product_id)
+        .order_by(_reservations.c.id.desc())
+    ).all()
+    parts = {}
+    for row in rows:
+        give = min(row.quantity, surplus)
+        db.session.execute(
+            update(_reservations).where(_reservations.c.id == row.id).values(quantity=row.quantity - give)
+        )
+        parts[(product_id, row.shard_no)] = parts.get((product_id, row.shard_no), 0) + give
+        surplus -= give
+        if not surplus:
+            break
+    _return_stock(parts)
+
+
+# -----------------------------
+# SWEEPER
+# -----------------------------
+def sweep_expired_reservations(batch_size=None):
+    """
+    Expire one batch of overdue holds, return their stock, and refresh the
+    display stock of sharded products. Commits. Returns stats.
+    """
+    batch_size = batch_size or current_app.config.get("INVENTORY_SWEEP_BATCH", DEFAULT_SWEEP_BATCH)
+    rows = db.session.execute(
+        select(_reservations.c.id, _reservations.c.product_id, _reservations.c.shard_no, _reservations.c.quantity)
+        .where(_reservations.c.status == ReservationStatus.HELD, _reservations.c.expires_at <= _now())
+        .order_by(_reservations.c.expires_at)
+        .limit(batch_size)
+    ).all()
+    units = _transition_and_return(rows, ReservationStatus.EXPIRED) if rows else 0
+    synced = sync_sharded_display_stock()
+    db.session.commit()
+    return {"expired": len(rows), "units_returned": units, "sharded_products_synced": synced}
+
+
+def sync_sharded_display_stock():
+    """Write sum(shards) into products.stock for sharded products (read paths show products.stock)."""
+    total = (
+        select(func.coalesce(func.sum(_shards.c.available), 0))
+        .where(_shards.c.product_id == _products.c.id)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        update(_products)
+        .where(_products.c.id.in_(select(_shards.c.product_id).distinct()))
+        .values(stock=total)
+    )
+    return result.rowcount
+
+
+# -----------------------------
+# SHARD MANAGEMENT
+# -----------------------------
+def reshard_product_stock(product_id, shards, total=None):
+    """
+    Spread a product's available stock evenly over `shards` counter rows
+    (0 collapses it back into products.stock). `total` overrides the current
+    available quantity (used when an admin sets the stock). Caller commits.
+
+    Outstanding holds are remapped in the same transaction so their units
+    return to a counter that still exists: onto the new shards (spread by
+    reservation id), or to products.stock (shard_no NULL) when unsharding.
+    """
+    if shards < 0 or shards > MAX_SHARDS:
+        raise ValidationError(f"shards must be between 0 and {MAX_SHARDS}")
+
+    product = db.session.execute(
+        select(_products.c.id, _products.c.stock).where(_products.c.id == product_id).with_for_update()
+    ).first()
+    if product is None:
+        return False
+
+    current = db.session.execute(
+        select(_shards.c.shard_no, _shards.c.available).where(_shards.c.product_id == product_id).with_for_update()
+    ).all()
+    if total is None:
+        total = sum(available for _, available in current) if current else product.stock
+
+    db.session.execute(delete(_shards).where(_shards.c.product_id == product_id))
+    if shards:
+        base, extra = divmod(int(total), shards)
+        db.session.execute(
+            insert(_shards),
+            [
+                {"product_id": product_id, "shard_no": n, "available": base + (1 if n < extra else 0)}
+                for n in range(shards)
+            ],
+        )
+    db.session.execute(update(_products).where(_products.c.id == product_id).values(stock=total))
+    # Held units are outside `available`; point them at counters that exist now
+    db.session.execute(
+        update(_reservations)
+        .where(_reservations.c.product_id == product_id, _reservations.c.status == ReservationStatus.HELD)
+        .values(shard_no=(_reservations.c.id % shards) if shards else None)
+    )
+    return True
+
+
+def set_sharded_stock(product_id, total):
+    """If the product is sharded, redistribute `total` over its shards and return True."""
+    count = db.session.execute(
+        select(func.count()).select_from(_shards).where(_shards.c.product_id == product_id)
+    ).scalar()
+    if not count:
+        return False
+    return reshard_product_stock(product_id, count, total=total)
@@ -0,0 +1,282 @@
+"""
+Database-backed background job queue.
+
+- register_job(name): decorator registering a handler; handlers take the
+  job payload as keyword arguments and run inside an app context.
+- enqueue(name, **payload): adds a job in the CALLER's transaction, so it is
+  only visible to workers once the triggering write commits (and vanishes
+  with it on rollback).
+- claim_jobs(): atomically moves due jobs to 'running' for one worker.
+  Postgres/MySQL use SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers
+  never wait on each other; other backends (SQLite) use a guarded UPDATE
+  (... WHERE status = 'queued') so a job is still claimed by only one worker.
+- Worker: polls, claims up to `concurrency` jobs and runs them on a thread
+  pool. Failures are retried with exponential backoff and jitter until
+  max_attempts, then left as 'failed'. Jobs whose worker died while running
+  are reclaimed after JOB_LOCK_TIMEOUT.
+
+Config keys (all optional):
+  - JOB_CONCURRENCY        (threads per worker, default 4)
+  - JOB_POLL_INTERVAL      (seconds between empty polls, default 1)
+  - JOB_MAX_ATTEMPTS       (default 5)
+  - JOB_RETRY_BASE_DELAY   (seconds, doubled per attempt, default 5)
+  - JOB_RETRY_MAX_DELAY    (seconds, default 600)
+  - JOB_LOCK_TIMEOUT       (seconds before a running job is reclaimed, default 300)
+  - JOB_RETENTION_SECONDS  (finished jobs kept this long, default 7 days)
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import and_, delete, insert, or_, select, update
+
+from app.extensions import db
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "default"
+PURGE_BATCH_SIZE = 1000
+
+_jobs = Job.__table__
+_handlers = {}
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _config(key, default):
+    return current_app.config.get(key, default)
+
+
+# -----------------------------
+# REGISTRY / ENQUEUE
+# -----------------------------
+def register_job(name):
+    """Register the decorated function as the handler for job `name`."""
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, queue=DEFAULT_QUEUE, delay=0, max_attempts=None, **payload):
+    """Add a job in the caller's transaction (the caller commits)."""
+    if name not in _handlers:
+        raise ValueError(f"Unknown job: {name}")
+    db.session.execute(
+        insert(_jobs).values(
+            queue=queue,
+            name=name,
+            payload=payload,
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=max_attempts or _config("JOB_MAX_ATTEMPTS", 5),
+            run_at=_now() + timedelta(seconds=delay),
+        )
+    )
+
+
+# -----------------------------
+# CLAIM / COMPLETE
+# -----------------------------
+def _due_condition(now):
+    stale = now - timedelta(seconds=_config("JOB_LOCK_TIMEOUT", 300))
+    return or_(
+        and_(_jobs.c.status == JobStatus.QUEUED, _jobs.c.run_at <= now),
+        and_(_jobs.c.status == JobStatus.RUNNING, _jobs.c.locked_at < stale),
+    )
+
+
+def claim_jobs(worker_id, limit, queues=(DEFAULT_QUEUE,)):
+    """
+    Claim up to `limit` due jobs for this worker and commit.
+
+    Returns [(job_id, claim_token), ...]; the token must be passed back to
+    complete_job()/fail_job() so a worker whose lock expired cannot overwrite
+    the outcome of the worker that reclaimed the job.
+    """
+    if limit <= 0:
+        return []
+    now = _now()
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    candidates = (
+        select(_jobs.c.id)
+        .where(_jobs.c.queue.in_(list(queues)), _due_condition(now))
+        .order_by(_jobs.c.run_at, _jobs.c.id)
+        .limit(limit)
+    )
+    if db.session.get_bind().dialect.name in ("postgresql", "mysql"):
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    try:
+        ids = db.session.execute(candidates).scalars().all()
+        if not ids:
+            db.session.commit()
+            return []
+        db.session.execute(
+            update(_jobs)
+            # Re-check due-ness: without row locks another worker may have won the race
+            .where(_jobs.c.id.in_(ids), _due_condition(now))
+            .values(status=JobStatus.RUNNING, locked_by=token, locked_at=now, attempts=_jobs.c.attempts + 1)
+        )
+        claimed = db.session.execute(select(_jobs.c.id).where(_jobs.c.locked_by == token)).scalars().all()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return [(job_id, token) for job_id in claimed]
+
+
+def complete_job(job_id, token):
+    db.session.execute(
+        update(_jobs)
+        .where(_jobs.c.id == job_id, _jobs.c.locked_by == token)
+        .values(status=JobStatus.DONE, locked_by=None, locked_at=None, last_error=None)
+    )
+    db.session.commit()
+
+
+def retry_delay(attempts):
+    """Exponential backoff with +/-50% jitter, capped at JOB_RETRY_MAX_DELAY."""
+    base = _config("JOB_RETRY_BASE_DELAY", 5)
+    delay = min(_config("JOB_RETRY_MAX_DELAY", 600), base * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.5, 1.5)
+
+
+def fail_job(job_id, token, error):
+    """Reschedule a failed job with backoff, or mark it failed once attempts are used up."""
+    row = db.session.execute(
+        select(_jobs.c.attempts, _jobs.c.max_attempts).where(_jobs.c.id == job_id, _jobs.c.locked_by == token)
+    ).first()
+    if row is None:
+        db.session.commit()
+        return
+    values = {"locked_by": None, "locked_at": None, "last_error": error[:2000]}
+    if row.attempts >= row.max_attempts:
+        values["status"] = JobStatus.FAILED
+    else:
+        values["status"] = JobStatus.QUEUED
+        values["run_at"] = _now() + timedelta(seconds=retry_delay(row.attempts))
+    db.session.execute(update(_jobs).where(_jobs.c.id == job_id, _jobs.c.locked_by == token).values(**values))
+    db.session.commit()
+
+
+def run_job(job_id, token):
+    """Run one claimed job in the current app context and record the outcome."""
+    job = db.session.execute(
+        select(_jobs.c.name, _jobs.c.payload).where(_jobs.c.id == job_id, _jobs.c.locked_by == token)
+    ).first()
+    db.session.commit()
+    if job is None:
+        return False
+
+    handler = _handlers.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {job.name!r}")
+        handler(**(job.payload or {}))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Job %s (%s) failed", job_id, job.name)
+        fail_job(job_id, token, f"{type(e).__name__}: {e}")
+        return False
+    complete_job(job_id, token)
+    return True
+
+
+def purge_finished_jobs(older_than_seconds=None):
+    """Delete done jobs older than the retention window in bounded chunks; returns rows deleted."""
+    retention = older_than_seconds if older_than_seconds is not None else _config("JOB_RETENTION_SECONDS", 7 * 86400)
+    cutoff = _now() - timedelta(seconds=retention)
+    total = 0
+    while True:
+        ids = db.session.execute(
+            select(_jobs.c.id)
+            .where(_jobs.c.status == JobStatus.DONE, _jobs.c.updated_at < cutoff)
+            .limit(PURGE_BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        db.session.execute(delete(_jobs).where(_jobs.c.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
+    return total
+
+
+# -----------------------------
+# WORKER
+# -----------------------------
+class Worker:
+    """Polls the jobs table and runs claimed jobs on a thread pool."""
+
+    PURGE_EVERY_SECONDS = 3600
+
+    def __init__(self, app, queues=(DEFAULT_QUEUE,), concurrency=None, poll_interval=None):
+        self.app = app
+        self.queues = tuple(queues)
+        self.concurrency = concurrency or app.config.get("JOB_CONCURRENCY", 4)
+        self.poll_interval = poll_interval or app.config.get("JOB_POLL_INTERVAL", 1.0)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+
+    def stop(self):
+        self._stop.set()
+
+    def _execute(self, job_id, token):
+        try:
+            with self.app.app_context():
+                try:
+                    run_job(job_id, token)
+                finally:
+                    db.session.remove()
+        finally:
+            with self._inflight_lock:
+                self._inflight -= 1
+
+    def run_once(self, executor):
+        """Claim as many jobs as there are free threads; returns how many were submitted."""
+        with self._inflight_lock:
+            free = self.concurrency - self._inflight
+        with self.app.app_context():
+            try:
+                claimed = claim_jobs(self.worker_id, free, self.queues)
+            finally:
+                db.session.remove()
+        for job_id, token in claimed:
+            with self._inflight_lock:
+                self._inflight += 1
+            executor.submit(self._execute, job_id, token)
+        return len(claimed)
+
+    def run(self, burst=False):
+        """Process jobs until stop() (or, with burst=True, until the queue is empty)."""
+        last_purge = 0.0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job") as executor:
+            while not self._stop.is_set():
+                if time.monotonic() - last_purge > self.PURGE_EVERY_SECONDS:
+                    with self.app.app_context():
+                        purge_finished_jobs()
+                        db.session.remove()
+                    last_purge = time.monotonic()
+
+                submitted = self.run_once(executor)
+                if submitted:
+                    continue
+                with self._inflight_lock:
+                    idle = self._inflight == 0
+                if burst and idle:
+                    break
+                self._stop.wait(self.poll_interval)
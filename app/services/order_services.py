@@ -1,35 +1,170 @@
-from app.errors import ServiceError
+from flask import current_app
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import selectinload
+
+from app.errors import ConflictError, ServiceError, ValidationError
 from app.extensions import db
-from app.models.order import Order
+from app.models.archive import ArchivedOrder, ArchivedOrderItem
+from app.models.order import Order, OrderItem, OrderStatus
 from app.models.cart import Cart
 from app.models.product import Product
+from app.services.inventory_services import allocate_for_order, out_of_stock_product_ids
+from app.services.job_services import enqueue, register_job
+from app.services.product_services import product_cache
+from app.utils.fieldsets import load_only_fields
+from app.utils.pagination import encode_cursor, keyset_filter
+from app.utils.response import format_model
+
+# Order history columns when the client does not pass ?fields=
+SUMMARY_FIELDS = ("id", "total_amount", "status", "created_at")
 
 def create_order(data):
+    """
+    Check out the user's cart as ONE transaction.
+
+    1. Read cart lines joined to current product prices (one query).
+    2. Insert the order, then allocate stock for it (see
+       inventory_services.allocate_for_order): the user's live holds are
+       committed to the order and the remainder is taken with guarded
+       UPDATEs (shard rows for hot products, products.stock otherwise). If
+       any line is short the whole checkout rolls back with a ConflictError.
+    3. Bulk-insert price- and category-snapshotted OrderItems and delete the checked-out
+       cart lines with one DELETE.
+    4. Enqueue the "order.placed" job; slow follow-up work runs on a worker.
+    5. Invalidate the catalog cache only if a product sold out.
+    """
     user_id = data.get("user_id")
-    cart_items = Cart.query.filter_by(user_id=user_id).all()
-    if not cart_items:
+    lines = db.session.execute(
+        select(Cart.product_id, Cart.quantity, Product.price, Product.category_id)
+        .join(Product, Cart.product_id == Product.id)
+        .where(Cart.user_id == user_id)
+        .order_by(Cart.product_id)
+    ).all()
+    if not lines:
         return None
 
-    total_amount = sum(item.product.price * item.quantity for item in cart_items)
-    order = Order(user_id=user_id, total_amount=total_amount, status="pending")
-    db.session.add(order)
-    try:
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        raise ServiceError(f"Database commit failed: {e}")
+    total_amount = sum(line.price * line.quantity for line in lines)
+    product_ids = [line.product_id for line in lines]
 
-    # Optional: clear cart after creating order
-    for item in cart_items:
-        db.session.delete(item)
     try:
+        order = Order(user_id=user_id, total_amount=total_amount, status=OrderStatus.PENDING)
+        db.session.add(order)
+        db.session.flush()
+
+        shorts = allocate_for_order(order.id, user_id, lines)
+        if shorts:
+            db.session.rollback()
+            raise ConflictError("Insufficient stock", details={"product_ids": shorts})
+
+        db.session.execute(
+            insert(OrderItem.__table__),
+            [
+                {
+                    "order_id": order.id,
+                    "product_id": line.product_id,
+                    "quantity": line.quantity,
+                    "price": line.price,
+                    "category_id": line.category_id,
+                }
+                for line in lines
+            ],
+        )
+        db.session.execute(
+            delete(Cart.__table__).where(Cart.user_id == user_id, Cart.product_id.in_(product_ids))
+        )
+        sold_out = out_of_stock_product_ids(product_ids)
+        # Post-order side effects run on a worker, committed atomically with the order
+        enqueue("order.placed", order_id=order.id)
         db.session.commit()
+    except ConflictError:
+        raise
     except Exception as e:
         db.session.rollback()
         raise ServiceError(f"Database commit failed: {e}")
 
-    return {"order_id": order.id, "total_amount": total_amount, "status": order.status}
+    # Only a sell-out changes what catalog reads filter and count on (in_stock,
+    # facets); bumping on every order would drop the whole catalog cache and
+    # every ETag under checkout load. Exact stock figures may therefore lag:
+    # a cached payload lives up to CACHE_TTL_SECONDS, and a client revalidating
+    # its ETag gets 304 until the catalog_fingerprint time window (same length)
+    # rolls over, so up to twice CACHE_TTL_SECONDS in all.
+    if sold_out:
+        product_cache.bump()
+
+    return {"order_id": order.id, "total_amount": total_amount, "status": OrderStatus.PENDING.value}
+
+@register_job("order.placed")
+def order_placed(order_id):
+    """Background follow-up for a new order (confirmation notice, analytics hooks)."""
+    order = db.session.get(Order, order_id)
+    if order is None:
+        return
+    current_app.logger.info(
+        "order placed: id=%s user_id=%s total=%s", order.id, order.user_id, order.total_amount
+    )
+
+
+def get_orders_by_user(user_id, limit, after=None, fields=None):
+    """
+    One page of a user's orders, newest first, plus pagination meta.
+
+    Keyset pagination on (created_at DESC, id DESC) served by
+    ix_orders_user_id_created_at_id. The cursor carries only the last order id;
+    its created_at is resolved in SQL by primary key, so the comparison uses the
+    exact stored value on every backend (no datetime round-trip through JSON).
+
+    Archived orders (orders_archive, same ids) are read with the same keyset
+    from their own (user_id, created_at, id) index and merged in, so history
+    is unchanged by archival.
+    """
+    cursor_created_at = None
+    if after is not None:
+        last_id = after[0]
+        if len(after) != 1 or not isinstance(last_id, int) or isinstance(last_id, bool):
+            raise ValidationError("Invalid cursor")
+        cursor_created_at = func.coalesce(
+            select(Order.created_at).where(Order.id == last_id).scalar_subquery(),
+            select(ArchivedOrder.created_at).where(ArchivedOrder.id == last_id).scalar_subquery(),
+        )
+
+    fields = fields or SUMMARY_FIELDS
+    # The merge needs created_at even when the client did not ask for it
+    load_fields = tuple(dict.fromkeys((*fields, "created_at")))
+    rows = []
+    for model in (Order, ArchivedOrder):
+        query = model.query.filter(model.user_id == user_id).options(*load_only_fields(model, load_fields))
+        if after is not None:
+            query = query.filter(keyset_filter((model.created_at, model.id), [cursor_created_at, after[0]], True))
+        rows += query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+
+    rows.sort(key=lambda o: (o.created_at, o.id), reverse=True)
+    has_more = len(rows) > limit
+    orders = rows[:limit]
+    meta = {
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": encode_cursor([orders[-1].id]) if has_more and orders else None,
+    }
+    # The compiled serializer keeps the same formats as every other endpoint
+    # (ISO 8601 datetimes, Decimal strings, enum values)
+    return [format_model(o, fields=fields) for o in orders], meta
+
 
-def get_orders_by_user(user_id):
-    orders = Order.query.filter_by(user_id=user_id).all()
-    return [{"id": o.id, "total_amount": o.total_amount, "status": o.status} for o in orders]
+def get_order_detail(order_id):
+    """
+    One order with its items and their products in a fixed 3 queries
+    (order, items, products) via selectinload, regardless of item count.
+    Falls through to the archive tables for archived orders.
+    """
+    for model, items, item_model in (
+        (Order, Order.order_items, OrderItem),
+        (ArchivedOrder, ArchivedOrder.order_items, ArchivedOrderItem),
+    ):
+        order = (
+            model.query.options(selectinload(items).selectinload(item_model.product))
+            .filter(model.id == order_id)
+            .first()
+        )
+        if order:
+            return order.to_dict(include_items=True)
+    return None
@@ -1,7 +1,10 @@
+from flask import current_app
+
 from app.errors import ServiceError
 from app.extensions import db
 from app.models.payment import Payment
-from app.models.order import Order
+from app.models.order import Order, OrderStatus
+from app.services.job_services import enqueue, register_job
 
 # For simplicity, mock Razorpay integration
 def create_payment(data):
@@ -13,7 +16,9 @@ def create_payment(data):
         order_id=order_id,
         amount=amount,
         mode=mode,
-        status="pending"
+        status="pending",
+        # Lets webhook events for the Razorpay order find this payment
+        gateway_order_id=data.get("razorpay_order_id")
     )
 
     db.session.add(payment)
@@ -41,10 +46,13 @@ def verify_payment(data):
     # Mark payment as paid
     payment.status = "paid"
 
-    # ALSO update the order status
-    order = Order.query.get(payment.order_id)
+    # ALSO update the order status (row-locked so concurrent verifies count the sale once)
+    order = db.session.get(Order, payment.order_id, with_for_update=True)
     if order:
-        order.status = "paid"
+        order.update_status(OrderStatus.PAID)
+
+    # Receipts and other follow-up work run on a worker, committed with the status change
+    enqueue("payment.verified", payment_id=payment.id)
 
     try:
         db.session.commit()
@@ -53,3 +61,14 @@ def verify_payment(data):
         raise ServiceError(f"Database commit failed: {e}")
 
     return True
+
+
+@register_job("payment.verified")
+def payment_verified(payment_id):
+    """Background follow-up for a verified payment (receipt notice, analytics hooks)."""
+    payment = db.session.get(Payment, payment_id)
+    if payment is None:
+        return
+    current_app.logger.info(
+        "payment verified: id=%s order_id=%s amount=%s", payment.id, payment.order_id, payment.amount
+    )
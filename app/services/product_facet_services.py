@@ -0,0 +1,228 @@
+from bisect import bisect_right
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from sqlalchemy import case, delete, func, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from app.errors import ValidationError
+from app.extensions import db
+from app.models.product import Product
+from app.models.product_facet import ProductFacetCount
+
+# Lower edges of the price facet buckets; the last bucket is open-ended.
+PRICE_BUCKET_EDGES = (0, 100, 500, 1000, 5000)
+
+CATEGORY_FACET = "category_id"
+PRICE_FACET = "price"
+_NO_CATEGORY = "none"
+
+# Product.price is Numeric(10, 2); Python-side bucketing uses the same stored value
+_CENTS = Decimal("0.01")
+
+_TRUE_VALUES = ("1", "true", "yes")
+_FALSE_VALUES = ("0", "false", "no")
+
+
+# -----------------------------
+# FILTERS
+# -----------------------------
+def parse_product_filters(args):
+    """Read category_id / min_price / max_price / in_stock from request args."""
+    filters = {}
+
+    category_id = args.get("category_id")
+    if category_id not in (None, ""):
+        try:
+            filters["category_id"] = int(category_id)
+        except ValueError:
+            raise ValidationError("category_id must be an integer", details={"category_id": category_id})
+
+    for name in ("min_price", "max_price"):
+        raw = args.get(name)
+        if raw in (None, ""):
+            continue
+        # Rejects NaN / Infinity too (sNaN would also break hashing the cache key)
+        filters[name] = to_price(raw, name)
+
+    in_stock = args.get("in_stock")
+    if in_stock not in (None, ""):
+        if in_stock.lower() in _TRUE_VALUES:
+            filters["in_stock"] = True
+        elif in_stock.lower() in _FALSE_VALUES:
+            filters["in_stock"] = False
+        else:
+            raise ValidationError("in_stock must be true or false", details={"in_stock": in_stock})
+
+    return filters
+
+
+def apply_product_filters(query, filters, exclude=None):
+    """Add WHERE clauses for the given filters; `exclude` skips one facet's own filter."""
+    if "category_id" in filters and exclude != CATEGORY_FACET:
+        query = query.filter(Product.category_id == filters["category_id"])
+    if exclude != PRICE_FACET:
+        if "min_price" in filters:
+            query = query.filter(Product.price >= filters["min_price"])
+        if "max_price" in filters:
+            query = query.filter(Product.price <= filters["max_price"])
+    if "in_stock" in filters:
+        query = query.filter(Product.stock > 0 if filters["in_stock"] else Product.stock <= 0)
+    return query
+
+
+# -----------------------------
+# BUCKETS
+# -----------------------------
+def price_bucket_expression():
+    """SQL CASE mapping Product.price to its bucket index (mirrors price_bucket_index)."""
+    whens = [(Product.price < edge, i) for i, edge in enumerate(PRICE_BUCKET_EDGES[1:])]
+    return case(*whens, else_=len(PRICE_BUCKET_EDGES) - 1)
+
+
+def to_price(value, name="price"):
+    """Decimal price rounded to cents as the column stores it; ValidationError if not a finite number."""
+    if isinstance(value, bool):
+        raise ValidationError(f"{name} must be a number", details={name: value})
+    try:
+        price = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValidationError(f"{name} must be a number", details={name: value})
+    if not price.is_finite():
+        raise ValidationError(f"{name} must be a number", details={name: str(value)})
+    return price.quantize(_CENTS, rounding=ROUND_HALF_UP)
+
+
+def price_bucket_index(price):
+    return max(bisect_right(PRICE_BUCKET_EDGES, to_price(price)) - 1, 0)
+
+
+def price_bucket_label(index):
+    low = PRICE_BUCKET_EDGES[index]
+    if index + 1 < len(PRICE_BUCKET_EDGES):
+        return f"{low}-{PRICE_BUCKET_EDGES[index + 1]}"
+    return f"{low}+"
+
+
+def _price_bucket(index, count):
+    high = PRICE_BUCKET_EDGES[index + 1] if index + 1 < len(PRICE_BUCKET_EDGES) else None
+    return {"bucket": price_bucket_label(index), "min": PRICE_BUCKET_EDGES[index], "max": high, "count": count}
+
+
+def _category_value(category_id):
+    return _NO_CATEGORY if category_id is None else str(category_id)
+
+
+# -----------------------------
+# FACET COUNTS
+# -----------------------------
+def get_facet_counts(filters):
+    """
+    Category and price-bucket counts for the current filter set.
+
+    Unfiltered requests read the precomputed product_facet_counts rows.
+    Filtered requests run one GROUP BY per facet; each facet ignores its own
+    filter so clients can show the alternatives.
+    """
+    if not filters:
+        return _precomputed_facets()
+
+    by_category = (
+        apply_product_filters(db.session.query(Product.category_id, func.count()), filters, exclude=CATEGORY_FACET)
+        .group_by(Product.category_id)
+        .all()
+    )
+    bucket = price_bucket_expression()
+    by_price = (
+        apply_product_filters(db.session.query(bucket, func.count()), filters, exclude=PRICE_FACET)
+        .group_by(bucket)
+        .all()
+    )
+    return {
+        CATEGORY_FACET: [{"value": value, "count": count} for value, count in sorted(by_category, key=_none_last)],
+        PRICE_FACET: [_price_bucket(int(index), count) for index, count in sorted(by_price)],
+    }
+
+
+def _none_last(row):
+    return (row[0] is None, row[0] or 0)
+
+
+def _precomputed_facets():
+    rows = ProductFacetCount.query.filter(ProductFacetCount.count > 0).all()
+    categories = []
+    prices = []
+    labels = {price_bucket_label(i): i for i in range(len(PRICE_BUCKET_EDGES))}
+    for row in rows:
+        if row.facet == CATEGORY_FACET:
+            value = None if row.value == _NO_CATEGORY else int(row.value)
+            categories.append((value, row.count))
+        elif row.facet == PRICE_FACET and row.value in labels:
+            prices.append((labels[row.value], row.count))
+    return {
+        CATEGORY_FACET: [{"value": value, "count": count} for value, count in sorted(categories, key=_none_last)],
+        PRICE_FACET: [_price_bucket(index, count) for index, count in sorted(prices)],
+    }
+
+
+def adjust_facet_counts(old=None, new=None):
+    """
+    Incrementally move one product between facet values.
+
+    old/new are (category_id, price) tuples or None (create/delete). Runs in the
+    caller's transaction so counts commit (or roll back) with the product write.
+    """
+    adjust_facet_counts_bulk([(old, new)])
+
+
+def adjust_facet_counts_bulk(moves):
+    """
+    adjust_facet_counts for many products at once: `moves` is an iterable of
+    (old, new) pairs; deltas are netted first so each facet row is written once.
+    """
+    deltas = {}
+    for old, new in moves:
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            category_id, price = state
+            key = (CATEGORY_FACET, _category_value(category_id))
+            deltas[key] = deltas.get(key, 0) + sign
+            if price is not None:
+                key = (PRICE_FACET, price_bucket_label(price_bucket_index(price)))
+                deltas[key] = deltas.get(key, 0) + sign
+
+    for (facet, value), delta in deltas.items():
+        if delta:
+            _add_to_count(facet, value, delta)
+
+
+def _add_to_count(facet, value, delta):
+    table = ProductFacetCount.__table__
+    stmt = (
+        update(table)
+        .where(table.c.facet == facet, table.c.value == value)
+        .values(count=table.c.count + delta)
+    )
+    if db.session.execute(stmt).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(table).values(facet=facet, value=value, count=delta))
+    except IntegrityError:
+        # Another transaction created the row first
+        db.session.execute(stmt)
+
+
+def rebuild_facet_counts():
+    """Recompute all precomputed facet rows from products (caller commits)."""
+    table = ProductFacetCount.__table__
+    bucket = price_bucket_expression()
+    by_category = db.session.query(Product.category_id, func.count()).group_by(Product.category_id).all()
+    by_price = db.session.query(bucket, func.count()).group_by(bucket).all()
+
+    rows = [{"facet": CATEGORY_FACET, "value": _category_value(value), "count": count} for value, count in by_category]
+    rows += [{"facet": PRICE_FACET, "value": price_bucket_label(int(index)), "count": count} for index, count in by_price]
+
+    db.session.execute(delete(table))
+    if rows:
+        db.session.execute(insert(table), rows)
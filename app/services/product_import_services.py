@@ -0,0 +1,235 @@
+"""
+Streaming bulk product import (CSV or NDJSON).
+
+Design:
+- Rows are parsed lazily from the input stream, so memory stays constant
+  regardless of file size; only one batch of validated rows is held at a time.
+- Each row is validated with ProductSchema. Invalid rows are reported
+  (row number + messages) and skipped; valid rows are written in batches.
+- A row with an `id` that already exists updates that product; every other
+  row is inserted (keeping an explicit id). Each batch costs one id lookup,
+  one executemany INSERT and one executemany UPDATE, then commits.
+- Facet counts are adjusted by each batch's net deltas in the same
+  transaction, so they stay correct while a long import is still running.
+  On PostgreSQL, a batch that inserted explicit ids moves the products id
+  sequence past them so later create_product calls do not collide.
+- Category names (`category` column) resolve through a single lookup table
+  loaded once before the import starts.
+
+Used by POST /api/v1/admin/products/import and `flask import-products`.
+"""
+
+import csv
+import io
+import json
+import time
+
+from marshmallow import EXCLUDE
+from marshmallow import ValidationError as SchemaValidationError
+from sqlalchemy import bindparam, insert, text, update
+
+from app.errors import ValidationError
+from app.extensions import db
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product_schema import ProductSchema
+from app.services.product_facet_services import adjust_facet_counts_bulk
+from app.services.product_services import product_cache
+
+DEFAULT_BATCH_SIZE = 1000
+# Only the first N row errors are returned; the rest are counted
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = ("csv", "ndjson")
+
+_schema = ProductSchema(unknown=EXCLUDE)
+
+
+# -----------------------------
+# PARSERS (lazy, constant memory)
+# -----------------------------
+def iter_csv_rows(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for row in csv.DictReader(text):
+        # Empty CSV cells mean "not provided"
+        yield {k: v for k, v in row.items() if k and v not in (None, "")}
+
+
+def iter_ndjson_rows(stream):
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield _ParseError(str(e))
+
+
+class _ParseError:
+    def __init__(self, message):
+        self.message = message
+
+
+def iter_rows(stream, fmt):
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    if fmt == "ndjson":
+        return iter_ndjson_rows(stream)
+    raise ValidationError(f"Unsupported import format: {fmt}", details={"formats": list(FORMATS)})
+
+
+# -----------------------------
+# IMPORT
+# -----------------------------
+def import_products(rows, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Validate and upsert products from an iterable of dict rows.
+
+    Returns stats: processed, inserted, updated, failed, errors (first
+    MAX_REPORTED_ERRORS), elapsed_seconds, rows_per_second.
+    """
+    started = time.perf_counter()
+    categories = {name.lower(): cid for cid, name in db.session.query(Category.id, Category.name)}
+    stats = {"processed": 0, "inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    batch = []
+
+    for line_no, raw in enumerate(rows, start=1):
+        stats["processed"] += 1
+        row, errors = _validate(raw, categories)
+        if errors:
+            _record_error(stats, line_no, errors)
+            continue
+        batch.append((line_no, row))
+        if len(batch) >= batch_size:
+            _write_batch(batch, stats)
+            batch = []
+
+    if batch:
+        _write_batch(batch, stats)
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["rows_per_second"] = round(stats["processed"] / elapsed, 1) if elapsed > 0 else None
+    return stats
+
+
+def _validate(raw, categories):
+    if isinstance(raw, _ParseError):
+        return None, {"_row": [f"Invalid JSON: {raw.message}"]}
+    if not isinstance(raw, dict):
+        return None, {"_row": ["Row must be an object"]}
+
+    raw = dict(raw)
+    product_id = raw.pop("id", None)
+    try:
+        row = _schema.load(raw)
+    except SchemaValidationError as e:
+        return None, e.messages
+
+    if product_id is not None:
+        try:
+            row["id"] = int(product_id)
+        except (TypeError, ValueError):
+            return None, {"id": ["Not a valid integer."]}
+
+    category_name = row.pop("category", None)
+    if category_name:
+        category_id = categories.get(category_name.strip().lower())
+        if category_id is None:
+            return None, {"category": [f"Unknown category: {category_name}"]}
+        row["category_id"] = category_id
+
+    return row, None
+
+
+def _record_error(stats, line_no, errors):
+    stats["failed"] += 1
+    if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+        stats["errors"].append({"row": line_no, "errors": errors})
+
+
+def _write_batch(batch, stats):
+    table = Product.__table__
+    ids = [row["id"] for _, row in batch if "id" in row]
+    # id -> (category_id, price) before this batch, for the facet deltas
+    existing = {}
+    if ids:
+        existing = {
+            pid: (category_id, price)
+            for pid, category_id, price in db.session.query(Product.id, Product.category_id, Product.price)
+            .filter(Product.id.in_(ids))
+        }
+
+    inserts, updates, moves = [], [], []
+    for _, row in batch:
+        old = existing.get(row.get("id"))
+        if old is not None:
+            updates.append(row)
+            # A repeated id in one batch moves from the state its previous row left
+            new = (row.get("category_id", old[0]), row.get("price", old[1]))
+            existing[row["id"]] = new
+            moves.append((old, new))
+        else:
+            inserts.append(_with_defaults(row))
+            moves.append((None, (row.get("category_id"), row["price"])))
+            if "id" in row:
+                existing[row["id"]] = moves[-1][1]
+
+    try:
+        for group in _group_by_keys(inserts):
+            db.session.execute(insert(table), group)
+        for group in _group_by_keys(updates):
+            # executemany UPDATE ... WHERE id = :b_id, one statement per column set
+            columns = [k for k in group[0] if k != "id"]
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values({c: bindparam(c) for c in columns})
+            )
+            db.session.execute(stmt, [{"b_id": r["id"], **{c: r[c] for c in columns}} for r in group])
+        if any("id" in row for row in inserts):
+            _advance_id_sequence()
+        adjust_facet_counts_bulk(moves)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        for line_no, _ in batch:
+            _record_error(stats, line_no, {"_batch": [f"Database write failed: {e.__class__.__name__}"]})
+        return
+
+    stats["inserted"] += len(inserts)
+    stats["updated"] += len(updates)
+    product_cache.bump()
+
+
+def _advance_id_sequence():
+    # Explicit ids bypass the PostgreSQL sequence; move it past max(id) (never backwards).
+    # SQLite and MySQL already continue after the largest id.
+    if db.session.get_bind().dialect.name != "postgresql":
+        return
+    table = Product.__table__.name
+    db.session.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"GREATEST((SELECT MAX(id) FROM {table}), nextval(pg_get_serial_sequence('{table}', 'id')) - 1))"
+    ))
+
+
+def _with_defaults(row):
+    # executemany needs the same keys in every parameter set
+    return {
+        "name": row["name"],
+        "description": row.get("description"),
+        "price": row["price"],
+        "stock": row["stock"],
+        "category_id": row.get("category_id"),
+        **({"id": row["id"]} if "id" in row else {}),
+    }
+
+
+def _group_by_keys(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return list(groups.values())
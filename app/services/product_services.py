@@ -1,38 +1,214 @@
+import time
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import Float, Integer, Numeric, case, cast, func, or_, select, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+
+from app.database.search_index import SEARCH_CONFIG, SQLITE_FTS_TABLE, has_sqlite_fts
+from app.errors import ValidationError
 from app.extensions import db
 from app.models.product import Product
+from app.services.inventory_services import set_sharded_stock
+from app.services.product_facet_services import adjust_facet_counts, apply_product_filters, get_facet_counts, to_price
+from app.utils.cache import VersionedCache
+from app.utils.fieldsets import load_only_fields
+from app.utils.pagination import paginate
 from app.utils.response import format_model
 
+# Read-through cache for catalog reads; every product write bumps its version
+product_cache = VersionedCache("products")
+
+
+def catalog_fingerprint():
+    """
+    ETag fingerprint (conditional_get) for catalog reads: the cache version plus
+    a CACHE_TTL_SECONDS time window. Checkouts that do not sell a product out
+    leave the version alone, so the window is what makes clients holding an
+    ETag refetch stock figures at least once per TTL.
+    """
+    ttl = float(current_app.config.get("CACHE_TTL_SECONDS", 60)) or 60
+    return product_cache.version(), int(time.time() // ttl)
+
 
 # -----------------------------
-# GET ALL PRODUCTS
+# GET PRODUCTS (KEYSET PAGINATED, FILTERED)
 # -----------------------------
-def get_products():
-    products = Product.query.all()
-    return [format_model(p) for p in products]
+def get_products(limit, after=None, filters=None, fields=None):
+    """
+    Return one page of products ordered by id plus pagination meta.
+
+    `after` is the decoded cursor (last id of the previous page); page N costs
+    the same as page 1 because it is a primary-key range scan.
+    `filters` comes from parse_product_filters(). The first page (no cursor)
+    also carries category / price-bucket facet counts in meta["facets"].
+    `fields` (from parse_fields) limits both the SELECT and the output.
+    """
+    filters = filters or {}
+    key = ("list", limit, tuple(after) if after else None, tuple(sorted(filters.items())), fields)
+    return product_cache.get_or_load(key, lambda: _load_products(limit, after, filters, fields))
+
+
+def _load_products(limit, after, filters, fields):
+    query = apply_product_filters(Product.query.options(*load_only_fields(Product, fields)), filters)
+    products, meta = paginate(query, (Product.id,), limit, after)
+    if after is None:
+        meta["facets"] = get_facet_counts(filters)
+    return format_model(products, many=True, fields=fields), meta
 
 
 # -----------------------------
 # GET PRODUCT BY ID
 # -----------------------------
-def get_product_by_id(product_id):
-    product = Product.query.get(product_id)
-    return format_model(product) if product else None
+def get_product_by_id(product_id, fields=None):
+    return product_cache.get_or_load(("detail", product_id, fields), lambda: _load_product(product_id, fields))
+
+
+def _load_product(product_id, fields):
+    product = Product.query.options(*load_only_fields(Product, fields)).filter(Product.id == product_id).first()
+    return format_model(product, fields=fields) if product else None
+
+
+# -----------------------------
+# FULL-TEXT SEARCH
+# -----------------------------
+MAX_SEARCH_QUERY_LENGTH = 200
+# Scores are compared at fixed precision so the cursor value survives the JSON
+# round trip (e.g. Postgres ts_rank is float4 and never equals its float8 echo)
+SCORE_DECIMALS = 6
+
+# engine url -> whether the SQLite FTS5 table exists (checked once per process)
+_sqlite_fts_available = {}
+
+
+def search_products(q, limit, after=None, fields=None):
+    """
+    Rank products by relevance to `q` and return one page plus pagination meta.
+
+    Matching, ranking and keyset pagination on (score DESC, id DESC) all run in
+    the database against the dialect's full-text index (see
+    app.database.search_index). Each result carries its `score`.
+    """
+    q = (q or "").strip()
+    if not q:
+        raise ValidationError("Search query 'q' is required")
+    if len(q) > MAX_SEARCH_QUERY_LENGTH:
+        raise ValidationError(f"Search query must be at most {MAX_SEARCH_QUERY_LENGTH} characters")
+
+    key = ("search", q.lower(), limit, tuple(after) if after else None, fields)
+    return product_cache.get_or_load(key, lambda: _load_search(q, limit, after, fields))
+
+
+def _load_search(q, limit, after, fields):
+    ranked = _ranked_matches(q)
+    score = func.round(cast(ranked.c.score, Numeric(20, SCORE_DECIMALS)), SCORE_DECIMALS).label("score")
+    query = (
+        db.session.query(Product, score)
+        .join(ranked, ranked.c.id == Product.id)
+        .options(*load_only_fields(Product, fields))
+    )
+    if after is not None:
+        if len(after) != 2 or not _is_number(after[0]):
+            raise ValidationError("Invalid cursor")
+        # Compare as the exact decimal the previous page showed
+        after = [Decimal(repr(float(after[0]))), after[1]]
+    rows, meta = paginate(
+        query,
+        (score, ranked.c.id),
+        limit,
+        after,
+        descending=True,
+        key=lambda row: [float(row.score), row.Product.id],
+    )
+    results = []
+    for product, score in rows:
+        data = format_model(product, fields=fields)
+        data["score"] = float(score) if score is not None else None
+        results.append(data)
+    return results, meta
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _ranked_matches(q):
+    """Subquery of (id, score) for products matching q; higher score = more relevant."""
+    engine = db.engine
+    dialect = engine.dialect.name
+
+    if dialect == "postgresql":
+        document = func.to_tsvector(
+            SEARCH_CONFIG,
+            func.coalesce(Product.name, "") + " " + func.coalesce(Product.description, ""),
+        )
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        return (
+            select(Product.id.label("id"), func.ts_rank(document, ts_query).label("score"))
+            .where(document.op("@@")(ts_query))
+            .subquery("ranked")
+        )
+
+    if dialect == "mysql":
+        score = mysql_match(Product.name, Product.description, against=q).in_natural_language_mode()
+        return select(Product.id.label("id"), score.label("score")).where(score > 0).subquery("ranked")
+
+    if dialect == "sqlite":
+        url = str(engine.url)
+        if url not in _sqlite_fts_available:
+            _sqlite_fts_available[url] = has_sqlite_fts(engine)
+        if _sqlite_fts_available[url]:
+            # bm25() is lower-is-better, so negate it to share the DESC ordering
+            return (
+                text(
+                    f"SELECT rowid AS id, -bm25({SQLITE_FTS_TABLE}) AS score "
+                    f"FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH :match"
+                )
+                .bindparams(match=_fts5_match_expression(q))
+                .columns(id=Integer, score=Float)
+                .subquery("ranked")
+            )
+
+    # Fallback without a full-text index: substring match, name hits ranked first
+    # Escape LIKE wildcards so "%" or "_" in the query match literally
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    name_hit = Product.name.ilike(pattern, escape="\\")
+    score = case((name_hit, 2), else_=1)
+    return (
+        select(Product.id.label("id"), score.label("score"))
+        .where(or_(name_hit, Product.description.ilike(pattern, escape="\\")))
+        .subquery("ranked")
+    )
+
+
+def _fts5_match_expression(q):
+    """Quote each term so user input can't inject FTS5 syntax; last term matches as a prefix."""
+    terms = ['"' + term.replace('"', '""') + '"' for term in q.split()]
+    terms[-1] += "*"
+    return " ".join(terms)
 
 
 # -----------------------------
 # CREATE PRODUCT
 # -----------------------------
 def create_product(data):
+    price = data.get("price")
+    if price is not None:
+        price = to_price(price)
     try:
         product = Product(
             name=data.get("name"),
             description=data.get("description"),
-            price=data.get("price"),
+            price=price,
             stock=data.get("stock", 0),
             category_id=data.get("category_id")
         )
         db.session.add(product)
+        db.session.flush()
+        adjust_facet_counts(new=(product.category_id, product.price))
         db.session.commit()
+        product_cache.bump()
         return format_model(product)
 
     except Exception as e:
@@ -47,8 +223,11 @@ def update_product(product_id, data):
     product = Product.query.get(product_id)
     if not product:
         return None
+    if data.get("price") is not None:
+        data = {**data, "price": to_price(data["price"])}
 
     try:
+        old_facets = (product.category_id, product.price)
         if "name" in data:
             product.name = data["name"]
         if "description" in data:
@@ -57,10 +236,16 @@ def update_product(product_id, data):
             product.price = data["price"]
         if "stock" in data:
             product.stock = data["stock"]
+            # Hot products keep their live stock in shard rows; spread the new total over them
+            set_sharded_stock(product.id, data["stock"])
         if "category_id" in data:
             product.category_id = data["category_id"]
 
+        new_facets = (product.category_id, product.price)
+        if new_facets != old_facets:
+            adjust_facet_counts(old=old_facets, new=new_facets)
         db.session.commit()
+        product_cache.bump()
         return format_model(product)
 
     except Exception as e:
@@ -77,8 +262,10 @@ def delete_product(product_id):
         return False
 
     try:
+        adjust_facet_counts(old=(product.category_id, product.price))
         db.session.delete(product)
         db.session.commit()
+        product_cache.bump()
         return True
 
     except Exception as e:
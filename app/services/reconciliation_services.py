@@ -0,0 +1,170 @@
+"""
+Payment reconciliation against the gateway.
+
+reconcile_payments() walks Razorpay payments that are still pending (or only
+authorized) and whose order is older than RECONCILE_MIN_AGE_SECONDS, in
+keyset chunks of RECONCILE_BATCH_SIZE on payments.id
+(ix_payments_status_id). For each chunk:
+
+1. The gateway is asked for every payment concurrently on a bounded thread
+   pool (RECONCILE_CONCURRENCY workers; DB access stays on the calling
+   thread). Payments are looked up by Razorpay payment id, or by Razorpay
+   order id when only that is known.
+2. Results are grouped by resulting status and applied with one UPDATE per
+   status, limited to rows still behind it (statuses only move forward, as
+   with webhooks, so a concurrent webhook or verify is never undone).
+   Orders follow exactly as they do for webhooks
+   (webhook_services.apply_order_statuses): paid moves pending orders to
+   paid, refunded moves sold orders to refunded, each through
+   Order.update_status so sales rollups follow; "payment.verified" is
+   enqueued for each newly paid payment.
+3. The chunk commits, keeping transactions short.
+
+No new chunk is started once `time_budget` seconds have passed, or once the
+gateway circuit breaker has opened (stats["stopped"]). Returns
+stats including payments checked per second.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import or_, select, update
+
+from app.extensions import db
+from app.models.order import Order
+from app.models.payment import Payment
+from app.services.job_services import enqueue
+from app.services.webhook_services import PAYMENT_STATUS_RANK, apply_order_statuses
+from app.utils import razorpay_utils
+from app.utils.circuit_breaker import OPEN
+from app.utils.gateway_health import gateway_breaker
+
+RECONCILABLE_STATUSES = ("pending", "authorized")
+# Razorpay payment status -> ours
+GATEWAY_PAYMENT_STATUS = {
+    "created": "pending",
+    "authorized": "authorized",
+    "captured": "paid",
+    "failed": "failed",
+    "refunded": "refunded",
+}
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MIN_AGE_SECONDS = 900
+
+_payments = Payment.__table__
+
+
+def _config(name, default):
+    return current_app.config.get(name, default)
+
+
+def reconcile_payments(batch_size=None, concurrency=None, min_age_seconds=None, time_budget=None):
+    """Reconcile stale payments with the gateway (commits per chunk). Returns stats."""
+    batch_size = batch_size or _config("RECONCILE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    concurrency = concurrency or _config("RECONCILE_CONCURRENCY", DEFAULT_CONCURRENCY)
+    if min_age_seconds is None:
+        min_age_seconds = _config("RECONCILE_MIN_AGE_SECONDS", DEFAULT_MIN_AGE_SECONDS)
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=min_age_seconds)
+    app = current_app._get_current_object()
+
+    stats = {"batches": 0, "checked": 0, "unchanged": 0, "errors": 0, "orders_updated": 0, "updated": {},
+             "stopped": None}
+    started = time.perf_counter()
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="reconcile") as pool:
+        while time_budget is None or time.perf_counter() - started < time_budget:
+            rows = db.session.execute(
+                select(Payment.id, Payment.status, Payment.order_id,
+                       Payment.gateway_payment_id, Payment.gateway_order_id)
+                .join(Order, Order.id == Payment.order_id)
+                .where(
+                    Payment.id > last_id,
+                    Payment.status.in_(RECONCILABLE_STATUSES),
+                    Payment.mode == "razorpay",
+                    or_(Payment.gateway_payment_id.isnot(None), Payment.gateway_order_id.isnot(None)),
+                    Order.created_at < cutoff,
+                )
+                .order_by(Payment.id)
+                .limit(batch_size)
+            ).all()
+            # End the read transaction before the (slow) gateway round trips
+            db.session.commit()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            results = list(pool.map(lambda row: _gateway_status(app, row), rows))
+            _apply_chunk(rows, results, stats)
+            stats["batches"] += 1
+            stats["checked"] += len(rows)
+            if gateway_breaker.state == OPEN:
+                # Every further lookup would fail fast; leave the rest for the next run
+                stats["stopped"] = "gateway_unavailable"
+                break
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["payments_per_second"] = round(stats["checked"] / elapsed, 1) if elapsed > 0 else 0.0
+    return stats
+
+
+def _gateway_status(app, row):
+    """Our status for one payment according to the gateway, or an Exception (runs on a pool thread)."""
+    with app.app_context():
+        try:
+            if row.gateway_payment_id:
+                entity = razorpay_utils.fetch_payment(row.gateway_payment_id)
+                return GATEWAY_PAYMENT_STATUS.get(entity.get("status"))
+            items = razorpay_utils.fetch_order_payments(row.gateway_order_id).get("items") or []
+            statuses = [GATEWAY_PAYMENT_STATUS.get(item.get("status")) for item in items]
+            # Several attempts per order: the one that got furthest wins
+            return max(filter(None, statuses), key=PAYMENT_STATUS_RANK.get, default=None)
+        except Exception as exc:
+            return exc
+
+
+def _apply_chunk(rows, results, stats):
+    by_status = {}
+    for row, result in zip(rows, results):
+        if isinstance(result, Exception):
+            stats["errors"] += 1
+            current_app.logger.warning("reconcile payment %s failed: %s", row.id, result)
+        elif result and PAYMENT_STATUS_RANK.get(result, 0) > PAYMENT_STATUS_RANK.get(row.status, 0):
+            by_status.setdefault(result, []).append(row)
+        else:
+            stats["unchanged"] += 1
+    if not by_status:
+        return
+
+    try:
+        paid_payment_ids = []
+        order_statuses = []
+        # Lowest rank first, so an order's furthest payment status is applied last
+        for status, group in sorted(by_status.items(), key=lambda item: PAYMENT_STATUS_RANK[item[0]]):
+            rank = PAYMENT_STATUS_RANK[status]
+            behind = [s for s, r in PAYMENT_STATUS_RANK.items() if r < rank]
+            # Lock the rows still behind: a webhook may have moved some on since we read them
+            ids = db.session.execute(
+                select(_payments.c.id)
+                .where(_payments.c.id.in_([row.id for row in group]), _payments.c.status.in_(behind))
+                .with_for_update()
+            ).scalars().all()
+            if not ids:
+                continue
+            db.session.execute(update(_payments).where(_payments.c.id.in_(ids)).values(status=status))
+            stats["updated"][status] = stats["updated"].get(status, 0) + len(ids)
+            updated = set(ids)
+            order_statuses += [(row.order_id, status) for row in group if row.id in updated]
+            if status == "paid":
+                paid_payment_ids += ids
+
+        stats["orders_updated"] += apply_order_statuses(order_statuses)
+        for payment_id in paid_payment_ids:
+            enqueue("payment.verified", payment_id=payment_id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
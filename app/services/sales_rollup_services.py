@@ -0,0 +1,253 @@
+"""
+Incrementally maintained sales rollups (see app.models.sales_rollup).
+
+- record_order_transition(): called from Order.update_status. When an order
+  enters a "sold" status (paid/shipped/completed) from an unsold one, its
+  revenue / order count / units are added to the hourly and daily buckets for
+  the total, each product and each category; leaving the sold set (refunded,
+  cancelled) subtracts them again. Runs in the caller's transaction.
+  Categories come from OrderItem.category_id (snapshotted at checkout), so a
+  refund reverses exactly what the sale added even after the product moved
+  category or was deleted, and matches rebuild_sales_rollups().
+- rebuild_sales_rollups(): recompute everything from orders (backfill).
+- get_sales_series() / get_top(): admin stats, reading rollup rows only.
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.errors import ValidationError
+from app.extensions import db
+from app.models.archive import ArchivedOrder, ArchivedOrderItem
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.sales_rollup import SalesDaily, SalesHourly
+
+SOLD_STATUSES = frozenset({OrderStatus.PAID, OrderStatus.SHIPPED, OrderStatus.COMPLETED})
+
+TOTAL = "total"
+PRODUCT = "product"
+CATEGORY = "category"
+DIMENSIONS = (PRODUCT, CATEGORY)
+
+GRANULARITIES = {"hour": SalesHourly, "day": SalesDaily}
+DEFAULT_RANGES = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+MAX_TOP_LIMIT = 100
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _utc(value):
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _buckets(created_at):
+    hour = _utc(created_at).replace(minute=0, second=0, microsecond=0)
+    return {SalesHourly: hour, SalesDaily: hour.replace(hour=0)}
+
+
+# -----------------------------
+# INCREMENTAL MAINTENANCE
+# -----------------------------
+def record_order_transition(order, old_status, new_status):
+    """Apply an order's sales to the rollups when it enters/leaves the sold statuses."""
+    was_sold = old_status in SOLD_STATUSES
+    is_sold = new_status in SOLD_STATUSES
+    if was_sold == is_sold:
+        return
+    sign = 1 if is_sold else -1
+
+    lines = db.session.execute(
+        select(
+            OrderItem.product_id,
+            OrderItem.category_id,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.quantity * OrderItem.price),
+        )
+        .where(OrderItem.order_id == order.id)
+        .group_by(OrderItem.product_id, OrderItem.category_id)
+    ).all()
+    created_at = order.created_at or datetime.now(timezone.utc)
+    for deltas in _order_deltas(order.total_amount, lines):
+        for model, bucket in _buckets(created_at).items():
+            _add_to_rollup(model, bucket, *deltas, sign=sign)
+
+
+def _order_deltas(total_amount, lines):
+    """(dimension, dimension_id, revenue, orders, units) rows for one order."""
+    units = sum(int(qty) for _, _, qty, _ in lines)
+    rows = {(TOTAL, 0): [Decimal(total_amount or 0), 1, units]}
+    for product_id, category_id, qty, revenue in lines:
+        keys = [(CATEGORY, category_id or 0)]
+        if product_id is not None:
+            keys.append((PRODUCT, product_id))
+        for key in keys:
+            entry = rows.setdefault(key, [Decimal("0"), 1, 0])
+            entry[0] += Decimal(revenue or 0)
+            entry[2] += int(qty)
+    return [(dimension, dim_id, revenue, orders, units) for (dimension, dim_id), (revenue, orders, units) in rows.items()]
+
+
+def _add_to_rollup(model, bucket, dimension, dimension_id, revenue, orders, units, sign=1):
+    table = model.__table__
+    key = (table.c.bucket_start == bucket, table.c.dimension == dimension, table.c.dimension_id == dimension_id)
+    stmt = (
+        update(table)
+        .where(*key)
+        .values(
+            revenue=table.c.revenue + sign * revenue,
+            order_count=table.c.order_count + sign * orders,
+            units=table.c.units + sign * units,
+        )
+    )
+    if db.session.execute(stmt).rowcount:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.execute(
+                insert(table).values(
+                    bucket_start=bucket,
+                    dimension=dimension,
+                    dimension_id=dimension_id,
+                    revenue=sign * revenue,
+                    order_count=sign * orders,
+                    units=sign * units,
+                )
+            )
+    except IntegrityError:
+        # Another transaction created the bucket row first
+        db.session.execute(stmt)
+
+
+# -----------------------------
+# BACKFILL
+# -----------------------------
+def rebuild_sales_rollups():
+    """
+    Recompute both rollup tables from orders in a sold status, hot and
+    archived (caller commits).
+
+    Orders and their lines are streamed with a server-side cursor and summed
+    in memory per (bucket, dimension); memory grows with the number of
+    buckets, not orders. Returns stats.
+    """
+    sold = [status for status in OrderStatus if status in SOLD_STATUSES]
+    totals = {SalesHourly: {}, SalesDaily: {}}
+
+    def add(model, bucket, dimension, dimension_id, revenue, orders, units):
+        entry = totals[model].setdefault((bucket, dimension, dimension_id), [Decimal("0"), 0, 0])
+        entry[0] += revenue
+        entry[1] += orders
+        entry[2] += units
+
+    orders = 0
+    # Archived orders still count: sales history must survive archival
+    for order_model, item_model in ((Order, OrderItem), (ArchivedOrder, ArchivedOrderItem)):
+        order_rows = db.session.execute(
+            select(order_model.id, order_model.created_at, order_model.total_amount)
+            .where(order_model.status.in_(sold))
+            .order_by(order_model.id)
+            .execution_options(stream_results=True, yield_per=BACKFILL_BATCH_SIZE)
+        )
+        for chunk in order_rows.partitions():
+            by_id = {row.id: row for row in chunk}
+            lines = {}
+            for order_id, product_id, category_id, qty, revenue in db.session.execute(
+                select(
+                    item_model.order_id,
+                    item_model.product_id,
+                    item_model.category_id,
+                    func.sum(item_model.quantity),
+                    func.sum(item_model.quantity * item_model.price),
+                )
+                .where(item_model.order_id.in_(list(by_id)))
+                .group_by(item_model.order_id, item_model.product_id, item_model.category_id)
+            ):
+                lines.setdefault(order_id, []).append((product_id, category_id, qty, revenue))
+
+            for order_id, order in by_id.items():
+                buckets = _buckets(order.created_at)
+                for deltas in _order_deltas(order.total_amount, lines.get(order_id, [])):
+                    for model, bucket in buckets.items():
+                        add(model, bucket, *deltas)
+            orders += len(by_id)
+
+    stats = {"orders": orders}
+    for model, rows in totals.items():
+        db.session.execute(delete(model.__table__))
+        payload = [
+            {"bucket_start": bucket, "dimension": dimension, "dimension_id": dim_id,
+             "revenue": revenue, "order_count": count, "units": units}
+            for (bucket, dimension, dim_id), (revenue, count, units) in rows.items()
+        ]
+        for start in range(0, len(payload), BACKFILL_BATCH_SIZE):
+            db.session.execute(insert(model.__table__), payload[start:start + BACKFILL_BATCH_SIZE])
+        stats[model.__tablename__] = len(payload)
+    return stats
+
+
+# -----------------------------
+# READS (rollups only)
+# -----------------------------
+def parse_stats_args(args):
+    """Read granularity / from / to (ISO 8601, UTC) from request args."""
+    granularity = (args.get("granularity") or "day").lower()
+    if granularity not in GRANULARITIES:
+        raise ValidationError("granularity must be hour or day", details={"granularity": granularity})
+
+    end = _parse_time(args.get("to"), "to") or datetime.now(timezone.utc)
+    start = _parse_time(args.get("from"), "from") or end - DEFAULT_RANGES[granularity]
+    if start > end:
+        raise ValidationError("from must not be after to")
+    return granularity, start, end
+
+
+def _parse_time(raw, name):
+    if raw in (None, ""):
+        return None
+    try:
+        return _utc(datetime.fromisoformat(raw))
+    except ValueError:
+        raise ValidationError(f"{name} must be an ISO 8601 date or datetime", details={name: raw})
+
+
+def get_sales_series(granularity, start, end):
+    """Revenue / orders / units per bucket in [start, end]."""
+    table = GRANULARITIES[granularity].__table__
+    rows = db.session.execute(
+        select(table.c.bucket_start, table.c.revenue, table.c.order_count, table.c.units)
+        .where(table.c.dimension == TOTAL, table.c.bucket_start >= start, table.c.bucket_start <= end)
+        .order_by(table.c.bucket_start)
+    ).all()
+    series = [
+        {"bucket": _utc(bucket).isoformat(), "revenue": str(revenue), "orders": count, "units": units}
+        for bucket, revenue, count, units in rows
+    ]
+    summary = {
+        "revenue": str(sum((Decimal(row.revenue) for row in rows), Decimal("0"))),
+        "orders": sum(row.order_count for row in rows),
+        "units": sum(row.units for row in rows),
+    }
+    return series, summary
+
+
+def get_top(dimension, granularity, start, end, limit=20):
+    """Top products or categories by revenue over [start, end]."""
+    if dimension not in DIMENSIONS:
+        raise ValidationError(f"Unknown stats dimension: {dimension}")
+    limit = max(1, min(int(limit), MAX_TOP_LIMIT))
+    table = GRANULARITIES[granularity].__table__
+    revenue = func.sum(table.c.revenue).label("revenue")
+    rows = db.session.execute(
+        select(table.c.dimension_id, revenue, func.sum(table.c.order_count), func.sum(table.c.units))
+        .where(table.c.dimension == dimension, table.c.bucket_start >= start, table.c.bucket_start <= end)
+        .group_by(table.c.dimension_id)
+        .order_by(revenue.desc(), table.c.dimension_id)
+        .limit(limit)
+    ).all()
+    id_key = f"{dimension}_id"
+    return [
+        {id_key: dim_id or None, "revenue": str(total), "orders": int(count), "units": int(units)}
+        for dim_id, total, count, units in rows
+    ]
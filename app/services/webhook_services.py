@@ -0,0 +1,286 @@
+"""
+Razorpay webhook ingestion.
+
+Two halves, so the gateway gets its 200 fast and the work is batched:
+
+- record_webhook(): called by POST /api/v1/payment/webhook. Checks the
+  X-Razorpay-Signature HMAC and appends the raw body to webhook_events in one
+  INSERT + commit. The unique (provider, event_id) constraint turns the
+  gateway's redeliveries into no-ops.
+- process_webhook_events(): run by `flask process-webhooks`. Takes up to
+  WEBHOOK_BATCH_SIZE received events (oldest first) and applies them in ONE
+  transaction: all referenced payments and orders are loaded with one query
+  each (row-locked), statuses are moved forward, "payment.verified" jobs are
+  enqueued and the events are marked processed/ignored. If the batch fails,
+  its events are retried one per transaction so a single bad event is marked
+  failed instead of blocking the rest.
+
+Payment statuses only move forward (pending -> authorized/failed -> paid ->
+refunded), so out-of-order or replayed events cannot undo a later state.
+Events are matched to payments by Razorpay payment id, then Razorpay order id,
+then notes.payment_id (our payment id).
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from flask import current_app
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.errors import ServiceError, UnauthorizedError, ValidationError
+from app.extensions import db
+from app.models.order import Order, OrderStatus
+from app.models.payment import Payment
+from app.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.services.job_services import enqueue
+from app.utils.signatures import verify_webhook_signature
+
+PROVIDER = "razorpay"
+DEFAULT_BATCH_SIZE = 200
+MAX_EVENT_ID_LENGTH = 100
+
+# Razorpay event -> payment status it implies
+EVENT_PAYMENT_STATUS = {
+    "payment.authorized": "authorized",
+    "payment.captured": "paid",
+    "order.paid": "paid",
+    "payment.failed": "failed",
+    "refund.processed": "refunded",
+}
+# Forward-only ordering of payment statuses
+PAYMENT_STATUS_RANK = {"pending": 0, "authorized": 1, "failed": 1, "paid": 2, "refunded": 3}
+
+_events = WebhookEvent.__table__
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+# -----------------------------
+# INGESTION
+# -----------------------------
+def record_webhook(body, signature, event_id=None):
+    """
+    Verify and store one delivery (commits). Returns (event_row_id, duplicate).
+
+    `event_id` is the X-Razorpay-Event-Id header; without it the body hash is
+    used, so an identical redelivery is still dropped.
+    """
+    if not current_app.config.get("RAZORPAY_WEBHOOK_SECRET"):
+        raise ServiceError("Webhook secret is not configured", status_code=503, code="webhook_not_configured")
+    if not verify_webhook_signature(body, signature):
+        raise UnauthorizedError("Invalid webhook signature", code="invalid_signature")
+
+    try:
+        event = json.loads(body)
+    except ValueError:
+        raise ValidationError("Webhook body must be JSON")
+    event_type = event.get("event") if isinstance(event, dict) else None
+    if not isinstance(event_type, str) or not event_type:
+        raise ValidationError("Webhook body has no event type")
+
+    event_id = (event_id or "").strip()[:MAX_EVENT_ID_LENGTH] or hashlib.sha256(body).hexdigest()
+    try:
+        with db.session.begin_nested():
+            row_id = db.session.execute(
+                insert(_events).values(
+                    provider=PROVIDER,
+                    event_id=event_id,
+                    event_type=event_type[:64],
+                    body=body.decode("utf-8"),
+                    status=WebhookEventStatus.RECEIVED,
+                    received_at=_now(),
+                )
+            ).inserted_primary_key[0]
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        row_id = db.session.execute(
+            select(_events.c.id).where(_events.c.provider == PROVIDER, _events.c.event_id == event_id)
+        ).scalar()
+        return row_id, True
+    return row_id, False
+
+
+# -----------------------------
+# BATCHED PROCESSING
+# -----------------------------
+def process_webhook_events(batch_size=None):
+    """Apply one batch of received events. Returns stats (events == 0 means the queue is empty)."""
+    batch_size = batch_size or current_app.config.get("WEBHOOK_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    stats = {"events": 0, "processed": 0, "ignored": 0, "failed": 0, "payments_updated": 0, "orders_updated": 0}
+
+    candidates = (
+        select(WebhookEvent)
+        .where(WebhookEvent.status == WebhookEventStatus.RECEIVED)
+        .order_by(WebhookEvent.id)
+        .limit(batch_size)
+    )
+    if db.session.get_bind().dialect.name in ("postgresql", "mysql"):
+        # Several processors can run; each takes a disjoint batch
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    events = db.session.execute(candidates).scalars().all()
+    if not events:
+        db.session.commit()
+        return stats
+    event_ids = [event.id for event in events]
+    stats["events"] = len(events)
+
+    try:
+        _merge(stats, _apply(events))
+        db.session.commit()
+        return stats
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.warning("webhook batch of %s failed (%s); retrying one by one", len(event_ids), exc)
+
+    for event_id in event_ids:
+        try:
+            event = db.session.get(WebhookEvent, event_id, with_for_update=True)
+            if event is None or event.status != WebhookEventStatus.RECEIVED:
+                db.session.commit()
+                continue
+            _merge(stats, _apply([event]))
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            db.session.execute(
+                update(_events)
+                .where(_events.c.id == event_id)
+                .values(status=WebhookEventStatus.FAILED, attempts=_events.c.attempts + 1,
+                        last_error=str(exc)[:2000], processed_at=_now())
+            )
+            db.session.commit()
+            stats["failed"] += 1
+    return stats
+
+
+def _merge(stats, result):
+    for key, value in result.items():
+        stats[key] += value
+
+
+def _parse(event):
+    """(target payment status or None, refs) for one stored event."""
+    target = EVENT_PAYMENT_STATUS.get(event.event_type)
+    if target is None:
+        return None, None
+    payload = (json.loads(event.body).get("payload") or {})
+    entity = (payload.get("payment") or {}).get("entity") or {}
+    refund = (payload.get("refund") or {}).get("entity") or {}
+    notes = entity.get("notes") if isinstance(entity.get("notes"), dict) else {}
+    local_id = notes.get("payment_id")
+    refs = {
+        "payment_id": entity.get("id") or refund.get("payment_id"),
+        "order_id": entity.get("order_id") or ((payload.get("order") or {}).get("entity") or {}).get("id"),
+        "local_id": int(local_id) if str(local_id or "").isdigit() else None,
+    }
+    return target, refs
+
+
+def _apply(events):
+    """Apply events (oldest first) in the caller's transaction; returns stats."""
+    parsed = [(event, *_parse(event)) for event in events]
+    gateway_payment_ids = {refs["payment_id"] for _, _, refs in parsed if refs and refs["payment_id"]}
+    gateway_order_ids = {refs["order_id"] for _, _, refs in parsed if refs and refs["order_id"]}
+    local_ids = {refs["local_id"] for _, _, refs in parsed if refs and refs["local_id"]}
+
+    payments = []
+    if gateway_payment_ids or gateway_order_ids or local_ids:
+        payments = db.session.execute(
+            select(Payment)
+            .where(or_(
+                Payment.gateway_payment_id.in_(gateway_payment_ids),
+                Payment.gateway_order_id.in_(gateway_order_ids),
+                Payment.id.in_(local_ids),
+            ))
+            .order_by(Payment.id)
+            .with_for_update()
+        ).scalars().all()
+    by_payment_id = {p.gateway_payment_id: p for p in payments if p.gateway_payment_id}
+    by_order_id = {p.gateway_order_id: p for p in payments if p.gateway_order_id}
+    by_local_id = {p.id: p for p in payments}
+
+    outcome = {WebhookEventStatus.PROCESSED: [], WebhookEventStatus.IGNORED: []}
+    initial = {p.id: p.status for p in payments}
+    for event, target, refs in parsed:
+        payment = None
+        if refs:
+            payment = (
+                by_payment_id.get(refs["payment_id"])
+                or by_order_id.get(refs["order_id"])
+                or by_local_id.get(refs["local_id"])
+            )
+        if payment is None:
+            outcome[WebhookEventStatus.IGNORED].append(event.id)
+            continue
+        advances = PAYMENT_STATUS_RANK.get(target, 0) > PAYMENT_STATUS_RANK.get(payment.status, 0)
+        # An order can see several payment attempts; keep the one that got furthest
+        if refs["payment_id"] and (advances or not payment.gateway_payment_id):
+            payment.gateway_payment_id = refs["payment_id"]
+            by_payment_id[refs["payment_id"]] = payment
+        if refs["order_id"] and not payment.gateway_order_id:
+            payment.gateway_order_id = refs["order_id"]
+        if advances:
+            payment.status = target
+        outcome[WebhookEventStatus.PROCESSED].append(event.id)
+
+    changed = [p for p in payments if p.status != initial[p.id]]
+    orders_updated = apply_order_statuses([(p.order_id, p.status) for p in changed])
+    for payment in changed:
+        if payment.status == "paid":
+            enqueue("payment.verified", payment_id=payment.id)
+
+    now = _now()
+    for status, ids in outcome.items():
+        if ids:
+            db.session.execute(
+                update(_events)
+                .where(_events.c.id.in_(ids))
+                .values(status=status, attempts=_events.c.attempts + 1, processed_at=now)
+            )
+    return {
+        "processed": len(outcome[WebhookEventStatus.PROCESSED]),
+        "ignored": len(outcome[WebhookEventStatus.IGNORED]),
+        "payments_updated": len(changed),
+        "orders_updated": orders_updated,
+    }
+
+
+def apply_order_statuses(payment_statuses):
+    """
+    Move orders after their payments' new statuses: paid marks pending orders
+    paid, refunded marks sold orders refunded (other statuses leave the order).
+    `payment_statuses` is (order_id, payment status) pairs; a later pair for
+    the same order wins. Shared with reconciliation_services so both paths
+    leave orders alike. Returns the number of orders changed.
+    """
+    wanted = {}
+    for order_id, status in payment_statuses:
+        if status == "paid":
+            wanted[order_id] = OrderStatus.PAID
+        elif status == "refunded":
+            wanted[order_id] = OrderStatus.REFUNDED
+    if not wanted:
+        return 0
+
+    updated = 0
+    orders = db.session.execute(
+        select(Order).where(Order.id.in_(list(wanted))).order_by(Order.id).with_for_update()
+    ).scalars().all()
+    for order in orders:
+        target = wanted[order.id]
+        if target == OrderStatus.PAID and order.status != OrderStatus.PENDING:
+            continue
+        if target == OrderStatus.REFUNDED and order.status not in (
+            OrderStatus.PAID, OrderStatus.SHIPPED, OrderStatus.COMPLETED
+        ):
+            continue
+        # update_status keeps the sales rollups in step
+        order.update_status(target)
+        updated += 1
+    return updated
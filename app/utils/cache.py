@@ -0,0 +1,219 @@
+"""
+In-process caching helpers.
+
+Design:
+- LRUTTLCache: small thread-safe LRU map whose entries also expire after a TTL.
+- VersionedCache: read-through cache for one namespace (e.g. "products").
+  Every entry is stored under the namespace *version* current at load time.
+  Writers call bump(); the version lives in a tiny shared file, so every
+  gunicorn worker on the host sees the new version on its next read and its
+  old entries simply stop matching (no per-key invalidation fan-out).
+- The default FileVersionStore is SINGLE-HOST: a bump on one machine is not
+  seen by workers on another, which keep serving their entries until the TTL
+  expires. That includes revoked admin roles (auth_services.identity_cache).
+  Running several hosts needs CACHE_VERSION_STORE pointing at a shared store,
+  or a CACHE_VERSION_DIR on storage every host sees with coherent mtimes.
+- Stampede protection: on a miss only one caller per key runs the loader;
+  concurrent callers for the same key wait for it and reuse the result.
+- Values are JSON-like (dicts, lists, tuples, scalars). Every get_or_load()
+  returns a fresh copy of the containers, so a caller mutating its result
+  cannot change what other requests read from the cache.
+
+Config keys (all optional):
+  - CACHE_ENABLED           (bool, default True)
+  - CACHE_MAX_ENTRIES       (int, default 1024 per namespace)
+  - CACHE_TTL_SECONDS       (float, default 60)
+  - CACHE_VERSION_DIR       (directory for version files, default <instance>/cache_versions)
+  - CACHE_VERSION_STORE     (optional "module:factory" import path; factory(app) returns an
+                             object with get(namespace) / bump(namespace) -> hashable version,
+                             used instead of FileVersionStore, e.g. one backed by Redis)
+
+Usage:
+    product_cache = VersionedCache("products")
+    data = product_cache.get_or_load(("detail", 7), lambda: load_product(7))
+    product_cache.bump()   # after a committed write
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import current_app
+from werkzeug.utils import import_string
+
+_MISSING = object()
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy the containers of a JSON-like value; scalars are immutable and shared."""
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_value(v) for v in value)
+    return value
+
+
+class LRUTTLCache:
+    """Thread-safe LRU cache with per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FileVersionStore:
+    """
+    Namespace version counters shared by all processes on a host.
+
+    Each namespace is a file; bump() appends one byte with O_APPEND (atomic on
+    POSIX) and the version is (mtime_ns, size), so reads are a single stat()
+    call. A missing file is created on first read, so a fresh filesystem (e.g.
+    after a redeploy) never reproduces a version handed out before.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, namespace: str) -> str:
+        return os.path.join(self.directory, f"{namespace}.version")
+
+    def get(self, namespace: str) -> Tuple[int, int]:
+        try:
+            st = os.stat(self._path(namespace))
+        except FileNotFoundError:
+            return self.bump(namespace)
+        return (st.st_mtime_ns, st.st_size)
+
+    def bump(self, namespace: str) -> Tuple[int, int]:
+        fd = os.open(self._path(namespace), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, b".")
+        finally:
+            os.close(fd)
+        return self.get(namespace)
+
+
+_version_stores: Dict[str, Any] = {}
+_version_stores_lock = threading.Lock()
+
+
+def get_version_store() -> Any:
+    """
+    Return the version store for the current app (one per setting, per process):
+    the CACHE_VERSION_STORE factory's store, else a FileVersionStore.
+    """
+    factory_path = current_app.config.get("CACHE_VERSION_STORE")
+    directory = current_app.config.get("CACHE_VERSION_DIR") or os.path.join(
+        current_app.instance_path, "cache_versions"
+    )
+    setting = factory_path or directory
+    store = _version_stores.get(setting)
+    if store is None:
+        with _version_stores_lock:
+            store = _version_stores.get(setting)
+            if store is None:
+                if factory_path:
+                    store = import_string(factory_path)(current_app._get_current_object())
+                else:
+                    store = FileVersionStore(directory)
+                _version_stores[setting] = store
+    return store
+
+
+class VersionedCache:
+    """Read-through LRU/TTL cache for one namespace, invalidated by version bumps."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._entries: Optional[LRUTTLCache] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, threading.Lock] = {}
+
+    def _cache(self) -> LRUTTLCache:
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = LRUTTLCache(
+                        maxsize=int(current_app.config.get("CACHE_MAX_ENTRIES", 1024)),
+                        ttl=float(current_app.config.get("CACHE_TTL_SECONDS", 60)),
+                    )
+        return self._entries
+
+    def version(self) -> Tuple[int, int]:
+        """Current shared version of this namespace (cheap: one stat call)."""
+        return get_version_store().get(self.namespace)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return a copy of the cached value for key, calling loader() on a miss.
+
+        Only one thread per key runs the loader; others block on the same key
+        lock and then read the freshly stored entry.
+        """
+        if not current_app.config.get("CACHE_ENABLED", True):
+            return loader()
+
+        cache = self._cache()
+        versioned_key = (self.version(), key)
+        value = cache.get(versioned_key, _MISSING)
+        if value is not _MISSING:
+            return _copy_value(value)
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(versioned_key, threading.Lock())
+        with key_lock:
+            try:
+                value = cache.get(versioned_key, _MISSING)
+                if value is _MISSING:
+                    value = loader()
+                    cache.set(versioned_key, value)
+            finally:
+                with self._lock:
+                    if self._inflight.get(versioned_key) is key_lock:
+                        del self._inflight[versioned_key]
+        return _copy_value(value)
+
+    def bump(self) -> None:
+        """Invalidate every entry in this namespace for all workers."""
+        get_version_store().bump(self.namespace)
+        if self._entries is not None:
+            self._entries.clear()
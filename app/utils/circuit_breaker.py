@@ -0,0 +1,138 @@
+"""
+Per-process circuit breaker for calls to an external dependency.
+
+States:
+- closed     calls go through; `failure_threshold` consecutive failures open it
+- open       calls are rejected at once (CircuitOpenError) for `reset_timeout` seconds
+- half_open  after the timeout, up to `half_open_max_calls` trial calls go
+             through; a success closes the circuit, a failure re-opens it
+
+State lives in the process (one gunicorn worker), so each worker decides on
+its own; that is enough to stop a slow dependency from pinning every worker.
+
+Usage:
+    breaker = CircuitBreaker("razorpay", failure_threshold=5, reset_timeout=30)
+    breaker.before_call()            # raises CircuitOpenError when open
+    try:
+        result = call()
+    except TransportError:
+        breaker.record_failure()
+        raise
+    except Exception:
+        breaker.record_ignored()     # not the dependency's fault
+        raise
+    breaker.record_success()
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised by before_call() while the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"circuit {name} is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open breaker."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._times_opened = 0
+        self._rejected = 0
+
+    def configure(self, failure_threshold: int, reset_timeout: float) -> None:
+        with self._lock:
+            self.failure_threshold = failure_threshold
+            self.reset_timeout = reset_timeout
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        # open -> half_open happens lazily, on the first look after the timeout
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def before_call(self) -> None:
+        """Let a call through or raise CircuitOpenError."""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            self._rejected += 1
+            retry_after = max(0.0, self.reset_timeout - (now - self._opened_at)) if state == OPEN else 0.0
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._trials = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._open(time.monotonic())
+
+    def record_ignored(self) -> None:
+        """The call failed for a reason unrelated to the dependency's health (e.g. a bug): count nothing."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                # Give the trial slot back so the next call can probe
+                self._trials -= 1
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._trials = 0
+        self._times_opened += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trials = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "name": self.name,
+                "state": state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_after": round(max(0.0, self.reset_timeout - (now - self._opened_at)), 3) if state == OPEN else 0.0,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected,
+            }
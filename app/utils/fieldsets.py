@@ -0,0 +1,48 @@
+"""
+Sparse fieldsets (?fields=id,name,price).
+
+parse_fields() validates the requested names against the model's serializable
+columns; load_only_fields() turns them into a query option so the SELECT only
+reads those columns. Pass the same tuple to format_model(..., fields=...) so
+the serializer never touches (and lazy-loads) a deferred column.
+
+Usage:
+    fields = parse_fields(request.args, Product)
+    query = Product.query.options(*load_only_fields(Product, fields))
+    data = format_model(rows, fields=fields)
+"""
+
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import load_only
+
+from app.errors import ValidationError
+from app.utils.response import serializable_fields
+
+
+def parse_fields(
+    args: Mapping[str, Any], model_cls: type, required: Sequence[str] = ("id",)
+) -> Optional[Tuple[str, ...]]:
+    """
+    Return the requested fieldset (always including `required`) or None for all fields.
+
+    Raises ValidationError listing unknown names.
+    """
+    raw = args.get("fields")
+    if not raw:
+        return None
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    allowed = serializable_fields(model_cls)
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise ValidationError("Unknown fields requested", details={"unknown": unknown, "allowed": list(allowed)})
+    # Keep model column order so equal fieldsets share one compiled serializer / cache key
+    wanted = set(requested) | set(required)
+    return tuple(name for name in allowed if name in wanted)
+
+
+def load_only_fields(model_cls: type, fields: Optional[Sequence[str]]) -> List[Any]:
+    """Query options restricting loaded columns to `fields` (empty list when fields is None)."""
+    if not fields:
+        return []
+    return [load_only(*[getattr(model_cls, name) for name in fields])]
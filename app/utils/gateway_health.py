@@ -0,0 +1,15 @@
+"""
+Payment gateway health state, per process.
+
+`gateway_latency` (app.utils.metrics) and `gateway_breaker`
+(app.utils.circuit_breaker) are shared by app.utils.razorpay_utils, which
+records every gateway call in them, and by readers such as
+GET /api/v1/admin/gateway. They live here, away from the razorpay SDK
+import, so readers load even where the SDK is missing.
+"""
+
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.metrics import LatencyRecorder
+
+gateway_latency = LatencyRecorder()
+gateway_breaker = CircuitBreaker("razorpay")
@@ -1,12 +1,14 @@
 from flask_jwt_extended import create_access_token as jwt_create_access_token, decode_token
 
 
-def generate_access_token(user_id):
+def generate_access_token(user_id, is_admin=False):
     """
     Generate a JWT access token for the given user ID.
     Flask-JWT-Extended expects identity to be a STRING.
+    The role travels as the signed "is_admin" claim, so authorization checks
+    need no user lookup.
     """
-    return jwt_create_access_token(identity=str(user_id))
+    return jwt_create_access_token(identity=str(user_id), additional_claims={"is_admin": bool(is_admin)})
 
 
 def decode_access_token(token):
@@ -0,0 +1,88 @@
+"""
+Small in-process latency metrics.
+
+LatencyRecorder keeps, per operation name, call / error / retry counters and
+a sliding window of the most recent latencies, from which percentiles are
+computed on demand. Everything is per process (one gunicorn worker); it is
+meant for admin endpoints, logs and benchmarks, not long-term storage.
+
+Usage:
+    gateway_latency = LatencyRecorder()
+    started = time.perf_counter()
+    ...
+    gateway_latency.record("order.create", time.perf_counter() - started, ok=True)
+    gateway_latency.snapshot()
+    # {"order.create": {"count": 1, "errors": 0, "retries": 0, "p50_ms": 12.1, ...}}
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict
+
+DEFAULT_WINDOW = 1024
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence (0.0 for an empty one)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+class _OperationStats:
+    __slots__ = ("count", "errors", "retries", "window")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.window = deque(maxlen=window)
+
+
+class LatencyRecorder:
+    """Thread-safe per-operation counters plus a sliding latency window."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._window = window
+        self._ops: Dict[str, _OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> _OperationStats:
+        stats = self._ops.get(name)
+        if stats is None:
+            stats = self._ops[name] = _OperationStats(self._window)
+        return stats
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            stats = self._stats(name)
+            stats.count += 1
+            if not ok:
+                stats.errors += 1
+            stats.window.append(seconds)
+
+    def note_retry(self, name: str) -> None:
+        with self._lock:
+            self._stats(name).retries += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = [(name, s.count, s.errors, s.retries, sorted(s.window)) for name, s in self._ops.items()]
+        return {
+            name: {
+                "count": count,
+                "errors": errors,
+                "retries": retries,
+                "p50_ms": round(percentile(window, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(window, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(window, 0.99) * 1000, 2),
+                "max_ms": round((window[-1] if window else 0.0) * 1000, 2),
+            }
+            for name, count, errors, retries, window in items
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
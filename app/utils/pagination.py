@@ -0,0 +1,166 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Design:
+- Pages are addressed by an opaque cursor that encodes the sort key of the last
+  row already returned, so fetching page N is a single index range scan
+  (WHERE key > :last ORDER BY key LIMIT :n) instead of an OFFSET scan.
+- Cursors are url-safe base64 of a small JSON list; clients must treat them as opaque.
+  Since clients can still send anything, decoded values must be JSON scalars
+  and keyset_filter() checks each one against its key column's type, so a
+  forged cursor is a 400 (ValidationError) rather than a database error.
+- Page size is always clamped to a hard cap (config PAGINATION_MAX_LIMIT).
+
+Usage:
+    limit, after = parse_page_args(request.args)
+    rows, meta = paginate(query, (Product.id,), limit, after)
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import ClauseElement
+
+from app.errors import ValidationError
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the key values of the last row into an opaque cursor string."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor(); raises ValidationError on garbage."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+    if not isinstance(values, list) or not values:
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+    if not all(isinstance(value, (str, int, float)) for value in values):
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+    return values
+
+
+def parse_page_args(args: Mapping[str, Any]) -> Tuple[int, Optional[List[Any]]]:
+    """
+    Read `limit` and `cursor` from request args.
+
+    Returns:
+        (limit, after) where after is the decoded cursor or None for the first page.
+    """
+    default = int(current_app.config.get("PAGINATION_DEFAULT_LIMIT", DEFAULT_LIMIT))
+    cap = int(current_app.config.get("PAGINATION_MAX_LIMIT", MAX_LIMIT))
+
+    raw_limit = args.get("limit")
+    if raw_limit in (None, ""):
+        limit = default
+    else:
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError):
+            raise ValidationError("limit must be an integer", details={"limit": raw_limit})
+        if limit < 1:
+            raise ValidationError("limit must be positive", details={"limit": raw_limit})
+    limit = min(limit, cap)
+
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+    return limit, after
+
+
+def keyset_filter(columns: Sequence[Any], after: Sequence[Any], descending: bool = False):
+    """
+    Build the row-value comparison (c1, c2, ...) > (v1, v2, ...) portably.
+
+    Expanded into OR/AND form because row-value comparison is not supported
+    consistently across SQLite/MySQL/Postgres. Each value must suit its
+    column's type (SQL expressions are trusted); otherwise ValidationError.
+    """
+    if len(after) != len(columns):
+        raise ValidationError("Invalid cursor")
+    if not all(_cursor_value_fits(column, value) for column, value in zip(columns, after)):
+        raise ValidationError("Invalid cursor")
+    clauses = []
+    for i, column in enumerate(columns):
+        equal_prefix = [columns[j] == after[j] for j in range(i)]
+        step = column < after[i] if descending else column > after[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def _cursor_value_fits(column: Any, value: Any) -> bool:
+    if isinstance(value, ClauseElement):
+        return True
+    if value is None or isinstance(value, (list, dict)):
+        return False
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        # Untyped key (e.g. a raw SQL column): any scalar compares
+        return True
+    if python_type is bool:
+        return isinstance(value, bool)
+    if isinstance(value, bool):
+        return False
+    if python_type is int:
+        return isinstance(value, int)
+    if python_type in (float, Decimal):
+        return isinstance(value, (int, float, Decimal))
+    if python_type is str:
+        return isinstance(value, str)
+    if python_type in (datetime, date):
+        return isinstance(value, (str, datetime, date))
+    return True
+
+
+def paginate(
+    query,
+    columns: Sequence[Any],
+    limit: int,
+    after: Optional[Sequence[Any]] = None,
+    descending: bool = False,
+    key=None,
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Apply keyset pagination to a SQLAlchemy query.
+
+    Args:
+        query: ORM query (legacy Query or anything with filter/order_by/limit/all)
+        columns: unique, indexed sort key columns (last one should be the primary key)
+        limit: page size (already clamped)
+        after: decoded cursor values or None for the first page
+        descending: sort newest/highest first
+        key: callable(row) -> sequence of key values; defaults to reading column keys off the row
+
+    Returns:
+        (rows, meta) where meta carries limit, has_more and next_cursor.
+    """
+    if after is not None:
+        query = query.filter(keyset_filter(columns, after, descending))
+    order = [c.desc() if descending else c.asc() for c in columns]
+    # Fetch one extra row to learn whether another page exists without a COUNT(*)
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        values = key(last) if key else [getattr(last, c.key) for c in columns]
+        next_cursor = encode_cursor(values)
+
+    meta = {"limit": limit, "has_more": has_more, "next_cursor": next_cursor}
+    return rows, meta
@@ -0,0 +1,190 @@
+"""
+Password hashing off the request thread.
+
+bcrypt is deliberately slow (~250 ms at 12 rounds), so running it inline lets
+a burst of logins occupy every sync worker. Here hashing and checking run on
+a small per-worker process pool instead:
+
+- PASSWORD_HASH_WORKERS processes per app worker (0 = run inline, e.g. tests).
+- At most PASSWORD_HASH_MAX_PENDING hash jobs may be queued or running per
+  app worker; beyond that callers get ServiceError 503 "auth_busy" at once
+  (backpressure) instead of queueing without bound.
+- Callers wait at most PASSWORD_HASH_TIMEOUT seconds ("auth_timeout").
+- Cost comes from BCRYPT_LOG_ROUNDS / BCRYPT_HASH_PREFIX (the Flask-Bcrypt
+  keys, so hashes stay compatible). check_and_rehash() returns a fresh hash
+  when a correct password's stored hash uses other parameters, so raising the
+  cost upgrades users as they log in, within the same pool round trip.
+
+The pool is created lazily and dropped after a fork (gunicorn --preload).
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import bcrypt
+from flask import current_app, has_app_context
+
+from app.errors import ServiceError, ValidationError
+
+DEFAULT_ROUNDS = 12
+DEFAULT_PREFIX = "2b"
+MAX_PASSWORD_BYTES = 72
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+_stats = {"submitted": 0, "rejected": 0, "timeouts": 0, "rehashed": 0}
+
+
+# -----------------------------
+# WORK (runs in the pool processes)
+# -----------------------------
+def _prepare(password, handle_long):
+    data = password.encode("utf-8") if isinstance(password, str) else password
+    if handle_long:
+        # Same pre-hash as Flask-Bcrypt's BCRYPT_HANDLE_LONG_PASSWORDS
+        data = hashlib.sha256(data).hexdigest().encode("utf-8")
+    return data
+
+
+def _outdated(pw_hash, rounds, prefix):
+    parts = pw_hash.split("$")
+    return len(parts) < 4 or parts[1] != prefix or not parts[2].isdigit() or int(parts[2]) != rounds
+
+
+def _hash(password, rounds, prefix, handle_long):
+    salt = bcrypt.gensalt(rounds=rounds, prefix=prefix.encode("ascii"))
+    return bcrypt.hashpw(_prepare(password, handle_long), salt).decode("utf-8")
+
+
+def _check_and_rehash(pw_hash, password, rounds, prefix, handle_long, rehash=True):
+    try:
+        ok = bcrypt.checkpw(_prepare(password, handle_long), pw_hash.encode("utf-8"))
+    except ValueError:
+        # Malformed stored hash or a password bcrypt cannot take
+        return False, None
+    if ok and rehash and _outdated(pw_hash, rounds, prefix):
+        return True, _hash(password, rounds, prefix, handle_long)
+    return ok, None
+
+
+# -----------------------------
+# POOL
+# -----------------------------
+def _settings():
+    if not has_app_context():
+        return DEFAULT_ROUNDS, DEFAULT_PREFIX, False, 0, 0, None
+    config = current_app.config
+    return (
+        int(config.get("BCRYPT_LOG_ROUNDS", DEFAULT_ROUNDS)),
+        config.get("BCRYPT_HASH_PREFIX", DEFAULT_PREFIX),
+        bool(config.get("BCRYPT_HANDLE_LONG_PASSWORDS", False)),
+        int(config.get("PASSWORD_HASH_WORKERS", 2)),
+        int(config.get("PASSWORD_HASH_MAX_PENDING", 16)),
+        float(config.get("PASSWORD_HASH_TIMEOUT", 10)),
+    )
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Never fork a threaded app worker: start clean interpreters instead
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+
+def _release(_future):
+    global _pending
+    with _pool_lock:
+        _pending -= 1
+
+
+def _run(func, *args):
+    """Run func on the pool with backpressure and a timeout (inline when the pool is disabled)."""
+    global _pending
+    workers, max_pending, timeout = _settings()[3:]
+    if workers <= 0:
+        return func(*args)
+
+    pool = _get_pool(workers)
+    with _pool_lock:
+        if _pending >= max_pending:
+            _stats["rejected"] += 1
+            raise ServiceError("Authentication is busy, retry shortly", status_code=503, code="auth_busy")
+        _pending += 1
+        _stats["submitted"] += 1
+    try:
+        future = pool.submit(func, *args)
+    except Exception:
+        _release(None)
+        raise
+    # A timed-out job keeps its slot until it really finishes
+    future.add_done_callback(_release)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        with _pool_lock:
+            _stats["timeouts"] += 1
+        raise ServiceError("Authentication timed out, retry shortly", status_code=503, code="auth_timeout")
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def pool_stats():
+    with _pool_lock:
+        return dict(_stats, pending=_pending, running=_pool is not None)
+
+
+def _forget_pool_after_fork():
+    global _pool, _pool_lock, _pending
+    _pool = None
+    _pool_lock = threading.Lock()
+    _pending = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool_after_fork)
+
+
+# -----------------------------
+# PUBLIC API
+# -----------------------------
+def hash_password(password):
+    """bcrypt hash (str) of `password` with the configured cost."""
+    if not password:
+        raise ValidationError("Password must not be empty")
+    rounds, prefix, handle_long = _settings()[:3]
+    if not handle_long and len(_prepare(password, False)) > MAX_PASSWORD_BYTES:
+        raise ValidationError(f"Password must be at most {MAX_PASSWORD_BYTES} bytes")
+    return _run(_hash, password, rounds, prefix, handle_long)
+
+
+def check_and_rehash(pw_hash, password, rehash=True):
+    """
+    (ok, new_hash): new_hash is set when the password is correct but pw_hash
+    uses other rounds/prefix than configured; the caller should store it.
+    """
+    if not pw_hash or not password:
+        return False, None
+    rounds, prefix, handle_long = _settings()[:3]
+    ok, new_hash = _run(_check_and_rehash, pw_hash, password, rounds, prefix, handle_long, rehash)
+    if new_hash:
+        with _pool_lock:
+            _stats["rehashed"] += 1
+    return ok, new_hash
+
+
+def check_password(pw_hash, password):
+    return check_and_rehash(pw_hash, password, rehash=False)[0]
@@ -0,0 +1,198 @@
+"""
+Rate limiting helpers for Flask-Limiter (app.extensions.limiter).
+
+- SQLiteStorage: a `limits` storage backend registered for the "sqlite://"
+  scheme, so RATELIMIT_STORAGE_URI = "sqlite:////path/ratelimit.db" gives
+  every gunicorn worker on the host one shared set of counters with nothing
+  else to run (memcached:// or redis:// work too when installed).
+  It supports the fixed-window and sliding-window-counter strategies. A
+  sliding-window hit is one short write transaction: read the previous and
+  current window counters, then upsert the current one; BEGIN IMMEDIATE
+  serializes concurrent hits across processes, so nothing is over-admitted.
+- rate_limit_key(): key function that buckets authenticated callers by JWT
+  identity ("user:<id>") and everyone else by client address ("ip:<addr>"),
+  so users behind one NAT no longer share a bucket.
+
+Config keys (see config.py # 14):
+  - RATELIMIT_STORAGE_URI     (default sqlite:///<project>/instance/ratelimit.db)
+  - RATELIMIT_STRATEGY        (default "sliding-window-counter")
+  - RATELIMIT_LOGIN           (limit on POST /auth/login, per address)
+  - RATELIMIT_CHECKOUT        (limit on POST /order/, per user or address)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_limiter.util import get_remote_address
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+# Expired counters are deleted every this many writes (per process)
+PURGE_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# Add to a live counter, or start over when it has expired
+_UPSERT = """
+INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    count = CASE WHEN rate_limits.expires_at <= ? THEN excluded.count ELSE rate_limits.count + excluded.count END,
+    expires_at = CASE WHEN rate_limits.expires_at <= ? THEN excluded.expires_at ELSE rate_limits.expires_at END
+RETURNING count
+"""
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Host-wide rate limit counters in one SQLite file (WAL, one connection per thread)."""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri=None, wrap_exceptions=False, timeout=5.0, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # Same form as SQLAlchemy: sqlite:///relative.db or sqlite:////absolute.db
+        path = urlparse(uri).path[1:] if uri else ""
+        if not path:
+            raise ValueError("sqlite rate limit storage needs a file path, e.g. sqlite:////var/run/app/ratelimit.db")
+        self.path = os.path.abspath(path)
+        self.timeout = float(timeout)
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        # A connection must not cross a fork (gunicorn --preload)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _upsert(self, conn, key, expiry, amount, now):
+        count = conn.execute(_UPSERT, (key, amount, now + expiry, now, now)).fetchone()[0]
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return count
+
+    def _counts(self, conn, keys, now):
+        rows = conn.execute(
+            f"SELECT key, count FROM rate_limits WHERE key IN ({','.join('?' * len(keys))}) AND expires_at > ?",
+            (*keys, now),
+        ).fetchall()
+        return dict(rows)
+
+    # -----------------------------
+    # FIXED WINDOW
+    # -----------------------------
+    def incr(self, key, expiry, amount=1):
+        return self._upsert(self._connection(), key, expiry, amount, time.time())
+
+    def get(self, key):
+        return self._counts(self._connection(), [key], time.time()).get(key, 0)
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key):
+        self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def reset(self):
+        return self._connection().execute("DELETE FROM rate_limits").rowcount
+
+    def check(self):
+        try:
+            self._connection().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    # -----------------------------
+    # SLIDING WINDOW COUNTER
+    # -----------------------------
+    def _window(self, counts, previous_key, current_key, expiry, now):
+        previous_count = counts.get(previous_key, 0)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, counts.get(current_key, 0), current_ttl
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        conn = self._connection()
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            counts = self._counts(conn, [previous_key, current_key], now)
+            previous_count, previous_ttl, current_count, _ = self._window(
+                counts, previous_key, current_key, expiry, now
+            )
+            # Previous window weighted by how much of it still overlaps the sliding window
+            if int(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                conn.execute("COMMIT")
+                return False
+            # The current window's counter is still read as "previous" during the next one
+            self._upsert(conn, current_key, 2 * expiry, amount, now)
+            conn.execute("COMMIT")
+            return True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_sliding_window(self, key, expiry):
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        counts = self._counts(self._connection(), [previous_key, current_key], now)
+        return self._window(counts, previous_key, current_key, expiry, now)
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self._connection().execute("DELETE FROM rate_limits WHERE key IN (?, ?)", (previous_key, current_key))
+
+
+# -----------------------------
+# KEYS AND LIMITS
+# -----------------------------
+def rate_limit_key():
+    """Bucket by JWT identity when the request carries a valid token, else by client address."""
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        # Expired or bad token: the view will refuse it; count it against the address
+        identity = None
+    if identity is not None:
+        return f"user:{identity}"
+    return f"ip:{get_remote_address()}"
+
+
+def address_key():
+    return f"ip:{get_remote_address()}"
+
+
+def configured_limit(name):
+    """Limit string from config, read per request so it can be tuned without code changes."""
+    return lambda: current_app.config[name]
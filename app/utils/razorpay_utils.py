@@ -1,10 +1,226 @@
+"""
+Razorpay gateway access.
+
+One razorpay.Client per worker process, built lazily and reused, so calls share
+a keep-alive connection pool instead of paying TCP/TLS setup every time:
+
+- The client's requests.Session has a pooled HTTPAdapter mounted (pool size
+  RAZORPAY_POOL_SIZE) that applies (connect, read) timeouts to every request.
+- Calls are retried up to RAZORPAY_MAX_RETRIES times with exponential backoff
+  and full jitter. GETs retry on connection errors, timeouts and gateway/5xx
+  errors; POSTs (e.g. order creation, not idempotent upstream) only when the
+  connection could not be established, i.e. the request was never sent.
+- Every network call records its latency in `gateway_latency`
+  (see app.utils.metrics and app.utils.gateway_health), keyed by operation name.
+- Each call has a total deadline (RAZORPAY_CALL_DEADLINE, all attempts
+  included) and runs behind `gateway_breaker` (app.utils.circuit_breaker):
+  after RAZORPAY_BREAKER_FAILURES consecutive transport/5xx failures calls
+  fail fast for RAZORPAY_BREAKER_RESET_SECONDS, so a slow gateway cannot pin
+  every worker. Failures surface as ServiceError: gateway_unavailable (503,
+  circuit open), gateway_timeout (504), gateway_error (502) or
+  gateway_rejected (400, the gateway refused the request).
+
+The client is rebuilt when the key, secret or base URL changes and after a
+fork, so a preloaded app never shares sockets between workers. Point
+RAZORPAY_BASE_URL at benchmarks/razorpay_stub.py for offline load tests.
+
+Config keys:
+  - RAZORPAY_KEY / RAZORPAY_SECRET
+  - RAZORPAY_WEBHOOK_SECRET    (webhook signing secret; checked by app.utils.signatures)
+  - RAZORPAY_BASE_URL          (default https://api.razorpay.com)
+  - RAZORPAY_CONNECT_TIMEOUT   (seconds, default 3.05)
+  - RAZORPAY_READ_TIMEOUT      (seconds, default 10)
+  - RAZORPAY_MAX_RETRIES       (retries after the first attempt, default 2)
+  - RAZORPAY_RETRY_BACKOFF     (base delay in seconds, default 0.2)
+  - RAZORPAY_RETRY_MAX_DELAY   (cap per delay in seconds, default 2)
+  - RAZORPAY_POOL_SIZE         (keep-alive connections per worker, default 10)
+  - RAZORPAY_CALL_DEADLINE     (seconds per call including retries, default 8)
+  - RAZORPAY_BREAKER_FAILURES  (consecutive failures that open the circuit, default 5)
+  - RAZORPAY_BREAKER_RESET_SECONDS (how long it stays open before a trial call, default 30)
+"""
+
+import os
+import random
+import threading
+import time
+
 import razorpay
+import requests
 from flask import current_app
+from razorpay.errors import BadRequestError, GatewayError, ServerError
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from app.errors import ServiceError
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.gateway_health import gateway_breaker, gateway_latency
+
+DEFAULT_BASE_URL = "https://api.razorpay.com"
+
+# Failures that say the gateway (or the path to it) is unhealthy
+_TRANSPORT_ERRORS = (requests.exceptions.RequestException, GatewayError, ServerError)
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
+
+class _PooledTimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter with a fixed pool size and a default (connect, read) timeout."""
+
+    def __init__(self, timeout, pool_size):
+        self.timeout = timeout
+        # Retries are handled by _call (with jitter and per-method rules)
+        super().__init__(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _settings():
+    config = current_app.config
+    return (
+        config.get("RAZORPAY_KEY", ""),
+        config.get("RAZORPAY_SECRET", ""),
+        (config.get("RAZORPAY_BASE_URL") or DEFAULT_BASE_URL).rstrip("/"),
+        float(config.get("RAZORPAY_CONNECT_TIMEOUT", 3.05)),
+        float(config.get("RAZORPAY_READ_TIMEOUT", 10)),
+        int(config.get("RAZORPAY_POOL_SIZE", 10)),
+    )
+
 
 def create_client():
-    return razorpay.Client(
-        auth=(current_app.config["RAZORPAY_KEY"], current_app.config["RAZORPAY_SECRET"])
+    """Return this process's shared razorpay.Client, building it on first use."""
+    global _client, _client_key
+    settings = _settings()
+    client = _client
+    if client is not None and _client_key == settings:
+        return client
+
+    with _client_lock:
+        if _client is None or _client_key != settings:
+            key, secret, base_url, connect_timeout, read_timeout, pool_size = settings
+            session = requests.Session()
+            adapter = _PooledTimeoutAdapter((connect_timeout, read_timeout), pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if _client is not None:
+                _client.session.close()
+            _client = razorpay.Client(session=session, auth=(key, secret), base_url=base_url)
+            _client_key = settings
+        return _client
+
+
+def reset_client():
+    """Drop the shared client (and its pooled connections)."""
+    global _client, _client_key
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+        _client = None
+        _client_key = None
+
+
+def _forget_client_after_fork():
+    # The child must not reuse the parent's sockets or lock state
+    global _client, _client_key, _client_lock
+    _client = None
+    _client_key = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
+def _never_sent(exc):
+    """True when the connection failed before the request reached the gateway."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        reason = getattr(exc.args[0], "reason", exc.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+def _retryable(exc, idempotent):
+    if _never_sent(exc):
+        return True
+    if not idempotent:
+        return False
+    return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, GatewayError, ServerError))
+
+
+def _gateway_error(operation, exc):
+    if isinstance(exc, requests.exceptions.Timeout):
+        return ServiceError("Payment gateway timed out", status_code=504, code="gateway_timeout",
+                            details={"operation": operation})
+    return ServiceError("Payment gateway error", status_code=502, code="gateway_error",
+                        details={"operation": operation})
+
+
+def _call(operation, func, *args, idempotent=True):
+    """
+    Run one gateway call within RAZORPAY_CALL_DEADLINE seconds (all attempts
+    included), behind the circuit breaker, with bounded jittered retries and
+    latency metrics. Failures surface as ServiceError.
+    """
+    config = current_app.config
+    max_retries = int(config.get("RAZORPAY_MAX_RETRIES", 2))
+    base_delay = float(config.get("RAZORPAY_RETRY_BACKOFF", 0.2))
+    max_delay = float(config.get("RAZORPAY_RETRY_MAX_DELAY", 2))
+    connect_timeout = float(config.get("RAZORPAY_CONNECT_TIMEOUT", 3.05))
+    read_timeout = float(config.get("RAZORPAY_READ_TIMEOUT", 10))
+    gateway_breaker.configure(
+        int(config.get("RAZORPAY_BREAKER_FAILURES", 5)), float(config.get("RAZORPAY_BREAKER_RESET_SECONDS", 30))
     )
+    deadline = time.monotonic() + float(config.get("RAZORPAY_CALL_DEADLINE", 8))
+
+    attempt = 0
+    while True:
+        try:
+            gateway_breaker.before_call()
+        except CircuitOpenError as exc:
+            raise ServiceError("Payment gateway unavailable", status_code=503, code="gateway_unavailable",
+                               details={"operation": operation, "retry_after": round(exc.retry_after, 1)})
+
+        # Each attempt gets what is left of the deadline (the read timeout bounds each wait for data)
+        remaining = max(0.001, deadline - time.monotonic())
+        timeout = (min(connect_timeout, remaining), min(read_timeout, remaining))
+        started = time.perf_counter()
+        try:
+            result = func(*args, timeout=timeout)
+        except BadRequestError as exc:
+            # The gateway answered, so it is healthy; the request itself was refused
+            gateway_latency.record(operation, time.perf_counter() - started, ok=False)
+            gateway_breaker.record_success()
+            raise ServiceError(str(exc) or "Payment gateway rejected the request", status_code=400,
+                               code="gateway_rejected", details={"operation": operation})
+        except Exception as exc:
+            gateway_latency.record(operation, time.perf_counter() - started, ok=False)
+            if not isinstance(exc, _TRANSPORT_ERRORS):
+                # A bug on our side says nothing about the gateway's health
+                gateway_breaker.record_ignored()
+                raise
+            # Only transport failures and gateway 5xx count against the breaker
+            gateway_breaker.record_failure()
+            # Full jitter: spread retries from many workers instead of syncing them up
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if attempt >= max_retries or not _retryable(exc, idempotent) or time.monotonic() + delay >= deadline:
+                raise _gateway_error(operation, exc) from exc
+            attempt += 1
+            gateway_latency.note_retry(operation)
+            current_app.logger.warning(
+                "razorpay %s failed (%s); retry %s/%s in %.2fs", operation, exc, attempt, max_retries, delay
+            )
+            time.sleep(delay)
+            continue
+        gateway_latency.record(operation, time.perf_counter() - started)
+        gateway_breaker.record_success()
+        return result
+
 
 def create_order(amount, currency="INR", receipt=None):
     client = create_client()
@@ -13,9 +229,26 @@ def create_order(amount, currency="INR", receipt=None):
         "currency": currency,
         "receipt": receipt or "order_rcptid_1"
     }
-    return client.order.create(order_data)
+    return _call("order.create", client.order.create, order_data, idempotent=False)
+
+
+def fetch_order(razorpay_order_id):
+    client = create_client()
+    return _call("order.fetch", client.order.fetch, razorpay_order_id)
+
+
+def fetch_payment(razorpay_payment_id):
+    client = create_client()
+    return _call("payment.fetch", client.payment.fetch, razorpay_payment_id)
+
+
+def fetch_order_payments(razorpay_order_id):
+    client = create_client()
+    return _call("order.payments", client.order.payments, razorpay_order_id)
+
 
 def verify_payment_signature(payment_id, order_id, signature):
+    # HMAC check with the shared client's secret; no network round trip
     client = create_client()
     params_dict = {
         "razorpay_order_id": order_id,
@@ -15,14 +15,21 @@ Design:
 
 - format_model(obj) attempts to convert SQLAlchemy model instances (or lists of them)
   into plain Python dicts. It also handles common scalar types (datetime, Decimal, UUID).
+
+- Column serialization goes through a per-model serializer compiled once
+  (compile_serializers() at startup, or lazily on first use). The compiled
+  serializer knows each column's type up front, so rows are emitted without
+  mapper inspection or an isinstance chain per value.
 """
 
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import enum
 import uuid
 
 from flask import jsonify
+from sqlalchemy import types as sqltypes
 from sqlalchemy.orm import class_mapper
 from sqlalchemy.exc import NoInspectionAvailable
 
@@ -33,6 +40,9 @@ def _serialize_value(value: Any) -> Any:
     # None, bool, int, float, str are JSON-serializable already
     if value is None:
         return None
+    # Before the str check: str-mixin enums (e.g. OrderStatus) emit their value too
+    if isinstance(value, enum.Enum):
+        return value.value
     if isinstance(value, (bool, int, float, str)):
         return value
     if isinstance(value, (datetime, date)):
@@ -54,21 +64,159 @@ def _serialize_value(value: Any) -> Any:
     return str(value)
 
 
+# --- Compiled per-model serializers -------------------------------------------
+Serializer = Callable[[Any], Dict[str, Any]]
+
+# model class -> compiled serializer (populated at startup or on first use)
+_SERIALIZERS: Dict[type, Serializer] = {}
+# (model class, field names) -> compiled serializer for a sparse fieldset (?fields=)
+_FIELDSET_SERIALIZERS: Dict[Tuple[type, Tuple[str, ...]], Serializer] = {}
+
+
+def _iso(value: Any) -> Any:
+    return value.isoformat() if value is not None else None
+
+
+def _decimal_str(value: Any) -> Any:
+    return str(value) if value is not None else None
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _converter_for(column_type: Any) -> Optional[Callable[[Any], Any]]:
+    """
+    Pick the value converter for a column type once, at compile time.
+
+    Returns None when the DB-API value is already JSON-native (no conversion needed).
+    Mirrors _serialize_value() so compiled and reflective output are identical
+    (tests/test_response.py compares the two paths).
+    """
+    if isinstance(column_type, sqltypes.Enum):
+        return _enum_value
+    if isinstance(column_type, (sqltypes.DateTime, sqltypes.Date, sqltypes.Time)):
+        return _iso
+    if isinstance(column_type, sqltypes.Float):
+        return None
+    if isinstance(column_type, sqltypes.Numeric):
+        return _decimal_str if column_type.asdecimal else None
+    if isinstance(column_type, (sqltypes.Integer, sqltypes.String, sqltypes.Boolean)):
+        return None
+    # Uncommon types (binary, UUID, JSON, custom) keep the generic behaviour
+    return _serialize_value
+
+
+def serializable_fields(model_cls: type) -> Tuple[str, ...]:
+    """Column keys a model exposes in responses (minus `__serialize_exclude__`)."""
+    excluded = set(getattr(model_cls, "__serialize_exclude__", ()))
+    return tuple(c.key for c in class_mapper(model_cls).columns if c.key not in excluded)
+
+
+def compile_serializer(model_cls: type, fields: Optional[Sequence[str]] = None) -> Serializer:
+    """
+    Build (and cache) a column serializer for a mapped model class.
+
+    The mapper is inspected exactly once here; the returned callable only does
+    attribute reads and the pre-selected conversions. Columns listed in the
+    model's optional `__serialize_exclude__` tuple are never emitted.
+    With `fields`, only those columns are emitted (and read), which pairs with
+    load_only() queries for sparse fieldsets.
+    """
+    fieldset = tuple(fields) if fields is not None else None
+    cached = _SERIALIZERS.get(model_cls) if fieldset is None else _FIELDSET_SERIALIZERS.get((model_cls, fieldset))
+    if cached is not None:
+        return cached
+
+    mapper = class_mapper(model_cls)
+    excluded = set(getattr(model_cls, "__serialize_exclude__", ()))
+    plain: List[str] = []
+    converted: List[tuple] = []
+    for column in mapper.columns:
+        name = column.key
+        if name in excluded or (fieldset is not None and name not in fieldset):
+            continue
+        converter = _converter_for(column.type)
+        if converter is None:
+            plain.append(name)
+        else:
+            converted.append((name, converter))
+    plain_fields = tuple(plain)
+    converted_fields = tuple(converted)
+
+    def serialize(model_obj: Any) -> Dict[str, Any]:
+        # Loaded column values live in the instance __dict__; reading them there
+        # skips the instrumented descriptor. Expired/deferred columns fall back
+        # to getattr() so the ORM can load them as before.
+        state = model_obj.__dict__
+        data = {
+            name: state[name] if name in state else getattr(model_obj, name)
+            for name in plain_fields
+        }
+        for name, convert in converted_fields:
+            data[name] = convert(state[name] if name in state else getattr(model_obj, name))
+        return data
+
+    serialize.__name__ = f"serialize_{model_cls.__name__}"
+    if fieldset is None:
+        _SERIALIZERS[model_cls] = serialize
+    else:
+        _FIELDSET_SERIALIZERS[(model_cls, fieldset)] = serialize
+    return serialize
+
+
+def row_serializer(columns: Iterable[Any]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Compile a serializer for plain result rows (tuples) of the given Columns.
+
+    Used where rows are fetched as column tuples instead of ORM instances
+    (e.g. streaming exports); conversion rules match compile_serializer().
+    """
+    fields = tuple((column.key, _converter_for(column.type)) for column in columns)
+
+    def serialize(row: Any) -> Dict[str, Any]:
+        return {
+            name: value if convert is None else convert(value)
+            for (name, convert), value in zip(fields, row)
+        }
+
+    return serialize
+
+
+def compile_serializers(*model_classes: type) -> None:
+    """Eagerly compile serializers for the given model classes (called from create_app)."""
+    for model_cls in model_classes:
+        compile_serializer(model_cls)
+
+
+def get_serializer(model_cls: type) -> Optional[Serializer]:
+    """Return the compiled serializer for a class, compiling lazily; None if not mapped."""
+    serializer = _SERIALIZERS.get(model_cls)
+    if serializer is not None:
+        return serializer
+    try:
+        return compile_serializer(model_cls)
+    except NoInspectionAvailable:
+        return None
+
+
 # --- Model formatting ---------------------------------------------------------
 def _serialize_model_instance(model_obj: Any, include_relationships: bool = False) -> Dict[str, Any]:
     """
     Convert a SQLAlchemy model instance into a dict.
 
     - Uses the model's mapper to iterate columns; avoids accessing private attrs.
+    - Skips columns in the model's `__serialize_exclude__` (as compile_serializer does).
     - Does NOT eagerly traverse relationships unless include_relationships=True.
     """
     data: Dict[str, Any] = {}
+    excluded = set(getattr(model_obj.__class__, "__serialize_exclude__", ()))
     try:
         mapper = class_mapper(model_obj.__class__)
     except NoInspectionAvailable:
         # Not a mappable object; fallback to __dict__ filtering
         for k, v in getattr(model_obj, "__dict__", {}).items():
-            if k.startswith("_"):
+            if k.startswith("_") or k in excluded:
                 continue
             data[k] = _serialize_value(v)
         return data
@@ -76,6 +224,8 @@ def _serialize_model_instance(model_obj: Any, include_relationships: bool = Fals
     # Serialize column attributes
     for column in mapper.columns:
         name = column.key
+        if name in excluded:
+            continue
         try:
             val = getattr(model_obj, name)
         except Exception:
@@ -102,7 +252,24 @@ def _serialize_model_instance(model_obj: Any, include_relationships: bool = Fals
     return data
 
 
-def format_model(obj: Any, many: Optional[bool] = None, include_relationships: bool = False) -> Any:
+def _serialize_many(items: List[Any], include_relationships: bool = False) -> List[Dict[str, Any]]:
+    """Serialize a homogeneous list, resolving the compiled serializer once for the batch."""
+    if not items:
+        return []
+    if not include_relationships:
+        first_cls = items[0].__class__
+        serializer = get_serializer(first_cls)
+        if serializer is not None and all(item.__class__ is first_cls for item in items):
+            return [serializer(item) for item in items]
+    return [_serialize_model_instance(item, include_relationships=include_relationships) for item in items]
+
+
+def format_model(
+    obj: Any,
+    many: Optional[bool] = None,
+    include_relationships: bool = False,
+    fields: Optional[Sequence[str]] = None,
+) -> Any:
     """
     Public formatter:
       - If obj is None -> None
@@ -115,10 +282,26 @@ def format_model(obj: Any, many: Optional[bool] = None, include_relationships: b
         obj: SQLAlchemy model instance, iterable of instances, dict, or scalar
         many: Optional[bool] to force treat as collection (True) or single (False)
         include_relationships: whether to include related objects (one-level deep)
+        fields: optional sparse fieldset; only these columns are read and emitted
     """
     if obj is None:
         return None
 
+    if fields is not None:
+        if isinstance(obj, (list, tuple, set)):
+            items = list(obj)
+            if not items:
+                return []
+            serializer = compile_serializer(items[0].__class__, fields)
+            return [serializer(item) for item in items]
+        return compile_serializer(obj.__class__, fields)(obj)
+
+    # Fast path: a mapped instance with a compiled serializer
+    if not include_relationships:
+        serializer = _SERIALIZERS.get(obj.__class__)
+        if serializer is not None:
+            return serializer(obj)
+
     # If it's a dict already, assume serializable
     if isinstance(obj, dict):
         # ensure nested values are serializable
@@ -131,7 +314,7 @@ def format_model(obj: Any, many: Optional[bool] = None, include_relationships: b
     # If user explicitly says many=True or obj is a list/tuple/set -> treat as collection
     if many is True or (many is None and isinstance(obj, (list, tuple, set))):
         iterable = list(obj)
-        return [_serialize_model_instance(item, include_relationships=include_relationships) for item in iterable]
+        return _serialize_many(iterable, include_relationships)
 
     # If it's an iterable (but not string/bytes/dict), default to treating as collection when many is None
     if many is None and isinstance(obj, Iterable):
@@ -141,7 +324,7 @@ def format_model(obj: Any, many: Optional[bool] = None, include_relationships: b
             # If empty, return empty list
             if not iterable:
                 return []
-            return [_serialize_model_instance(item, include_relationships=include_relationships) for item in iterable]
+            return _serialize_many(iterable, include_relationships)
         except TypeError:
             # Not a real iterable, fallthrough to single-instance handling
             pass
@@ -150,6 +333,10 @@ def format_model(obj: Any, many: Optional[bool] = None, include_relationships: b
     # If it looks like a SQLAlchemy mapped object, serialize via mapper
     if hasattr(obj, "__class__") and not isinstance(obj, (int, float, bool)):
         try:
+            if not include_relationships:
+                serializer = get_serializer(obj.__class__)
+                if serializer is not None:
+                    return serializer(obj)
             return _serialize_model_instance(obj, include_relationships=include_relationships)
         except Exception:
             # Fallback: return string representation
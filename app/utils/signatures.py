@@ -0,0 +1,23 @@
+"""
+Payment gateway signature checks that need only the standard library.
+
+Kept apart from app.utils.razorpay_utils (which imports the razorpay SDK) so
+webhook ingestion loads and verifies without it.
+"""
+
+import hashlib
+import hmac
+
+from flask import current_app
+
+
+def verify_webhook_signature(body, signature):
+    """
+    Check X-Razorpay-Signature: hex HMAC-SHA256 of the raw request body with
+    RAZORPAY_WEBHOOK_SECRET. False when no secret is configured.
+    """
+    secret = current_app.config.get("RAZORPAY_WEBHOOK_SECRET") or ""
+    if not secret or not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
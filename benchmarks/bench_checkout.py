@@ -0,0 +1,78 @@
+"""
+Benchmark: checkout (order_services.create_order) latency vs cart size.
+
+Uses a throwaway SQLite file database. For each cart size the cart is
+refilled and checked out `runs` times; median and p95 latency are reported.
+
+Run from the project root:
+    python benchmarks/bench_checkout.py [runs] [sizes...]
+e.g.
+    python benchmarks/bench_checkout.py 30 1 5 10 25 50 100
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Cart, Product, User  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+
+def make_app(db_path):
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        RATELIMIT_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    sizes = [int(s) for s in sys.argv[2:]] or [1, 5, 10, 25, 50, 100]
+
+    from app.services.order_services import create_order
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, "bench.db"))
+        with app.app_context():
+            user = User(username="bench", email="bench@example.com", password_hash="x")
+            db.session.add(user)
+            db.session.execute(
+                insert(Product.__table__),
+                [{"name": f"Product {i}", "price": 10 + i % 90, "stock": 10**9} for i in range(max(sizes))],
+            )
+            db.session.commit()
+            product_ids = [pid for (pid,) in db.session.query(Product.id).order_by(Product.id)]
+
+            print(f"{'cart size':>9}  {'median ms':>9}  {'p95 ms':>7}")
+            for size in sizes:
+                timings = []
+                for _ in range(runs):
+                    db.session.execute(
+                        insert(Cart.__table__),
+                        [{"user_id": user.id, "product_id": pid, "quantity": 1} for pid in product_ids[:size]],
+                    )
+                    db.session.commit()
+
+                    start = time.perf_counter()
+                    create_order({"user_id": user.id})
+                    timings.append((time.perf_counter() - start) * 1000)
+
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{size:>9}  {statistics.median(timings):>9.2f}  {p95:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark / scenario check: gateway calls against a slow Razorpay stand-in,
+with the per-call deadline and the circuit breaker.
+
+Starts benchmarks/razorpay_stub.py in-process and drives fetch_payment from
+N threads through four phases:
+
+  healthy      stub answers at once                 -> breaker closed, calls ok
+  slow         stub takes --slow seconds per call   -> calls cut at the deadline,
+                                                       then the breaker opens and
+                                                       calls fail fast (503)
+  no breaker   same slow stub, breaker disabled     -> every call waits for the deadline
+  recovered    stub fast again, after the reset     -> half-open trial closes the breaker
+
+For each phase it prints calls, outcome counts (ok / gateway_timeout /
+gateway_unavailable), p50 / p99 / max latency and the breaker state, then
+checks the expected behaviour and exits non-zero if it does not hold.
+
+Run from the project root:
+    python benchmarks/bench_gateway_breaker.py [seconds_per_phase] [threads] [slow_s] [deadline_s]
+e.g.
+    python benchmarks/bench_gateway_breaker.py 3 8 2.0 0.3
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app  # noqa: E402
+from app.errors import ServiceError  # noqa: E402
+from app.utils import razorpay_utils  # noqa: E402
+from app.utils.circuit_breaker import CLOSED, OPEN  # noqa: E402
+from app.utils.metrics import percentile  # noqa: E402
+from config import TestingConfig  # noqa: E402
+from razorpay_stub import RazorpayStub  # noqa: E402
+
+FAILURE_THRESHOLD = 3
+RESET_SECONDS = 1.0
+
+
+def make_app(base_url, threads, deadline):
+    class BenchConfig(TestingConfig):
+        RAZORPAY_KEY = "rzp_test_bench"
+        RAZORPAY_SECRET = "bench-secret"
+        RAZORPAY_BASE_URL = base_url
+        RAZORPAY_POOL_SIZE = threads
+        RAZORPAY_CALL_DEADLINE = deadline
+        RAZORPAY_MAX_RETRIES = 1
+        RAZORPAY_RETRY_BACKOFF = 0.05
+        RAZORPAY_BREAKER_FAILURES = FAILURE_THRESHOLD
+        RAZORPAY_BREAKER_RESET_SECONDS = RESET_SECONDS
+
+    return create_app(BenchConfig)
+
+
+def run_phase(app, threads, seconds):
+    timings, outcomes = [], Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def loop():
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    razorpay_utils.fetch_payment("pay_bench")
+                    outcome = "ok"
+                except ServiceError as exc:
+                    outcome = exc.code
+                elapsed = time.perf_counter() - start
+                with lock:
+                    timings.append(elapsed)
+                    outcomes[outcome] += 1
+                if outcome == "gateway_unavailable":
+                    time.sleep(0.01)  # a real client would back off too
+
+    workers = [threading.Thread(target=loop) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "outcomes": outcomes,
+        "p50": percentile(timings, 0.50) * 1000,
+        "p99": percentile(timings, 0.99) * 1000,
+        "max": (timings[-1] if timings else 0.0) * 1000,
+        "state": razorpay_utils.gateway_breaker.state,
+    }
+
+
+def report(name, result):
+    outcomes = result["outcomes"]
+    print(
+        f"{name:>10}  {result['calls']:>6}  {outcomes['ok']:>6}  {outcomes['gateway_timeout']:>7}  "
+        f"{outcomes['gateway_unavailable']:>11}  {result['p50']:>8.1f}  {result['p99']:>8.1f}  "
+        f"{result['max']:>8.1f}  {result['state']}"
+    )
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    slow = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+    deadline = float(sys.argv[4]) if len(sys.argv) > 4 else 0.3
+
+    stub = RazorpayStub().start()
+    app = make_app(stub.url, threads, deadline)
+    breaker = razorpay_utils.gateway_breaker
+    failures = []
+
+    def check(condition, message):
+        if not condition:
+            failures.append(message)
+
+    print(f"threads: {threads}  slow stub: {slow}s  deadline: {deadline}s  "
+          f"breaker: {FAILURE_THRESHOLD} failures / {RESET_SECONDS}s reset")
+    print(f"{'phase':>10}  {'calls':>6}  {'ok':>6}  {'timeout':>7}  {'unavailable':>11}  "
+          f"{'p50 ms':>8}  {'p99 ms':>8}  {'max ms':>8}  breaker")
+
+    healthy = run_phase(app, threads, seconds)
+    report("healthy", healthy)
+    check(healthy["outcomes"]["ok"] == healthy["calls"] and healthy["state"] == CLOSED, "healthy phase not all ok")
+
+    stub.latency = slow
+    slow_phase = run_phase(app, threads, seconds)
+    report("slow", slow_phase)
+    check(slow_phase["max"] < (deadline + 0.25) * 1000, "a call outlived its deadline")
+    check(slow_phase["outcomes"]["gateway_unavailable"] > slow_phase["outcomes"]["gateway_timeout"],
+          "breaker did not turn timeouts into fast failures")
+    check(slow_phase["outcomes"]["ok"] == 0, "slow phase should not succeed")
+
+    breaker.configure(10**9, RESET_SECONDS)
+    breaker.reset()
+    app.config["RAZORPAY_BREAKER_FAILURES"] = 10**9
+    no_breaker = run_phase(app, threads, seconds)
+    report("no breaker", no_breaker)
+    check(no_breaker["p50"] >= deadline * 1000 * 0.9, "without the breaker every call should wait for the deadline")
+    app.config["RAZORPAY_BREAKER_FAILURES"] = FAILURE_THRESHOLD
+
+    # Trip it again, then let the gateway recover
+    breaker.configure(FAILURE_THRESHOLD, RESET_SECONDS)
+    for _ in range(FAILURE_THRESHOLD):
+        breaker.record_failure()
+    check(breaker.state == OPEN, "breaker should be open before recovery")
+    stub.latency = 0.0
+    time.sleep(RESET_SECONDS)
+    recovered = run_phase(app, threads, seconds)
+    report("recovered", recovered)
+    check(recovered["state"] == CLOSED and recovered["outcomes"]["ok"] > 0, "breaker did not close after recovery")
+
+    print("breaker:", breaker.snapshot())
+    print("calls:", razorpay_utils.gateway_latency.snapshot())
+    razorpay_utils.reset_client()
+    stub.stop()
+
+    if failures:
+        print("FAILED:", "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
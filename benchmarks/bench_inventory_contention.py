@@ -0,0 +1,155 @@
+"""
+Benchmark: checkout throughput when many buyers hit ONE product.
+
+Each buyer thread loops add-to-cart + create_order against the same SKU, with
+stock held at add-to-cart (INVENTORY_HOLD_ON_CART). The same workload runs
+with the product unsharded (every buyer updates the single products.stock row)
+and with its stock spread over N shard rows. Reports orders/s, p95 checkout
+latency and conflicts, and checks that no unit was oversold.
+
+Uses DATABASE_URL when set (Postgres/MySQL show the row-lock effect of
+sharding; SQLite serializes all writers, so there it only shows correctness),
+otherwise a throwaway SQLite file.
+
+Run from the project root:
+    python benchmarks/bench_inventory_contention.py [seconds] [shards] [buyers...]
+e.g.
+    python benchmarks/bench_inventory_contention.py 5 16 1 8 64
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, insert, select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.errors import AppError  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Cart, InventoryReservation, Order, OrderItem, Product, StockShard, User  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+INITIAL_STOCK = 10**6
+
+
+def make_app(db_url, max_buyers):
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = db_url
+        RATELIMIT_ENABLED = False
+        INVENTORY_HOLD_ON_CART = True
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "pool_size": max_buyers + 4,
+            "max_overflow": 0,
+            **({"connect_args": {"timeout": 30}} if db_url.startswith("sqlite") else {}),
+        }
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def reset(product_id, shards):
+    from app.services.inventory_services import reshard_product_stock
+
+    for model in (OrderItem, Order, InventoryReservation, Cart):
+        db.session.execute(delete(model.__table__))
+    db.session.execute(
+        Product.__table__.update().where(Product.id == product_id).values(stock=INITIAL_STOCK)
+    )
+    db.session.execute(delete(StockShard.__table__))
+    reshard_product_stock(product_id, shards, total=INITIAL_STOCK)
+    db.session.commit()
+
+
+def buyer(app, user_id, product_id, deadline, timings, conflicts):
+    from app.services.cart_services import add_to_cart
+    from app.services.order_services import create_order
+
+    with app.app_context():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                add_to_cart({"user_id": user_id, "product_id": product_id, "quantity": 1})
+                create_order({"user_id": user_id})
+            except AppError:
+                conflicts.append(1)
+                db.session.rollback()
+                continue
+            finally:
+                db.session.remove()
+            timings.append((time.perf_counter() - start) * 1000)
+
+
+def run(app, product_id, user_ids, buyers, shards, seconds):
+    with app.app_context():
+        reset(product_id, shards)
+
+    timings, conflicts = [], []
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=buyer, args=(app, user_ids[i], product_id, deadline, timings, conflicts))
+        for i in range(buyers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        sold = db.session.execute(select(func.coalesce(func.sum(OrderItem.quantity), 0))).scalar()
+        left = db.session.execute(select(func.coalesce(func.sum(StockShard.available), 0))).scalar() if shards else (
+            db.session.execute(select(Product.stock).where(Product.id == product_id)).scalar()
+        )
+        held = db.session.execute(
+            select(func.coalesce(func.sum(InventoryReservation.quantity), 0)).where(
+                InventoryReservation.status == "held"
+            )
+        ).scalar()
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))] if timings else 0.0
+    consistent = sold + left + held == INITIAL_STOCK
+    return len(timings) / seconds, p95, len(conflicts), consistent
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    shards = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    buyer_counts = [int(b) for b in sys.argv[3:]] or [1, 8, 64]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = os.environ.get("DATABASE_URL") or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app = make_app(db_url, max(buyer_counts))
+        with app.app_context():
+            db.session.execute(
+                insert(User.__table__),
+                [
+                    {"username": f"buyer{i}", "email": f"buyer{i}@example.com", "password_hash": "x"}
+                    for i in range(max(buyer_counts))
+                ],
+            )
+            product = Product(name="Hot item", price=10, stock=INITIAL_STOCK)
+            db.session.add(product)
+            db.session.commit()
+            product_id = product.id
+            user_ids = [uid for (uid,) in db.session.query(User.id).order_by(User.id)]
+
+        print(f"database: {db_url.split('://')[0]}  duration: {seconds}s per run")
+        print(f"{'buyers':>6}  {'shards':>6}  {'orders/s':>9}  {'p95 ms':>8}  {'conflicts':>9}  consistent")
+        for buyers in buyer_counts:
+            for shard_count in (0, shards):
+                rate, p95, conflicts, consistent = run(app, product_id, user_ids, buyers, shard_count, seconds)
+                print(f"{buyers:>6}  {shard_count:>6}  {rate:>9.1f}  {p95:>8.2f}  {conflicts:>9}  {consistent}")
+
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
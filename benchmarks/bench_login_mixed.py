@@ -0,0 +1,151 @@
+"""
+Benchmark: login latency under mixed load, bcrypt inline vs on the password pool.
+
+Uses a throwaway SQLite file database and the Flask test client. For each
+mode, `login_threads` threads POST /api/v1/auth/login in a loop while
+`browse_threads` threads GET /api/v1/product/ (the catalog), for `seconds`.
+Reported per mode:
+
+  logins / catalog reads served, login p50 / p99, catalog p50 / p99 (ms),
+  and logins rejected with 503 (auth_busy / auth_timeout backpressure).
+
+Modes:
+  inline  PASSWORD_HASH_WORKERS = 0  (bcrypt on the request thread)
+  pool    PASSWORD_HASH_WORKERS = N  (bcrypt on N processes, bounded queue)
+
+On a machine with few cores the pool cannot add hashing throughput; what it
+shows there is isolation: catalog latency stays low while logins run, and
+logins beyond the bounded queue are shed as 503s instead of queueing without
+limit.
+
+Run from the project root:
+    python benchmarks/bench_login_mixed.py [seconds] [login_threads] [browse_threads] [rounds] [workers] [max_pending]
+e.g.
+    python benchmarks/bench_login_mixed.py 10 16 4 12 2 4
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Product, User  # noqa: E402
+from app.utils import passwords  # noqa: E402
+from app.utils.metrics import percentile  # noqa: E402
+from config import TestingConfig  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+def make_app(db_path, rounds, workers, max_pending):
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        RATELIMIT_ENABLED = False
+        BCRYPT_LOG_ROUNDS = rounds
+        PASSWORD_HASH_WORKERS = workers
+        PASSWORD_HASH_MAX_PENDING = max_pending
+
+    return create_app(BenchConfig)
+
+
+def seed(app, users):
+    with app.app_context():
+        db.create_all()
+        for i in range(users):
+            user = User(username=f"bench{i}", email=f"bench{i}@example.com")
+            user.password = PASSWORD
+            db.session.add(user)
+        db.session.execute(
+            insert(Product.__table__),
+            [{"name": f"Product {i}", "price": 10 + i % 90, "stock": 100} for i in range(200)],
+        )
+        db.session.commit()
+
+
+def run_mode(app, seconds, login_threads, browse_threads, users):
+    logins, reads, statuses = [], [], Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def login_loop(n):
+        client = app.test_client()
+        body = {"email": f"bench{n % users}@example.com", "password": PASSWORD}
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = client.post("/api/v1/auth/login", json=body).status_code
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    logins.append(elapsed)
+            if status == 503:
+                time.sleep(0.05)  # a real client backs off too
+
+    def browse_loop():
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            client.get("/api/v1/product/?limit=20")
+            with lock:
+                reads.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=login_loop, args=(n,)) for n in range(login_threads)]
+    threads += [threading.Thread(target=browse_loop) for _ in range(browse_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logins.sort()
+    reads.sort()
+    return {
+        "logins": len(logins),
+        "reads": len(reads),
+        "login_p50": percentile(logins, 0.50) * 1000,
+        "login_p99": percentile(logins, 0.99) * 1000,
+        "read_p50": percentile(reads, 0.50) * 1000,
+        "read_p99": percentile(reads, 0.99) * 1000,
+        "rejected": statuses[503],
+        "other": sum(count for status, count in statuses.items() if status not in (200, 503)),
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    login_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    browse_threads = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    rounds = int(sys.argv[4]) if len(sys.argv) > 4 else 12
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else 2
+    max_pending = int(sys.argv[6]) if len(sys.argv) > 6 else 4
+    users = 8
+
+    print(f"cpus: {os.cpu_count()}  bcrypt rounds: {rounds}  login threads: {login_threads}  "
+          f"browse threads: {browse_threads}  pool: {workers} workers / {max_pending} pending")
+    print(f"{'mode':>6}  {'logins':>6}  {'reads':>6}  {'login p50':>9}  {'login p99':>9}  "
+          f"{'read p50':>8}  {'read p99':>8}  {'503s':>5}  {'other':>5}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, mode_workers in (("inline", 0), ("pool", workers)):
+            app = make_app(os.path.join(tmp, f"{mode}.db"), rounds, mode_workers, max_pending)
+            seed(app, users)
+            if mode_workers:
+                with app.app_context():
+                    # Start the pool processes before timing
+                    passwords.hash_password("warm-up")
+            result = run_mode(app, seconds, login_threads, browse_threads, users)
+            print(f"{mode:>6}  {result['logins']:>6}  {result['reads']:>6}  {result['login_p50']:>9.1f}  "
+                  f"{result['login_p99']:>9.1f}  {result['read_p50']:>8.1f}  {result['read_p99']:>8.1f}  "
+                  f"{result['rejected']:>5}  {result['other']:>5}")
+        print("pool:", passwords.pool_stats())
+        passwords.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: rate limiter storage overhead and accuracy across processes.
+
+For each storage / strategy pair, `procs` processes each run `hits` limiter
+hits spread round-robin over `keys` keys, with a limit of `limit` per minute
+per key, through limits' own RateLimiter classes (as Flask-Limiter calls
+them). Reported:
+
+  hits/s over all processes, per-hit p50 / p99 (microseconds), and how many
+  hits were admitted per key vs the limit. memory:// keeps one counter set
+  per process, so with several processes it admits up to procs x limit;
+  the shared sqlite:// file admits exactly the limit.
+
+Run from the project root:
+    python benchmarks/bench_rate_limit.py [procs] [hits_per_proc] [limit] [keys]
+e.g.
+    python benchmarks/bench_rate_limit.py 4 2000 500 4
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import RateLimitItemPerMinute  # noqa: E402
+from limits.storage import storage_from_string  # noqa: E402
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter  # noqa: E402
+
+import app.utils.rate_limit  # noqa: E402,F401  (registers sqlite://)
+from app.utils.metrics import percentile  # noqa: E402
+
+STRATEGIES = {"fixed-window": FixedWindowRateLimiter, "sliding-window-counter": SlidingWindowCounterRateLimiter}
+
+
+def worker(uri, strategy, hits, limit, keys, results):
+    limiter = STRATEGIES[strategy](storage_from_string(uri))
+    item = RateLimitItemPerMinute(limit)
+    admitted, timings = [0] * keys, []
+    for i in range(hits):
+        start = time.perf_counter()
+        ok = limiter.hit(item, "bench", f"user:{i % keys}")
+        timings.append(time.perf_counter() - start)
+        admitted[i % keys] += ok
+    results.put((admitted, timings))
+
+
+def run(uri, strategy, procs, hits, limit, keys):
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=worker, args=(uri, strategy, hits, limit, keys, results))
+               for _ in range(procs)]
+    start = time.perf_counter()
+    for process in workers:
+        process.start()
+    collected = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    admitted = [sum(c[0][k] for c in collected) for k in range(keys)]
+    timings = sorted(t for c in collected for t in c[1])
+    return {
+        "rate": len(timings) / elapsed,
+        "p50": percentile(timings, 0.50) * 1e6,
+        "p99": percentile(timings, 0.99) * 1e6,
+        "admitted": max(admitted),
+    }
+
+
+def main():
+    procs = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    hits = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    limit = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    keys = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+
+    print(f"processes: {procs}  hits/process: {hits}  limit: {limit}/minute per key  keys: {keys}")
+    print(f"{'storage':>8}  {'strategy':>22}  {'hits/s':>8}  {'p50 us':>7}  {'p99 us':>7}  {'admitted/key':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, uri in (("memory", "memory://"), ("sqlite", None)):
+            for strategy in STRATEGIES:
+                if uri is None:
+                    storage_uri = f"sqlite:///{os.path.join(tmp, strategy + '.db')}"
+                else:
+                    storage_uri = uri
+                result = run(storage_uri, strategy, procs, hits, limit, keys)
+                print(f"{name:>8}  {strategy:>22}  {result['rate']:>8.0f}  {result['p50']:>7.1f}  "
+                      f"{result['p99']:>7.1f}  {result['admitted']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: gateway calls with the pooled per-worker Razorpay client versus a
+new razorpay.Client per call (the old create_client() behaviour).
+
+Starts benchmarks/razorpay_stub.py in-process (unless RAZORPAY_BASE_URL is
+set) and runs N threads, each looping create_order + fetch_payment for the
+given duration. Reports calls/s, p50/p95 latency, TCP connections the stub
+accepted, and the retry count when failures are injected.
+
+Run from the project root:
+    python benchmarks/bench_razorpay_client.py [seconds] [threads] [latency_s] [fail_rate]
+e.g.
+    python benchmarks/bench_razorpay_client.py 5 8 0.01 0.02
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import razorpay  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.utils import razorpay_utils  # noqa: E402
+from app.utils.metrics import percentile  # noqa: E402
+from config import TestingConfig  # noqa: E402
+from razorpay_stub import RazorpayStub  # noqa: E402
+
+
+def make_app(base_url, threads):
+    class BenchConfig(TestingConfig):
+        RAZORPAY_KEY = "rzp_test_bench"
+        RAZORPAY_SECRET = "bench-secret"
+        RAZORPAY_BASE_URL = base_url
+        RAZORPAY_POOL_SIZE = threads
+        RAZORPAY_RETRY_BACKOFF = 0.05
+
+    return create_app(BenchConfig)
+
+
+def fresh_client_calls(app):
+    """The old behaviour: a new client (and connection) for every call, no timeout."""
+    def call():
+        config = app.config
+        client = razorpay.Client(auth=(config["RAZORPAY_KEY"], config["RAZORPAY_SECRET"]),
+                                 base_url=config["RAZORPAY_BASE_URL"])
+        client.order.create({"amount": 1000, "currency": "INR", "receipt": "bench"})
+        client = razorpay.Client(auth=(config["RAZORPAY_KEY"], config["RAZORPAY_SECRET"]),
+                                 base_url=config["RAZORPAY_BASE_URL"])
+        client.payment.fetch("pay_bench")
+    return call
+
+
+def pooled_calls(app):
+    def call():
+        razorpay_utils.create_order(10, receipt="bench")
+        razorpay_utils.fetch_payment("pay_bench")
+    return call
+
+
+def run(app, call, threads, seconds):
+    timings, errors = [], []
+    deadline = time.perf_counter() + seconds
+
+    def loop():
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    call()
+                except Exception:
+                    errors.append(1)
+                    continue
+                timings.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=loop) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    timings.sort()
+    # Two gateway calls per iteration
+    return 2 * len(timings) / seconds, percentile(timings, 0.5) * 1000, percentile(timings, 0.95) * 1000, len(errors)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.005
+    fail_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+
+    stub = None
+    base_url = os.environ.get("RAZORPAY_BASE_URL")
+    if not base_url:
+        stub = RazorpayStub(latency=latency, fail_rate=fail_rate).start()
+        base_url = stub.url
+    app = make_app(base_url, threads)
+
+    print(f"gateway: {base_url}  threads: {threads}  duration: {seconds}s  "
+          f"stub latency: {latency}s  fail rate: {fail_rate}")
+    print(f"{'client':>14}  {'calls/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'errors':>6}  {'retries':>7}  connections")
+    for name, factory in (("new per call", fresh_client_calls), ("pooled", pooled_calls)):
+        razorpay_utils.reset_client()
+        razorpay_utils.gateway_latency.reset()
+        if stub:
+            stub.reset_stats()
+        rate, p50, p95, errors = run(app, factory(app), threads, seconds)
+        retries = sum(op["retries"] for op in razorpay_utils.gateway_latency.snapshot().values())
+        connections = stub.stats()["connections"] if stub else "n/a"
+        print(f"{name:>14}  {rate:>8.1f}  {p50:>7.2f}  {p95:>7.2f}  {errors:>6}  {retries:>7}  {connections}")
+
+    print("pooled client metrics:", razorpay_utils.gateway_latency.snapshot())
+    razorpay_utils.reset_client()
+    if stub:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: reflective format_model path vs compiled per-model serializers.
+
+Builds 10k transient Product instances (no database needed) and times:
+  - old:  _serialize_model_instance() (class_mapper + isinstance chain per row)
+  - new:  compiled serializer via format_model(list)
+
+Run from the project root:
+    python benchmarks/bench_serializers.py [rows] [repeats]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import Product  # noqa: E402
+from app.utils.response import (  # noqa: E402
+    _serialize_model_instance,
+    compile_serializers,
+    format_model,
+)
+
+
+def build_products(n):
+    now = datetime.now(timezone.utc)
+    return [
+        Product(
+            id=i,
+            name=f"Product {i}",
+            description="A reasonably long product description " * 4,
+            price=Decimal("199.99"),
+            stock=i % 50,
+            category_id=i % 20,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    products = build_products(rows)
+    compile_serializers(Product)
+
+    old = best_of(lambda: [_serialize_model_instance(p) for p in products], repeats)
+    new = best_of(lambda: format_model(products), repeats)
+
+    assert [_serialize_model_instance(p) for p in products[:10]] == format_model(products[:10])
+
+    print(f"rows={rows} repeats={repeats} (best run)")
+    print(f"reflective  : {old * 1000:8.1f} ms  ({rows / old:,.0f} rows/s)")
+    print(f"compiled    : {new * 1000:8.1f} ms  ({rows / new:,.0f} rows/s)")
+    print(f"speedup     : {old / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
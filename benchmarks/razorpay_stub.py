@@ -0,0 +1,263 @@
+"""
+Local stand-in for the parts of the Razorpay REST API this app uses, for
+offline load tests of app.utils.razorpay_utils.
+
+Endpoints (JSON, HTTP/1.1 keep-alive, Basic auth accepted but not checked):
+    POST /v1/orders                  create an order ("order_<hex>", status "created")
+    GET  /v1/orders/<id>             fetch an order
+    GET  /v1/orders/<id>/payments    seeded payments for an order ({"count", "items"})
+    GET  /v1/payments/<id>           fetch a payment; unknown ids are reported with
+                                     --payment-status (default "captured")
+    POST /_stub/payments             seed a payment: {"id", "status", "order_id", "amount"}
+    GET  /_stub/stats                requests served, TCP connections accepted, failures
+
+Knobs: --latency adds a fixed delay (seconds) to every API call, --jitter adds
+up to that much random extra delay, --fail-rate answers that fraction of API
+calls with a 503 SERVER_ERROR. Errors use Razorpay's error envelope, so the
+SDK raises its usual exceptions.
+
+Run standalone and point the app at it:
+    python benchmarks/razorpay_stub.py --port 9010 --latency 0.02
+    RAZORPAY_BASE_URL=http://127.0.0.1:9010 flask run
+or start it in-process from a benchmark:
+    stub = RazorpayStub(latency=0.02).start()
+    ... stub.url ...
+    stub.stop()
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client pooling is visible in the stats
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def setup(self):
+        super().setup()
+        self.server.stub.count("connections")
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _error(self, status, code, description):
+        self._send(status, {"error": {"code": code, "description": description}})
+
+    def _api_call(self):
+        """Shared latency / failure injection; returns False when the call should fail."""
+        stub = self.server.stub
+        stub.count("requests")
+        delay = stub.latency + (random.uniform(0, stub.jitter) if stub.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if stub.fail_rate and random.random() < stub.fail_rate:
+            stub.count("failures")
+            self._error(503, "SERVER_ERROR", "Injected failure")
+            return False
+        return True
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        stub = self.server.stub
+        data = self._read_json()
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/_stub/payments":
+            self._send(200, stub.seed_payment(**data))
+            return
+        if path != "/v1/orders":
+            self._error(404, "BAD_REQUEST_ERROR", "The requested URL was not found on the server.")
+            return
+        if not self._api_call():
+            return
+        if not isinstance(data.get("amount"), int) or data["amount"] < 100:
+            self._error(400, "BAD_REQUEST_ERROR", "The amount must be atleast INR 1.00")
+            return
+        self._send(200, stub.create_order(data))
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        stub = self.server.stub
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/_stub/stats":
+            self._send(200, stub.stats())
+            return
+        parts = path.split("/")
+        if len(parts) == 5 and parts[1:3] == ["v1", "orders"] and parts[4] == "payments":
+            if self._api_call():
+                items = stub.get_order_payments(parts[3])
+                self._send(200, {"entity": "collection", "count": len(items), "items": items})
+            return
+        if len(parts) != 4 or parts[1] != "v1" or parts[2] not in ("orders", "payments"):
+            self._error(404, "BAD_REQUEST_ERROR", "The requested URL was not found on the server.")
+            return
+        if not self._api_call():
+            return
+        entity = stub.get_order(parts[3]) if parts[2] == "orders" else stub.get_payment(parts[3])
+        if entity is None:
+            self._error(400, "BAD_REQUEST_ERROR", "The id provided does not exist")
+            return
+        self._send(200, entity)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up (timeouts) close the socket under a slow handler
+        if isinstance(sys.exc_info()[1], ConnectionError) and not self.stub.verbose:
+            return
+        super().handle_error(request, client_address)
+
+
+class RazorpayStub:
+    """In-memory Razorpay API stand-in served by a ThreadingHTTPServer."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, fail_rate=0.0,
+                 payment_status="captured", verbose=False):
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.payment_status = payment_status
+        self.verbose = verbose
+        self._orders = {}
+        self._payments = {}
+        self._counters = {"requests": 0, "connections": 0, "failures": 0}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.server = _Server((host, port), _Handler)
+        self.server.stub = self
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # state --------------------------------------------------------------
+    def count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, orders=len(self._orders), payments=len(self._payments))
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def create_order(self, data):
+        order = {
+            "id": f"order_{uuid.uuid4().hex[:14]}",
+            "entity": "order",
+            "amount": data["amount"],
+            "amount_paid": 0,
+            "amount_due": data["amount"],
+            "currency": data.get("currency", "INR"),
+            "receipt": data.get("receipt"),
+            "status": "created",
+            "attempts": 0,
+            "notes": data.get("notes") or [],
+            "created_at": int(time.time()),
+        }
+        with self._lock:
+            self._orders[order["id"]] = order
+        return order
+
+    def get_order(self, order_id):
+        with self._lock:
+            return self._orders.get(order_id)
+
+    def seed_payment(self, id=None, status=None, order_id=None, amount=100, **extra):  # noqa: A002
+        payment = {
+            "id": id or f"pay_{uuid.uuid4().hex[:14]}",
+            "entity": "payment",
+            "amount": amount,
+            "currency": "INR",
+            "status": status or self.payment_status,
+            "order_id": order_id,
+            "method": "card",
+            "created_at": int(time.time()),
+            **extra,
+        }
+        with self._lock:
+            self._payments[payment["id"]] = payment
+        return payment
+
+    def get_order_payments(self, order_id):
+        with self._lock:
+            return [p for p in self._payments.values() if p["order_id"] == order_id]
+
+    def get_payment(self, payment_id):
+        with self._lock:
+            payment = self._payments.get(payment_id)
+        return payment or {
+            "id": payment_id,
+            "entity": "payment",
+            "amount": 100,
+            "currency": "INR",
+            "status": self.payment_status,
+            "order_id": None,
+            "method": "card",
+            "created_at": int(time.time()),
+        }
+
+    # lifecycle ----------------------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="razorpay-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9010)
+    parser.add_argument("--latency", type=float, default=0.0, help="fixed delay per API call (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay per API call (s)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of API calls answered with 503")
+    parser.add_argument("--payment-status", default="captured", help="status reported for unknown payments")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    stub = RazorpayStub(args.host, args.port, args.latency, args.jitter, args.fail_rate,
+                        args.payment_status, args.verbose)
+    print(f"razorpay stub listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
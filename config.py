@@ -32,6 +32,88 @@ class Config:
     # 3. Other Settings
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour
     PROPAGATE_EXCEPTIONS = True
+
+    # 4. Pagination (keyset / cursor based list endpoints)
+    PAGINATION_DEFAULT_LIMIT = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', 50))
+    PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', 200))
+
+    # 5. Read-through cache (catalog reads); versions are shared via files
+    CACHE_ENABLED = os.environ.get('CACHE_ENABLED', '1') not in ('0', 'false', 'False')
+    CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+    CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', 60))
+    CACHE_VERSION_DIR = os.environ.get('CACHE_VERSION_DIR') or str(BASE_DIR / 'instance' / 'cache_versions')
+    # Version files are per host; set a "module:factory" store for multi-host deploys
+    # (see app/utils/cache.py), otherwise bumps elsewhere apply only after the TTL
+    CACHE_VERSION_STORE = os.environ.get('CACHE_VERSION_STORE') or None
+
+    # 6. Inventory reservations (time-limited stock holds, expiry sweeper)
+    INVENTORY_HOLD_ON_CART = os.environ.get('INVENTORY_HOLD_ON_CART', '0') in ('1', 'true', 'True')
+    INVENTORY_HOLD_SECONDS = int(os.environ.get('INVENTORY_HOLD_SECONDS', 900))
+    INVENTORY_SWEEP_BATCH = int(os.environ.get('INVENTORY_SWEEP_BATCH', 500))
+    INVENTORY_SWEEP_INTERVAL = float(os.environ.get('INVENTORY_SWEEP_INTERVAL', 30))
+
+    # 7. Background jobs (`flask worker`)
+    JOB_CONCURRENCY = int(os.environ.get('JOB_CONCURRENCY', 4))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+    JOB_RETRY_BASE_DELAY = float(os.environ.get('JOB_RETRY_BASE_DELAY', 5))
+    JOB_RETRY_MAX_DELAY = float(os.environ.get('JOB_RETRY_MAX_DELAY', 600))
+    JOB_LOCK_TIMEOUT = int(os.environ.get('JOB_LOCK_TIMEOUT', 300))
+    JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', 7 * 86400))
+
+    # 8. Idempotency-Key handling for order/payment creation
+    IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 86400))
+    IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', 60))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', 10))
+
+    # 9. Cold-order archival (`flask archive-orders`)
+    ARCHIVE_ORDERS_AFTER_DAYS = int(os.environ.get('ARCHIVE_ORDERS_AFTER_DAYS', 180))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+
+    # 10. Razorpay gateway (one pooled client per worker, see app/utils/razorpay_utils.py)
+    RAZORPAY_KEY = os.environ.get('RAZORPAY_KEY', '')
+    RAZORPAY_SECRET = os.environ.get('RAZORPAY_SECRET', '')
+    RAZORPAY_WEBHOOK_SECRET = os.environ.get('RAZORPAY_WEBHOOK_SECRET', '')
+    RAZORPAY_BASE_URL = os.environ.get('RAZORPAY_BASE_URL', 'https://api.razorpay.com')
+    RAZORPAY_CONNECT_TIMEOUT = float(os.environ.get('RAZORPAY_CONNECT_TIMEOUT', 3.05))
+    RAZORPAY_READ_TIMEOUT = float(os.environ.get('RAZORPAY_READ_TIMEOUT', 10))
+    RAZORPAY_MAX_RETRIES = int(os.environ.get('RAZORPAY_MAX_RETRIES', 2))
+    RAZORPAY_RETRY_BACKOFF = float(os.environ.get('RAZORPAY_RETRY_BACKOFF', 0.2))
+    RAZORPAY_RETRY_MAX_DELAY = float(os.environ.get('RAZORPAY_RETRY_MAX_DELAY', 2))
+    RAZORPAY_POOL_SIZE = int(os.environ.get('RAZORPAY_POOL_SIZE', 10))
+    RAZORPAY_CALL_DEADLINE = float(os.environ.get('RAZORPAY_CALL_DEADLINE', 8))
+    RAZORPAY_BREAKER_FAILURES = int(os.environ.get('RAZORPAY_BREAKER_FAILURES', 5))
+    RAZORPAY_BREAKER_RESET_SECONDS = float(os.environ.get('RAZORPAY_BREAKER_RESET_SECONDS', 30))
+
+    # 11. Payment webhooks (`flask process-webhooks`)
+    WEBHOOK_BATCH_SIZE = int(os.environ.get('WEBHOOK_BATCH_SIZE', 200))
+    WEBHOOK_POLL_INTERVAL = float(os.environ.get('WEBHOOK_POLL_INTERVAL', 1.0))
+
+    # 12. Payment reconciliation (`flask reconcile-payments`); keep
+    # RECONCILE_CONCURRENCY <= RAZORPAY_POOL_SIZE so every thread gets a pooled connection
+    RECONCILE_BATCH_SIZE = int(os.environ.get('RECONCILE_BATCH_SIZE', 200))
+    RECONCILE_CONCURRENCY = int(os.environ.get('RECONCILE_CONCURRENCY', 8))
+    RECONCILE_MIN_AGE_SECONDS = int(os.environ.get('RECONCILE_MIN_AGE_SECONDS', 900))
+
+    # 13. Password hashing (bcrypt on a per-worker process pool, see app/utils/passwords.py);
+    # raising BCRYPT_LOG_ROUNDS rehashes users on their next login
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+
+    # 14. Rate limiting (see app/utils/rate_limit.py). The default SQLite file
+    # is shared by every worker on the host; use memcached:// or redis:// to
+    # share counters across hosts. Callers are keyed by JWT identity, else address.
+    RATELIMIT_STORAGE_URI = os.environ.get(
+        'RATELIMIT_STORAGE_URI', f"sqlite:///{(BASE_DIR / 'instance' / 'ratelimit.db')}"
+    )
+    RATELIMIT_STRATEGY = os.environ.get('RATELIMIT_STRATEGY', 'sliding-window-counter')
+    # Keep serving if the limiter storage fails; counters fall back to memory
+    RATELIMIT_SWALLOW_ERRORS = True
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    RATELIMIT_LOGIN = os.environ.get('RATELIMIT_LOGIN', '10 per minute;100 per hour')
+    RATELIMIT_CHECKOUT = os.environ.get('RATELIMIT_CHECKOUT', '20 per minute')
     
     # SQLAlchemy options
     SQLALCHEMY_ENGINE_OPTIONS = {
@@ -57,6 +139,13 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # Module-level caches would leak state between per-test in-memory databases
+    CACHE_ENABLED = False
+    # Cheap hashes, computed inline
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    # Per-app counters, so tests do not share limits through a file
+    RATELIMIT_STORAGE_URI = 'memory://'
 
 # Helper to load the correct class based on FLASK_ENV
 def get_config(name=None):
@@ -5,6 +5,8 @@ from flask import current_app
 
 from alembic import context
 
+from app.database.search_index import SEARCH_INDEX_NAME, SQLITE_FTS_TABLE
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -45,6 +47,17 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # The full-text search objects (migration a3f1c9e2b7d4) are raw DDL with no
+    # model: the FTS5 table and its shadow tables, and the products search index.
+    # Without this, autogenerate would emit drops for them.
+    if type_ == "table" and name.startswith(SQLITE_FTS_TABLE):
+        return False
+    if type_ == "index" and name == SEARCH_INDEX_NAME:
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +78,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +107,8 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,66 @@
+"""product full-text search index
+
+Revision ID: a3f1c9e2b7d4
+Revises: 45d83ce6a4d8
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c9e2b7d4'
+down_revision = '45d83ce6a4d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX ix_products_search ON products "
+            "USING GIN (to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '')))"
+        )
+    elif dialect == 'mysql':
+        op.execute("CREATE FULLTEXT INDEX ix_products_search ON products (name, description)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE products_fts "
+            "USING fts5(name, description, content='products', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN "
+            "INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN "
+            "INSERT INTO products_fts(products_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "END"
+        )
+        op.execute(
+            "CREATE TRIGGER products_fts_au AFTER UPDATE OF name, description ON products BEGIN "
+            "INSERT INTO products_fts(products_fts, rowid, name, description) "
+            "VALUES ('delete', old.id, old.name, old.description); "
+            "INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description); "
+            "END"
+        )
+        op.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_products_search")
+    elif dialect == 'mysql':
+        op.execute("DROP INDEX ix_products_search ON products")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS products_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS products_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS products_fts_ai")
+        op.execute("DROP TABLE IF EXISTS products_fts")
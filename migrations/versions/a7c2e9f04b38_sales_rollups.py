@@ -0,0 +1,43 @@
+"""hourly and daily sales rollups
+
+Revision ID: a7c2e9f04b38
+Revises: f3b9d5e72c14
+Create Date: 2026-10-17 16:00:00.000000
+
+Run `flask backfill-sales-rollups` after upgrading to populate history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c2e9f04b38'
+down_revision = 'f3b9d5e72c14'
+branch_labels = None
+depends_on = None
+
+
+def _create_rollup_table(name):
+    op.create_table(name,
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('dimension', sa.String(length=16), nullable=False),
+    sa.Column('dimension_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('order_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('units', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('bucket_start', 'dimension', 'dimension_id')
+    )
+    with op.batch_alter_table(name, schema=None) as batch_op:
+        batch_op.create_index(f'ix_{name}_dimension_bucket', ['dimension', 'bucket_start'], unique=False)
+
+
+def upgrade():
+    _create_rollup_table('sales_hourly')
+    _create_rollup_table('sales_daily')
+
+
+def downgrade():
+    for name in ('sales_daily', 'sales_hourly'):
+        with op.batch_alter_table(name, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{name}_dimension_bucket')
+        op.drop_table(name)
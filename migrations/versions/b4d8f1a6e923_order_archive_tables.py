@@ -0,0 +1,67 @@
+"""order archive tables
+
+Revision ID: b4d8f1a6e923
+Revises: a7c2e9f04b38
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d8f1a6e923'
+down_revision = 'a7c2e9f04b38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('orders_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('total_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PAID', 'SHIPPED', 'COMPLETED', 'CANCELLED', 'REFUNDED', name='order_status', native_enum=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('orders_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_archive_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+    op.create_table('order_items_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('order_items_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_order_items_archive_order_id', ['order_id'], unique=False)
+
+    op.create_table('payments_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('mode', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('payments_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_archive_order_id', ['order_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('payments_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_archive_order_id')
+    op.drop_table('payments_archive')
+
+    with op.batch_alter_table('order_items_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_items_archive_order_id')
+    op.drop_table('order_items_archive')
+
+    with op.batch_alter_table('orders_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_archive_user_id_created_at_id')
+    op.drop_table('orders_archive')
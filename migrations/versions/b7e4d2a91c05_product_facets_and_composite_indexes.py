@@ -0,0 +1,72 @@
+"""product facet counts and composite category indexes
+
+Revision ID: b7e4d2a91c05
+Revises: a3f1c9e2b7d4
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d2a91c05'
+down_revision = 'a3f1c9e2b7d4'
+branch_labels = None
+depends_on = None
+
+# Must match app.services.product_facet_services.PRICE_BUCKET_EDGES
+PRICE_BUCKET_EDGES = (0, 100, 500, 1000, 5000)
+
+
+def _bucket_label(index):
+    low = PRICE_BUCKET_EDGES[index]
+    if index + 1 < len(PRICE_BUCKET_EDGES):
+        return f"{low}-{PRICE_BUCKET_EDGES[index + 1]}"
+    return f"{low}+"
+
+
+def upgrade():
+    # Create the composite indexes before dropping the old one so the
+    # category foreign key always has a usable index (MySQL requires it).
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_category_id_id', ['category_id', 'id'], unique=False)
+        batch_op.create_index('ix_products_category_id_price', ['category_id', 'price'], unique=False)
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_category_id')
+
+    facet_counts = op.create_table('product_facet_counts',
+    sa.Column('facet', sa.String(length=32), nullable=False),
+    sa.Column('value', sa.String(length=64), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+
+    # Backfill from the current catalog
+    bind = op.get_bind()
+    products = sa.table('products', sa.column('category_id', sa.Integer), sa.column('price', sa.Numeric(10, 2)))
+    bucket = sa.case(
+        *[(products.c.price < edge, i) for i, edge in enumerate(PRICE_BUCKET_EDGES[1:])],
+        else_=len(PRICE_BUCKET_EDGES) - 1,
+    )
+    rows = [
+        {"facet": "category_id", "value": "none" if value is None else str(value), "count": count}
+        for value, count in bind.execute(
+            sa.select(products.c.category_id, sa.func.count()).group_by(products.c.category_id)
+        )
+    ]
+    rows += [
+        {"facet": "price", "value": _bucket_label(int(index)), "count": count}
+        for index, count in bind.execute(sa.select(bucket, sa.func.count()).group_by(bucket))
+    ]
+    if rows:
+        op.bulk_insert(facet_counts, rows)
+
+
+def downgrade():
+    op.drop_table('product_facet_counts')
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index('ix_products_category_id', ['category_id'], unique=False)
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_category_id_price')
+        batch_op.drop_index('ix_products_category_id_id')
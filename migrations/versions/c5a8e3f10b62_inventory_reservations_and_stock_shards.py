@@ -0,0 +1,56 @@
+"""inventory reservations and stock shards
+
+Revision ID: c5a8e3f10b62
+Revises: b7e4d2a91c05
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a8e3f10b62'
+down_revision = 'b7e4d2a91c05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_shards',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('shard_no', sa.Integer(), nullable=False),
+    sa.Column('available', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'shard_no')
+    )
+    op.create_table('inventory_reservations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('order_id', sa.Integer(), nullable=True),
+    sa.Column('shard_no', sa.Integer(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), server_default='held', nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('inventory_reservations', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_reservations_order_id', ['order_id'], unique=False)
+        batch_op.create_index('ix_inventory_reservations_status_expires_at', ['status', 'expires_at'], unique=False)
+        batch_op.create_index('ix_inventory_reservations_user_product_status', ['user_id', 'product_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('inventory_reservations', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_reservations_user_product_status')
+        batch_op.drop_index('ix_inventory_reservations_status_expires_at')
+        batch_op.drop_index('ix_inventory_reservations_order_id')
+
+    op.drop_table('inventory_reservations')
+    op.drop_table('stock_shards')
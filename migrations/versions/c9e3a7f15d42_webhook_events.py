@@ -0,0 +1,62 @@
+"""webhook events and payment gateway ids
+
+Revision ID: c9e3a7f15d42
+Revises: b4d8f1a6e923
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e3a7f15d42'
+down_revision = 'b4d8f1a6e923'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('webhook_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(length=32), server_default='razorpay', nullable=False),
+    sa.Column('event_id', sa.String(length=100), nullable=False),
+    sa.Column('event_type', sa.String(length=64), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=16), server_default='received', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('provider', 'event_id', name='uq_webhook_events_provider_event_id')
+    )
+    with op.batch_alter_table('webhook_events', schema=None) as batch_op:
+        batch_op.create_index('ix_webhook_events_status_id', ['status', 'id'], unique=False)
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('gateway_order_id', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('gateway_payment_id', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_payments_gateway_order_id'), ['gateway_order_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_payments_gateway_payment_id'), ['gateway_payment_id'], unique=False)
+
+    with op.batch_alter_table('payments_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('gateway_order_id', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('gateway_payment_id', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('payments_archive', schema=None) as batch_op:
+        batch_op.drop_column('gateway_payment_id')
+        batch_op.drop_column('gateway_order_id')
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payments_gateway_payment_id'))
+        batch_op.drop_index(batch_op.f('ix_payments_gateway_order_id'))
+        batch_op.drop_column('gateway_payment_id')
+        batch_op.drop_column('gateway_order_id')
+
+    with op.batch_alter_table('webhook_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_webhook_events_status_id')
+
+    op.drop_table('webhook_events')
@@ -0,0 +1,32 @@
+"""order history index on (user_id, created_at, id)
+
+Revision ID: d2f6b8c41a97
+Revises: c5a8e3f10b62
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6b8c41a97'
+down_revision = 'c5a8e3f10b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The composite index also serves the users FK (leading user_id column),
+    # so the single-column index is dropped once it exists.
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_id')
+
+
+def downgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.create_index('ix_orders_user_id', ['user_id'], unique=False)
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_index('ix_orders_user_id_created_at_id')
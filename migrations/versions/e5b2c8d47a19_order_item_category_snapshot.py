@@ -0,0 +1,35 @@
+"""order_items category_id snapshot
+
+Revision ID: e5b2c8d47a19
+Revises: a7c2e5f18b34
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c8d47a19'
+down_revision = 'a7c2e5f18b34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('order_items', 'order_items_archive'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('category_id', sa.Integer(), nullable=True))
+
+        # Existing lines get the product's current category (the best record left);
+        # new lines are snapshotted at checkout
+        op.execute(
+            f"UPDATE {table} SET category_id = "
+            f"(SELECT products.category_id FROM products WHERE products.id = {table}.product_id)"
+        )
+
+
+def downgrade():
+    for table in ('order_items_archive', 'order_items'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('category_id')
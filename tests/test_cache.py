@@ -0,0 +1,36 @@
+from app.utils.cache import VersionedCache, get_version_store
+
+
+class _CountingStore:
+    def __init__(self, app):
+        self.versions = {}
+
+    def get(self, namespace):
+        return self.versions.setdefault(namespace, 0)
+
+    def bump(self, namespace):
+        self.versions[namespace] = self.get(namespace) + 1
+        return self.versions[namespace]
+
+
+def test_callers_cannot_mutate_cached_values(app):
+    app.config["CACHE_ENABLED"] = True
+    cache = VersionedCache("test-copies")
+
+    first = cache.get_or_load("key", lambda: {"items": [{"stock": 1}], "meta": (1, [2])})
+    first["items"][0]["stock"] = 0
+    first["meta"][1].append(3)
+
+    assert cache.get_or_load("key", lambda: None) == {"items": [{"stock": 1}], "meta": (1, [2])}
+
+
+def test_configured_version_store_is_used(app):
+    app.config.update(CACHE_ENABLED=True, CACHE_VERSION_STORE=f"{__name__}:_CountingStore")
+    cache = VersionedCache("test-store")
+
+    assert cache.get_or_load("key", lambda: "old") == "old"
+    cache.bump()
+    assert cache.get_or_load("key", lambda: "new") == "new"
+    store = get_version_store()
+    assert isinstance(store, _CountingStore)
+    assert store.versions["test-store"] == 1
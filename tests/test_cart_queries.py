@@ -0,0 +1,65 @@
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Cart, Product, User
+from app.services.cart_services import get_user_cart
+from app.utils.jwt_utils import generate_access_token
+
+
+def _seed_cart(lines):
+    user = User(username="buyer", email="buyer@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    db.session.execute(
+        insert(Product.__table__),
+        [{"name": f"Product {i}", "price": 10 + i, "stock": 100} for i in range(lines)],
+    )
+    product_ids = [pid for (pid,) in db.session.query(Product.id).order_by(Product.id)]
+    db.session.execute(
+        insert(Cart.__table__),
+        [{"user_id": user.id, "product_id": pid, "quantity": 2} for pid in product_ids],
+    )
+    db.session.commit()
+    return user.id
+
+
+def test_cart_read_is_one_query_regardless_of_size(app, count_queries):
+    for lines in (1, 25):
+        db.drop_all()
+        db.create_all()
+        user_id = _seed_cart(lines)
+        db.session.expire_all()
+
+        with count_queries() as queries:
+            items, meta = get_user_cart(user_id)
+
+        assert len(queries) == 1, queries.statements
+        assert len(items) == lines
+        assert meta["line_count"] == lines
+        assert meta["item_count"] == 2 * lines
+
+
+def test_empty_cart_is_one_query(app, count_queries):
+    user = User(username="empty", email="empty@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+
+    with count_queries() as queries:
+        items, meta = get_user_cart(user_id)
+
+    assert len(queries) == 1
+    assert items == []
+    assert meta == {"subtotal": "0.00", "item_count": 0, "line_count": 0}
+
+
+def test_cart_endpoint_reads_in_one_query(app, client, count_queries):
+    user_id = _seed_cart(10)
+    headers = {"Authorization": f"Bearer {generate_access_token(user_id)}"}
+
+    with count_queries() as queries:
+        response = client.get("/api/v1/cart/", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 10
+    assert len(queries) == 1, queries.statements
@@ -0,0 +1,133 @@
+"""
+Gateway deadline and circuit breaker, driven against the artificially slow
+local Razorpay stand-in from benchmarks/razorpay_stub.py.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from razorpay_stub import RazorpayStub  # noqa: E402
+
+from app.errors import ServiceError  # noqa: E402
+from app.utils import razorpay_utils  # noqa: E402
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN  # noqa: E402
+
+FAILURES = 3
+RESET_SECONDS = 0.3
+DEADLINE = 0.3
+
+
+@pytest.fixture
+def stub():
+    stub = RazorpayStub().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def gateway(app, stub):
+    app.config.update(
+        RAZORPAY_KEY="rzp_test_key",
+        RAZORPAY_SECRET="secret",
+        RAZORPAY_BASE_URL=stub.url,
+        RAZORPAY_CALL_DEADLINE=DEADLINE,
+        RAZORPAY_MAX_RETRIES=1,
+        RAZORPAY_RETRY_BACKOFF=0.01,
+        RAZORPAY_BREAKER_FAILURES=FAILURES,
+        RAZORPAY_BREAKER_RESET_SECONDS=RESET_SECONDS,
+    )
+    razorpay_utils.reset_client()
+    razorpay_utils.gateway_breaker.reset()
+    yield stub
+    razorpay_utils.gateway_breaker.reset()
+    razorpay_utils.reset_client()
+
+
+def _fetch():
+    start = time.monotonic()
+    try:
+        razorpay_utils.fetch_payment("pay_test")
+        return "ok", time.monotonic() - start
+    except ServiceError as exc:
+        return exc.code, time.monotonic() - start
+
+
+def _trip(stub):
+    stub.latency = 2.0
+    outcomes = [_fetch()[0] for _ in range(FAILURES)]
+    assert outcomes == ["gateway_timeout"] * FAILURES
+
+
+def test_slow_gateway_opens_the_breaker(gateway):
+    assert _fetch()[0] == "ok"
+    _trip(gateway)
+    assert razorpay_utils.gateway_breaker.state == OPEN
+
+
+def test_open_breaker_fails_fast_with_503(gateway):
+    _trip(gateway)
+    with pytest.raises(ServiceError) as excinfo:
+        razorpay_utils.fetch_payment("pay_test")
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.code == "gateway_unavailable"
+
+    code, elapsed = _fetch()
+    assert code == "gateway_unavailable"
+    assert elapsed < 0.05
+
+
+def test_half_open_success_closes_the_breaker(gateway):
+    _trip(gateway)
+    gateway.latency = 0.0
+    time.sleep(RESET_SECONDS)
+    assert razorpay_utils.gateway_breaker.state == HALF_OPEN
+
+    assert _fetch()[0] == "ok"
+    assert razorpay_utils.gateway_breaker.state == CLOSED
+
+
+def test_half_open_failure_reopens_the_breaker(gateway):
+    _trip(gateway)
+    time.sleep(RESET_SECONDS)
+    assert _fetch()[0] == "gateway_timeout"
+    assert razorpay_utils.gateway_breaker.state == OPEN
+
+
+def test_deadline_caps_retries(app, gateway):
+    # Plenty of retries allowed, but all attempts together must stay within the deadline
+    app.config.update(RAZORPAY_MAX_RETRIES=10, RAZORPAY_BREAKER_FAILURES=100)
+    gateway.latency = 2.0
+
+    code, elapsed = _fetch()
+    assert code == "gateway_timeout"
+    assert elapsed < DEADLINE + 0.15
+
+
+def test_programming_errors_do_not_trip_the_breaker(app, gateway):
+    def broken(*args, timeout=None):
+        raise TypeError("bug in our code")
+
+    app.config.update(RAZORPAY_BREAKER_FAILURES=1)
+    for _ in range(3):
+        with pytest.raises(TypeError):
+            razorpay_utils._call("broken", broken)
+    assert razorpay_utils.gateway_breaker.state == CLOSED
+
+
+def test_programming_error_gives_back_the_half_open_trial(gateway):
+    _trip(gateway)
+    time.sleep(RESET_SECONDS)
+
+    def broken(*args, timeout=None):
+        raise TypeError("bug in our code")
+
+    with pytest.raises(TypeError):
+        razorpay_utils._call("broken", broken)
+    gateway.latency = 0.0
+    assert _fetch()[0] == "ok"
+    assert razorpay_utils.gateway_breaker.state == CLOSED
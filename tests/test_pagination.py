@@ -0,0 +1,27 @@
+import pytest
+
+from app.extensions import db
+from app.models import Product
+from app.utils.pagination import encode_cursor
+
+
+@pytest.fixture
+def products(app):
+    db.session.add_all([Product(name=f"Lamp {i}", price=10, stock=1) for i in range(3)])
+    db.session.commit()
+
+
+@pytest.mark.parametrize("values", [["2"], [[1]], [{"id": 1}], [True], [None], [1.5]])
+def test_forged_cursor_values_are_rejected(client, products, values):
+    response = client.get(f"/api/v1/product/?limit=1&cursor={encode_cursor(values)}")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "validation_error"
+
+
+def test_cursor_from_previous_page_still_works(client, products):
+    first = client.get("/api/v1/product/?limit=1").get_json()
+    second = client.get(f"/api/v1/product/?limit=1&cursor={first['meta']['next_cursor']}")
+
+    assert second.status_code == 200
+    assert second.get_json()["data"][0]["id"] == first["data"][0]["id"] + 1
@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.mark.parametrize("value", ["NaN", "sNaN", "Infinity", "-Infinity", "abc"])
+@pytest.mark.parametrize("name", ["min_price", "max_price"])
+def test_non_finite_price_bounds_are_rejected(app, client, name, value):
+    app.config["CACHE_ENABLED"] = True
+
+    response = client.get(f"/api/v1/product/?{name}={value}")
+
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "validation_error"
+
+
+def test_numeric_price_bounds_are_accepted(client):
+    assert client.get("/api/v1/product/?min_price=10.5&max_price=100").status_code == 200
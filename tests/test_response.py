@@ -0,0 +1,56 @@
+import enum
+
+from app.extensions import db
+from app.models import Cart, Order, Product, User
+from app.models.order import OrderStatus
+from app.utils.response import _enum_value, _serialize_value, format_model
+
+
+def _user_with_cart():
+    user = User(username="buyer", email="buyer@example.com", password_hash="secret-hash")
+    product = Product(name="Lamp", price=10, stock=5)
+    db.session.add_all([user, product])
+    db.session.flush()
+    db.session.add(Cart(user_id=user.id, product_id=product.id, quantity=1))
+    db.session.commit()
+    return user
+
+
+def test_serialize_exclude_applies_with_and_without_relationships(app):
+    user = _user_with_cart()
+
+    compiled = format_model(user)
+    reflective = format_model(user, include_relationships=True)
+
+    assert "password_hash" not in compiled
+    assert "password_hash" not in reflective
+    assert {k: v for k, v in reflective.items() if k in compiled} == compiled
+    assert len(reflective["cart_items"]) == 1
+
+
+def test_serialize_exclude_applies_to_related_objects(app):
+    user = _user_with_cart()
+    line = Cart.query.filter_by(user_id=user.id).one()
+
+    assert "password_hash" not in format_model(line, include_relationships=True)["user"]
+
+
+def test_compiled_and_reflective_paths_match_on_enum_columns(app):
+    user = _user_with_cart()
+    order = Order(user_id=user.id, total_amount=10, status=OrderStatus.PAID)
+    db.session.add(order)
+    db.session.commit()
+
+    compiled = format_model(order)
+    reflective = format_model(order, include_relationships=True)
+
+    assert {k: v for k, v in reflective.items() if k in compiled} == compiled
+    assert type(compiled["status"]) is str and type(reflective["status"]) is str
+    assert compiled["status"] == "paid"
+
+
+def test_plain_enum_values_serialize_alike():
+    class Colour(enum.Enum):
+        RED = "red"
+
+    assert _serialize_value(Colour.RED) == _enum_value(Colour.RED) == "red"